@@ -1,15 +1,37 @@
 print("Starting app...")
-from flask import Flask, render_template, request, jsonify, redirect, url_for
+from flask import Flask, Response, render_template, request, jsonify, redirect, url_for, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
-from apscheduler.schedulers.background import BackgroundScheduler
 import os
+import base64
+import hashlib
+import json
 import logging
+import time
 from datetime import datetime, timedelta
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import joinedload, selectinload
 
 # Import configuration and models
-from config import SQLALCHEMY_DATABASE_URI, SQLALCHEMY_TRACK_MODIFICATIONS, TOURNAMENT_YEAR
-from models import db, Player, Participant, DraftPick, TournamentGame, PlayerTournamentStat
-from scraper import update_tournament_data, update_game_scores
+from config import (SQLALCHEMY_DATABASE_URI, SQLALCHEMY_TRACK_MODIFICATIONS, TOURNAMENT_YEAR,
+                    STREAM_HEARTBEAT_SECONDS, STREAM_MAX_SECONDS, STREAM_POLL_RETRY_MS)
+from models import (db, Player, Participant, DraftPick, TournamentGame, ParticipantScore, Job,
+                    ScrapeRun)
+from scoring import rebuild_scores
+from versions import bump_version, current_version
+from migrations import upgrade
+from database import init_app as init_database
+from metrics import init_app as init_metrics, enabled as metrics_enabled, render as render_metrics
+from query_guard import init_app as init_query_guard, query_budget
+from picks import make_pick, remove_pick, next_draft_position, participant_pick_events, DraftOrder, PickConflict
+from events import bus as event_bus, format_sse, publish, publish_all
+from response_cache import versioned_json, response_cache
+from box_scores import box_score_json
+from fragment_cache import FragmentCacheExtension, stats as fragment_stats
+from jobs import enqueue, describe as describe_job
+from scrape_report import describe as describe_scrape_run
+from leases import SCHEDULER_LEASE, lease_holder
+from initial_load import start as start_initial_load, is_ready, load_state, progress as load_progress
+from cache_store import SqliteStore, import_json_files
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -20,22 +42,28 @@ app = Flask(__name__)
 app.config['SQLALCHEMY_DATABASE_URI'] = SQLALCHEMY_DATABASE_URI
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = SQLALCHEMY_TRACK_MODIFICATIONS
 
-# Initialize database
-db.init_app(app)
+# Initialize database (connection settings and read/write split, see database.py)
+init_database(app, db)
+init_metrics(app, db)
+init_query_guard(app, db)
+event_bus.init_app(app)
+app.jinja_env.add_extension(FragmentCacheExtension)
 
-# Create scheduler for automatic updates
-scheduler = BackgroundScheduler()
-scheduler.add_job(update_tournament_data, 'interval', hours=24)
-scheduler.add_job(update_game_scores, 'interval', hours=1)  # Update game scores every hour
+# Scheduled scrapes run in the worker process (worker.py), not in the web workers
 
 # Initialize the application before the first request
 with app.app_context():
-    # Create database tables if they don't exist
-    db.create_all()
+    # Create missing tables and bring existing databases up to the current schema
+    upgrade(db.engine)
+    event_bus.prune()
     
-    # Start the scheduler
-    if not scheduler.running:
-        scheduler.start()
+    # Backfill materialized scores for databases created before they existed
+    if Participant.query.first() and not ParticipantScore.query.first():
+        rebuild_scores()
+        db.session.commit()
+    
+    # Queue a scrape of an empty database for the worker; pages show a loading screen meanwhile
+    start_initial_load()
 
 # Add context processor to make 'now' available to all templates
 @app.context_processor
@@ -44,29 +72,120 @@ def inject_now():
         'now': datetime.now(),
         'tournament_year': TOURNAMENT_YEAR
     }
-"""
+
+@app.cli.command('rebuild-scores')
+def rebuild_scores_command():
+    """Recompute the materialized leaderboard scores from scratch"""
+    rebuild_scores()
+    db.session.commit()
+    print("Leaderboard scores rebuilt")
+
+@app.cli.command('import-scrape-cache')
+def import_scrape_cache_command():
+    """Import the per-entry data/*.json scrape cache files into the SQLite cache store"""
+    data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+    store = SqliteStore(os.path.join(data_dir, 'scrape_cache.db'))
+    count = import_json_files(store, data_dir)
+    print(f"Imported {count} cache files")
+
+# Paths still served while the initial data load runs
+LOADING_EXEMPT_ENDPOINTS = ('static', 'healthz', 'readyz', 'metrics_endpoint')
 
 @app.before_request
 def check_data():
-    """Check if we need to perform an initial data scrape before each request"""
-    # Only check once
-    if not getattr(app, '_data_checked', False):
-        player_count = Player.query.count()
-        if player_count == 0:
-            logger.info("No players found in database. Performing initial data scrape...")
-            update_tournament_data()
-        app._data_checked = True
+    """Show the loading page instead of empty pages until the initial data load finishes"""
+    if request.method != 'GET' or request.endpoint in LOADING_EXEMPT_ENDPOINTS or request.path.startswith('/api/'):
+        return None
+    if is_ready():
+        return None
+    response = app.make_response((render_template('loading.html', load=load_progress(load_state())), 503))
+    response.headers['Retry-After'] = '5'
+    return response
+
+@app.route('/healthz')
+def healthz():
+    """Liveness check: the process is up and serving requests"""
+    return jsonify({'status': 'ok'})
+
+@app.route('/readyz')
+def readyz():
+    """Readiness check: 200 once the data is loaded, 503 with the initial load's progress until then"""
+    try:
+        state = load_state()
+    except Exception as e:
+        logger.error(f"Readiness check failed: {e}")
+        return jsonify({'ready': False, 'status': 'database_error'}), 503
+    ready = state is None or state.status == 'ready'
+    return jsonify(dict(load_progress(state), ready=ready)), 200 if ready else 503
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Request and SQL metrics of all web workers, in the Prometheus text format (see metrics.py)"""
+    if not metrics_enabled():
+        return jsonify({'error': 'Metrics are turned off'}), 404
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
 
 @app.route('/')
 def index():
     """Homepage route"""
     return render_template('index.html')
 
+# /players sort keys: column, and whether order=asc sorts it descending (stats list
+# the highest first by default)
+PLAYER_SORTS = {
+    'name': (Player.name, False),
+    'ppg': (Player.ppg, True),
+    'rpg': (Player.rpg, True),
+    'apg': (Player.apg, True),
+    'seed': (Player.school_seed, False)
+}
+PLAYERS_PAGE_SIZE = 50
+MAX_PLAYERS_PAGE_SIZE = 200
+
+# Filter options for /players, reused until the players data version changes
+_player_facets = {'version': None, 'facets': None}
+
+def get_player_facets():
+    """Distinct positions, schools and regions, cached per players data version"""
+    version = current_version('players')
+    if _player_facets['version'] != version:
+        _player_facets['facets'] = {
+            'positions': db.session.query(Player.position).distinct().order_by(Player.position).all(),
+            'schools': db.session.query(Player.school).distinct().order_by(Player.school).all(),
+            'regions': db.session.query(Player.region).distinct().order_by(Player.region).all()
+        }
+        _player_facets['version'] = version
+    return _player_facets['facets']
+
+def encode_cursor(value, player_id):
+    return base64.urlsafe_b64encode(json.dumps([value, player_id]).encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor):
+    value, player_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    return value, int(player_id)
+
+def keyset_after(column, value, last_id, descending):
+    """Filter for rows strictly after ``(value, last_id)`` in ``ORDER BY column, id``
+    
+    Both columns are ordered in the same direction so one index scan serves the
+    query. NULLs follow SQLite's ordering: first ascending, last descending.
+    """
+    if descending:
+        if value is None:
+            return and_(column.is_(None), Player.id < last_id)
+        return or_(column < value, and_(column == value, Player.id < last_id), column.is_(None))
+    if value is None:
+        return or_(and_(column.is_(None), Player.id > last_id), column.isnot(None))
+    return or_(column > value, and_(column == value, Player.id > last_id))
+
 @app.route('/players')
+@query_budget(10)
 def players():
-    """Player listing route"""
+    """Player listing route, one keyset-paginated page at a time"""
     # Get sorting parameters
     sort_by = request.args.get('sort', 'name')
+    if sort_by not in PLAYER_SORTS:
+        sort_by = 'name'
     order = request.args.get('order', 'asc')
     
     # Get filter parameters
@@ -74,56 +193,94 @@ def players():
     school_filter = request.args.get('school')
     region_filter = request.args.get('region')
     
-    # Build query
-    query = Player.query
-    
-    # Apply filters
-    if position_filter:
-        query = query.filter_by(position=position_filter)
-    if school_filter:
-        query = query.filter_by(school=school_filter)
-    if region_filter:
-        query = query.filter_by(region=region_filter)
-    
-    # Apply sorting
-    if sort_by == 'name':
-        query = query.order_by(Player.name.asc() if order == 'asc' else Player.name.desc())
-    elif sort_by == 'ppg':
-        query = query.order_by(Player.ppg.desc() if order == 'asc' else Player.ppg.asc())
-    elif sort_by == 'rpg':
-        query = query.order_by(Player.rpg.desc() if order == 'asc' else Player.rpg.asc())
-    elif sort_by == 'apg':
-        query = query.order_by(Player.apg.desc() if order == 'asc' else Player.apg.asc())
-    elif sort_by == 'seed':
-        query = query.order_by(Player.school_seed.asc() if order == 'asc' else Player.school_seed.desc())
-    
-    # Get all players
-    players = query.all()
-    
-    # Get unique values for filters
-    positions = db.session.query(Player.position).distinct().all()
-    schools = db.session.query(Player.school).distinct().all()
-    regions = db.session.query(Player.region).distinct().all()
+    # Get paging parameters
+    cursor = request.args.get('after')
+    limit = max(1, min(request.args.get('limit', PLAYERS_PAGE_SIZE, type=int) or PLAYERS_PAGE_SIZE,
+                       MAX_PLAYERS_PAGE_SIZE))
+    if cursor:
+        try:
+            value, last_id = decode_cursor(cursor)
+        except (ValueError, TypeError):
+            return render_template('error.html', error_code='400', error_message='Invalid page cursor'), 400
+    
+    column, inverted = PLAYER_SORTS[sort_by]
+    descending = (order == 'asc') if inverted else (order == 'desc')
+    
+    def load_page():
+        """The page's players and links, loaded only when the cached player list is stale"""
+        # Build query
+        query = Player.query
+        
+        # Apply filters
+        if position_filter:
+            query = query.filter_by(position=position_filter)
+        if school_filter:
+            query = query.filter_by(school=school_filter)
+        if region_filter:
+            query = query.filter_by(region=region_filter)
+        
+        # Apply sorting, with the player id as a tie-breaker so the cursor is unique
+        if descending:
+            query = query.order_by(column.desc(), Player.id.desc())
+        else:
+            query = query.order_by(column.asc(), Player.id.asc())
+        
+        # Resume after the last row of the previous page
+        if cursor:
+            query = query.filter(keyset_after(column, value, last_id, descending))
+        
+        # Fetch one extra row to know whether there is a next page
+        players = query.limit(limit + 1).all()
+        next_cursor = None
+        if len(players) > limit:
+            players = players[:limit]
+            last = players[-1]
+            next_cursor = encode_cursor(getattr(last, column.key), last.id)
+        
+        # Which players on this page are drafted, in one query
+        drafted_ids = {player_id for (player_id,) in db.session.query(DraftPick.player_id).filter(
+            DraftPick.player_id.in_([player.id for player in players])
+        )}
+        
+        # Paging links keep the current filters and sort
+        page_args = request.args.to_dict()
+        page_args.pop('after', None)
+        return {
+            'players': players,
+            'drafted_ids': drafted_ids,
+            'next_url': url_for('players', **page_args, after=next_cursor) if next_cursor else None,
+            'first_url': url_for('players', **page_args) if cursor else None
+        }
+    
+    facets = get_player_facets()
     
     return render_template('players.html', 
-                          players=players,
-                          positions=positions,
-                          schools=schools,
-                          regions=regions,
+                          load_page=load_page,
+                          page_key=tuple(sorted(request.args.items(multi=True))),
+                          positions=facets['positions'],
+                          schools=facets['schools'],
+                          regions=facets['regions'],
                           sort_by=sort_by,
                           order=order)
 
 @app.route('/draft')
+@query_budget(10)
 def draft():
     """Draft management route"""
     # Get all participants
-    participants = Participant.query.all()
+    participants = Participant.query.order_by(Participant.id).all()
     
-    # Get all players
-    players = Player.query.all()
+    def load_draft_picks():
+        """All picks with their participant and player, for the cached picks table"""
+        return DraftPick.query.options(
+            joinedload(DraftPick.participant), joinedload(DraftPick.player)
+        ).order_by(DraftPick.draft_position).all()
     
-    # Get all draft picks
-    draft_picks = DraftPick.query.all()
+    def load_board():
+        """Participants with their picks and players, for the cached draft board"""
+        return Participant.query.options(
+            selectinload(Participant.draft_picks).joinedload(DraftPick.player)
+        ).order_by(Participant.id).all()
     
     # Check if we're coming from the players page with a draft_player parameter
     draft_player_id = request.args.get('draft_player')
@@ -133,11 +290,13 @@ def draft():
     
     return render_template('draft.html',
                           participants=participants,
-                          players=players,
-                          draft_picks=draft_picks,
+                          load_draft_picks=load_draft_picks,
+                          load_board=load_board,
+                          next_draft_position=next_draft_position(),
                           draft_player=draft_player)
 
 @app.route('/participants', methods=['GET', 'POST'])
+@query_budget(5)
 def participants():
     """Participant management route"""
     if request.method == 'POST':
@@ -152,33 +311,43 @@ def participants():
         
         return redirect(url_for('participants'))
     
-    # Get all participants
-    participants = Participant.query.all()
+    # Get all participants, with their picks for the pick counts
+    participants = Participant.query.options(selectinload(Participant.draft_picks)).all()
     
-    return render_template('participants.html', participants=participants)
+    # Materialized totals, keyed by participant id
+    scores = dict(db.session.query(ParticipantScore.participant_id, ParticipantScore.total_points).all())
+    
+    return render_template('participants.html', participants=participants, scores=scores)
 
 @app.route('/leaderboard')
+@query_budget(5)
 def leaderboard():
     """Leaderboard route"""
-    # Get all participants
-    participants = Participant.query.all()
-    
-    # Calculate scores for each participant
-    leaderboard_data = []
-    for participant in participants:
-        score = participant.get_total_score()
-        leaderboard_data.append({
-            'name': participant.name,
-            'score': score,
-            'draft_picks': participant.draft_picks
-        })
-    
-    # Sort by score (descending)
-    leaderboard_data.sort(key=lambda x: x['score'], reverse=True)
+    def load_leaderboard():
+        """Standings for the cached leaderboard fragment"""
+        # Read the materialized scores, already sorted by score (descending)
+        standings = db.session.query(
+            Participant.id,
+            Participant.name,
+            ParticipantScore.total_points,
+            ParticipantScore.pick_count
+        ).join(
+            ParticipantScore, ParticipantScore.participant_id == Participant.id
+        ).order_by(
+            ParticipantScore.total_points.desc(),
+            Participant.id
+        ).all()
+        
+        return [
+            {'id': participant_id, 'name': name, 'score': score, 'pick_count': pick_count}
+            for participant_id, name, score, pick_count in standings
+        ]
     
-    return render_template('leaderboard.html', leaderboard=leaderboard_data)
+    return render_template('leaderboard.html', load_leaderboard=load_leaderboard)
 
 @app.route('/api/players')
+@query_budget(5)
+@versioned_json('players')
 def api_players():
     """API route for getting players"""
     players = Player.query.all()
@@ -203,40 +372,62 @@ def api_players():
     return jsonify(player_list)
 
 @app.route('/api/draft_pick', methods=['POST'])
+@query_budget(25)
 def api_draft_pick():
-    data = request.json
+    data = request.get_json(silent=True) or {}
     participant_id = data.get('participant_id')
     player_id = data.get('player_id')
     draft_position = data.get('draft_position')
+    # Sent while a draft runs: {"participant_ids": [...], "type": "snake" or "standard", "first_position": n}
+    order = data.get('draft_order')
     
     if not participant_id or not player_id:
         return jsonify({'error': 'Missing required fields'}), 400
     
     try:
-        # Check if player is already drafted
-        existing_pick = DraftPick.query.filter_by(player_id=player_id).first()
-        if existing_pick:
-            return jsonify({'error': 'Player already drafted'}), 400
-        
-        # Create new draft pick
-        draft_pick = DraftPick(
-            participant_id=participant_id,
-            player_id=player_id,
-            draft_position=draft_position
-        )
-        db.session.add(draft_pick)
-        db.session.commit()
-        
-        return jsonify({'success': True})
+        participant_id = int(participant_id)
+        player_id = int(player_id)
+        draft_position = int(draft_position) if draft_position not in (None, '') else None
+    except (TypeError, ValueError):
+        return jsonify({'error': 'participant_id, player_id and draft_position must be integers'}), 400
+    
+    draft_order = None
+    if order:
+        try:
+            draft_order = DraftOrder([int(participant) for participant in order['participant_ids']],
+                                     snake=order.get('type', 'snake') == 'snake',
+                                     first_position=int(order.get('first_position', 1)))
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return jsonify({'error': 'draft_order needs participant_ids, and an integer first_position'}), 400
+    
+    try:
+        # Checked and inserted in one statement, so concurrent picks cannot both win
+        pick = make_pick(participant_id, player_id, draft_position, draft_order)
+    except PickConflict as e:
+        return jsonify(e.to_dict()), e.status_code
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
+    
+    return jsonify({
+        'success': True,
+        'pick': {
+            'id': pick.id,
+            'participant_id': pick.participant_id,
+            'player_id': pick.player_id,
+            'draft_position': pick.draft_position
+        }
+    })
 
 @app.route('/api/draft_picks/reset', methods=['POST'])
 def api_reset_draft_picks():
     try:
         # Delete all draft picks
         DraftPick.query.delete()
+        # Bulk deletes bypass the ORM, so recompute the (now empty) scores directly
+        rebuild_scores()
+        bump_version('draft_picks')
+        publish('picks_reset', {})
         db.session.commit()
         
         return jsonify({'success': True, 'message': 'All draft picks have been reset'})
@@ -247,17 +438,19 @@ def api_reset_draft_picks():
 @app.route('/api/draft_pick/<int:pick_id>', methods=['DELETE'])
 def api_delete_draft_pick(pick_id):
     """API route for deleting a draft pick"""
-    draft_pick = DraftPick.query.get_or_404(pick_id)
-    
-    db.session.delete(draft_pick)
-    db.session.commit()
+    if not remove_pick(pick_id):
+        return jsonify({'error': 'Draft pick not found'}), 404
     
     return jsonify({'success': True})
 
 @app.route('/api/draft_picks', methods=['GET'])
+@query_budget(5)
+@versioned_json('draft_picks', 'participants', 'players')
 def api_get_draft_picks():
     """API endpoint to get all draft picks"""
-    draft_picks = DraftPick.query.all()
+    draft_picks = DraftPick.query.options(
+        joinedload(DraftPick.participant), joinedload(DraftPick.player)
+    ).all()
     
     picks_data = []
     for pick in draft_picks:
@@ -277,43 +470,115 @@ def api_get_draft_picks():
     return jsonify(picks_data)
 
 @app.route('/api/available_players')
+@query_budget(5)
+@versioned_json('players', 'draft_picks')
 def api_available_players():
-    """API endpoint to get available players."""
-    players = Player.query.all()
-    
-    # Get all draft picks
-    draft_picks = DraftPick.query.all()
-    drafted_player_ids = [pick.player_id for pick in draft_picks]
-    
-    # Separate drafted and undrafted players
-    drafted_players = [p for p in players if p.id in drafted_player_ids]
-    undrafted_players = [p for p in players if p.id not in drafted_player_ids]
-    
-    return jsonify({
-        'drafted': [player.to_dict() for player in drafted_players],
-        'undrafted': [player.to_dict() for player in undrafted_players],
-        'all': [player.to_dict() for player in players]
-    })
+    """API endpoint to get available players.
+    
+    Query parameters:
+        status: 'drafted' or 'undrafted' to return only that list (default: both).
+        fields: Comma-separated player fields to include (default: all of Player.to_dict()).
+        include_all: 'false' to omit the combined 'all' list.
+    """
+    status = request.args.get('status')
+    include_all = request.args.get('include_all', 'true').lower() != 'false' and not status
+    
+    fields = request.args.get('fields')
+    if fields:
+        fields = [field for field in fields.split(',') if field in Player.DICT_FIELDS]
+        if not fields:
+            return jsonify({'error': 'No valid fields requested'}), 400
+    else:
+        fields = list(Player.DICT_FIELDS)
+    columns = [getattr(Player, Player.DICT_FIELDS[field]) for field in fields]
+    
+    # Left join against the distinct drafted player ids: a NULL match is the anti-join
+    drafted_ids = db.session.query(DraftPick.player_id).distinct().subquery()
+    is_drafted = drafted_ids.c.player_id.isnot(None)
+    query = db.session.query(*columns, is_drafted).outerjoin(
+        drafted_ids, drafted_ids.c.player_id == Player.id
+    ).order_by(Player.id)
+    if status == 'drafted':
+        query = query.filter(is_drafted)
+    elif status == 'undrafted':
+        query = query.filter(drafted_ids.c.player_id.is_(None))
+    
+    all_players = []
+    drafted_players = []
+    undrafted_players = []
+    for row in query:
+        player = dict(zip(fields, row[:-1]))
+        all_players.append(player)
+        (drafted_players if row[-1] else undrafted_players).append(player)
+    
+    result = {}
+    if status != 'undrafted':
+        result['drafted'] = drafted_players
+    if status != 'drafted':
+        result['undrafted'] = undrafted_players
+    if include_all:
+        result['all'] = all_players
+    return jsonify(result)
+
+def queue_job(kind):
+    """Queue a ``kind`` scrape job (or join the one already queued) and answer 202 with its id"""
+    job, created = enqueue(kind)
+    response = jsonify(dict(
+        describe_job(job),
+        success=True,
+        job_id=job.id,
+        created=created,
+        # Jobs run in worker.py; without one running they stay queued
+        worker_running=lease_holder(SCHEDULER_LEASE) is not None
+    ))
+    response.status_code = 202
+    response.headers['Location'] = url_for('api_job', job_id=job.id)
+    return response
 
 @app.route('/api/update_data', methods=['POST'])
 def api_update_data():
-    """API route for manually triggering data update"""
-    try:
-        update_tournament_data()
-        return jsonify({'success': True})
-    except Exception as e:
-        logger.error(f"Error updating data: {e}")
-        return jsonify({'error': str(e)}), 500
+    """API route for manually triggering data update (queued, see jobs.py)"""
+    return queue_job('update_data')
 
 @app.route('/api/update_game_scores', methods=['POST'])
 def api_update_game_scores():
-    """API route for manually triggering game scores update"""
-    try:
-        update_game_scores()
-        return jsonify({'success': True, 'message': 'Game scores updated successfully'})
-    except Exception as e:
-        logger.error(f"Error updating game scores: {e}")
-        return jsonify({'error': str(e)}), 500
+    """API route for manually triggering game scores update (queued, see jobs.py)"""
+    return queue_job('update_game_scores')
+
+@app.route('/api/jobs/<int:job_id>')
+def api_job(job_id):
+    """API endpoint reporting a queued scrape job's status, progress, stage timings and result"""
+    job = db.session.get(Job, job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    response = jsonify(describe_job(job))
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+@app.route('/api/scrape_reports')
+def api_scrape_reports():
+    """API endpoint listing the kept scrape run reports, newest first, with their totals
+    
+    ``kind`` (update_data or update_game_scores) keeps only that kind of run; the
+    per-stage breakdown of a run is at /api/scrape_reports/<id>.
+    """
+    query = ScrapeRun.query.order_by(ScrapeRun.id.desc())
+    kind = request.args.get('kind')
+    if kind:
+        query = query.filter(ScrapeRun.kind == kind)
+    response = jsonify({'runs': [describe_scrape_run(run, full=False) for run in query.all()]})
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+@app.route('/api/scrape_reports/<int:report_id>')
+def api_scrape_report(report_id):
+    """API endpoint with one scrape run's per-stage timings, cache efficiency, row counts and slowest URLs"""
+    run = db.session.get(ScrapeRun, report_id)
+    if run is None:
+        return jsonify({'error': 'Scrape report not found'}), 404
+    response = jsonify(describe_scrape_run(run))
+    response.headers['Cache-Control'] = 'no-store'
+    return response
 
 @app.route('/games')
 def games():
@@ -332,12 +597,16 @@ def games():
 def api_delete_participant(participant_id):
     """API route for deleting a participant"""
     try:
-        participant = Participant.query.get(participant_id)
+        participant = db.session.get(Participant, participant_id)
         if not participant:
             return jsonify({'error': 'Participant not found'}), 404
         
         # Delete all draft picks associated with this participant
+        removed = participant_pick_events(participant_id)
         DraftPick.query.filter_by(participant_id=participant_id).delete()
+        bump_version('draft_picks')
+        next_position = next_draft_position()
+        publish_all('pick_removed', [dict(data, next_draft_position=next_position) for data in removed])
         
         # Delete the participant
         db.session.delete(participant)
@@ -349,6 +618,8 @@ def api_delete_participant(participant_id):
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/draft_board')
+@query_budget(5)
+@versioned_json('draft_picks', 'participants', 'players')
 def api_draft_board():
     try:
         # Get all draft picks with participant and player info
@@ -357,7 +628,7 @@ def api_draft_board():
             Participant.name.label('participant_name'),
             Player.name.label('player_name'),
             Player.position.label('player_position'),
-            Player.team.label('player_team')
+            Player.school.label('player_team')
         ).join(
             Participant, DraftPick.participant_id == Participant.id
         ).join(
@@ -384,65 +655,68 @@ def api_draft_board():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/cache_stats')
+def api_cache_stats():
+    """Hit rates of this worker's response and template fragment caches"""
+    return jsonify({
+        'pid': os.getpid(),
+        'responses': response_cache.stats(),
+        'fragments': fragment_stats()
+    })
+
+@app.route('/api/stream')
+def api_stream():
+    """Server-Sent Events stream of draft and leaderboard changes (see events.py).
+    
+    Browsers reconnect automatically when the stream ends and send the id of the
+    last event they received in ``Last-Event-ID``; missed events are replayed.
+    When this worker already holds ``STREAM_SLOTS`` streams, the request is
+    answered at once with the missed events instead (a short poll).
+    """
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    if last_event_id is None:
+        last_event_id = request.args.get('last_event_id', type=int)
+    headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    subscription = event_bus.subscribe(last_event_id)
+    if subscription is None:
+        # Every stream slot of this worker is taken: answer as a short poll with what the
+        # browser missed, so that no thread is held, and have it reconnect shortly
+        last_id, events = event_bus.replay(last_event_id)
+        body = (f"retry: {STREAM_POLL_RETRY_MS}\nid: {last_id}\nevent: ready\ndata: {{}}\n\n"
+                + ''.join(format_sse(*event) for event in events))
+        return Response(body, mimetype='text/event-stream', headers=headers)
+    
+    @stream_with_context
+    def generate():
+        try:
+            # Give new clients the current position so a reconnect resumes from it
+            yield f"retry: 3000\nid: {subscription.last_id}\nevent: ready\ndata: {{}}\n\n"
+            deadline = time.monotonic() + STREAM_MAX_SECONDS
+            while time.monotonic() < deadline:
+                event = subscription.get(timeout=STREAM_HEARTBEAT_SECONDS)
+                if event is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield format_sse(*event)
+        finally:
+            event_bus.unsubscribe(subscription)
+    
+    return Response(generate(), mimetype='text/event-stream', headers=headers)
+
 @app.route('/api/game_stats/<int:game_id>')
 def api_game_stats(game_id):
-    """API endpoint to get game statistics"""
-    try:
-        # Get the game
-        game = TournamentGame.query.get_or_404(game_id)
-        
-        # Get all player stats for this game
-        player_stats = PlayerTournamentStat.query.filter_by(game_id=game.id).all()
-        
-        # Get all players for team1 and team2
-        team1_players = Player.query.filter_by(school=game.team1).all()
-        team2_players = Player.query.filter_by(school=game.team2).all()
-        
-        # Create dictionaries to map player IDs to names
-        team1_player_map = {player.id: player.name for player in team1_players}
-        team2_player_map = {player.id: player.name for player in team2_players}
-        
-        # Organize player stats by team
-        team1_player_stats = []
-        team2_player_stats = []
-        
-        for stat in player_stats:
-            player = Player.query.get(stat.player_id)
-            if not player:
-                continue
-                
-            stat_data = {
-                'name': player.name,
-                'points': stat.points,
-                'rebounds': stat.rebounds,
-                'assists': stat.assists,
-                'steals': stat.steals,
-                'blocks': stat.blocks,
-                'turnovers': stat.turnovers,
-                'minutes_played': stat.minutes_played
-            }
-            
-            if player.school == game.team1:
-                team1_player_stats.append(stat_data)
-            elif player.school == game.team2:
-                team2_player_stats.append(stat_data)
-        
-        # Return game stats
-        return jsonify({
-            'id': game.id,
-            'round': game.round,
-            'game_date': game.game_date,
-            'team1': game.team1,
-            'team2': game.team2,
-            'team1_score': game.team1_score,
-            'team2_score': game.team2_score,
-            'status': game.status,
-            'team1_players': team1_player_stats,
-            'team2_players': team2_player_stats
-        })
-    except Exception as e:
-        logger.error(f"Error getting game stats: {e}")
-        return jsonify({'error': str(e)}), 500
+    """API endpoint to get a game's box score (see box_scores.py)"""
+    body, completed = box_score_json(game_id)
+    if body is None:
+        return jsonify({'error': 'Game not found'}), 404
+    
+    response = Response(body, mimetype='application/json')
+    if completed:
+        # Final box scores only change if their stats are re-ingested, which changes the tag
+        response.set_etag(hashlib.sha1(body.encode('utf-8')).hexdigest())
+        response.headers['Cache-Control'] = 'no-cache'
+        response.make_conditional(request)
+    return response
 
 @app.errorhandler(404)
 def page_not_found(e):
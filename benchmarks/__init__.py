@@ -0,0 +1,4 @@
+"""Benchmark scripts for the March Madness Fantasy Draft App.
+
+Run each module from the repository root, e.g. ``python -m benchmarks.scrape_pipeline``.
+"""
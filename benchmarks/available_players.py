@@ -0,0 +1,59 @@
+"""Latency and payload size of /api/available_players, old vs set-based implementation.
+
+Usage:
+
+    python -m benchmarks.available_players --players 2000 --picks 500 --repeat 20
+"""
+import argparse
+
+from flask import jsonify
+
+from benchmarks.common import app_with_scratch_db, quiet_logs, seed_draft, time_requests
+
+
+def legacy_available_players():
+    """The original endpoint: full ORM loads and a list membership test per player"""
+    from models import Player, DraftPick
+    players = Player.query.all()
+    draft_picks = DraftPick.query.all()
+    drafted_player_ids = [pick.player_id for pick in draft_picks]
+    drafted_players = [p for p in players if p.id in drafted_player_ids]
+    undrafted_players = [p for p in players if p.id not in drafted_player_ids]
+    return jsonify({
+        'drafted': [player.to_dict() for player in drafted_players],
+        'undrafted': [player.to_dict() for player in undrafted_players],
+        'all': [player.to_dict() for player in players]
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--players', type=int, default=2000)
+    parser.add_argument('--participants', type=int, default=50)
+    parser.add_argument('--picks', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    quiet_logs()
+
+    with app_with_scratch_db() as app_module:
+        app = app_module.app
+        app.add_url_rule('/bench/legacy_available_players', 'legacy_available_players', legacy_available_players)
+        seed_draft(args.players, args.participants, args.picks)
+        client = app.test_client()
+
+        print(f"{args.players} players, {args.picks} picks, mean of {args.repeat} requests")
+        baseline = None
+        for label, url in (
+            ('legacy', '/bench/legacy_available_players'),
+            ('set-based', '/api/available_players'),
+            ('without all', '/api/available_players?include_all=false'),
+            ('undrafted only', '/api/available_players?status=undrafted'),
+            ('autodraft fields', '/api/available_players?status=undrafted&fields=id,name,ppg'),
+        ):
+            elapsed_ms, size = time_requests(client, url, args.repeat)
+            baseline = baseline or elapsed_ms
+            print(f"  {label:>16}: {elapsed_ms:7.1f} ms  {size / 1024:7.0f} KB  ({baseline / elapsed_ms:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""Time to first byte right after a deploy onto an empty database.
+
+Each mode starts the app in a fresh process against an empty scratch database
+and serves it with a threaded local server. It sends GET /players right away
+and times the first byte of the response, measured from the request and from
+the start of ``import app``. It also times the first page that has data. The scrape is
+replaced by one that sleeps ``--scrape-seconds`` and then seeds players, so no
+network is involved:
+
+    blocking:   the old ``check_data`` hook, which scraped inside the first
+                request on an empty database
+    background: the initial load in initial_load.py, queued as a job and run
+                by a stand-in for worker.py, with the loading page and /readyz
+
+Usage:
+
+    python -m benchmarks.cold_start --scrape-seconds 10
+"""
+import argparse
+import http.client
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.common import quiet_logs, seed_draft
+
+MODES = ('blocking', 'background')
+STEPS = ('teams', 'rosters', 'player_stats', 'players', 'games', 'game_stats')
+
+
+def simulated_scrape(seconds, players):
+    """Stand-in for ``update_tournament_data``: reports each stage, sleeping ``seconds`` in all, then seeds data"""
+    def update_tournament_data(progress=lambda stage, done=0, total=0: None):
+        for stage in STEPS:
+            progress(stage)
+            time.sleep(seconds / len(STEPS))
+        seed_draft(players, 10, 0)
+    return update_tournament_data
+
+
+def run_worker(app):
+    """Stand-in for worker.py: runs the job queue every 0.25 s, as ``worker.run_jobs`` does"""
+    from initial_load import supervise
+    from jobs import run_queued_jobs
+
+    while True:
+        with app.app_context():
+            supervise()
+            run_queued_jobs('cold-start-benchmark')
+            supervise()
+        time.sleep(0.25)
+
+
+def get(port, path):
+    """GET ``path``; returns (status, seconds to the first byte, seconds to the whole response)"""
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=600)
+    start = time.perf_counter()
+    connection.request('GET', path)
+    response = connection.getresponse()
+    first_byte = time.perf_counter() - start
+    response.read()
+    connection.close()
+    return response.status, first_byte, time.perf_counter() - start
+
+
+def run_mode(args, tmp):
+    from werkzeug.serving import make_server
+
+    # Set before anything imports config, which reads them
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tmp, 'bench.db')
+    os.environ['METRICS_DIR'] = os.path.join(tmp, 'metrics')
+    if args.mode == 'blocking':
+        os.environ['INITIAL_LOAD'] = '0'
+    import scraper
+
+    scrape = simulated_scrape(args.scrape_seconds, args.players)
+    scraper.update_tournament_data = scrape
+
+    start = time.perf_counter()
+    import app as app_module
+    app = app_module.app
+    import_seconds = time.perf_counter() - start
+    if args.mode == 'blocking':
+        @app.before_request
+        def check_data():
+            if not getattr(app, '_data_checked', False):
+                if app_module.Player.query.count() == 0:
+                    # The scrape writes, so it cannot use the query-only engine of GET requests
+                    app_module.db.session.info.pop('read_only', None)
+                    scrape()
+                app._data_checked = True
+
+    if args.mode == 'background':
+        threading.Thread(target=run_worker, args=(app,), daemon=True).start()
+
+    server = make_server('127.0.0.1', args.port, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        status, first_byte, _ = get(args.port, '/players')
+        print(f"{args.mode}: import app {import_seconds * 1000:.0f} ms")
+        print(f"  first GET /players: {status}, first byte after {first_byte * 1000:.0f} ms "
+              f"({(time.perf_counter() - start) * 1000:.0f} ms after startup began)")
+
+        while status != 200:
+            time.sleep(0.25)
+            status, first_byte, _ = get(args.port, '/players')
+        print(f"  first /players with data: {(time.perf_counter() - start) * 1000:.0f} ms after startup began")
+    finally:
+        server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mode', choices=MODES, help='Run a single mode (default: all, one process each)')
+    parser.add_argument('--scrape-seconds', type=float, default=10)
+    parser.add_argument('--players', type=int, default=68 * 15)
+    parser.add_argument('--port', type=int, default=8767)
+    args = parser.parse_args()
+
+    if args.mode:
+        quiet_logs()
+        with tempfile.TemporaryDirectory() as tmp:
+            run_mode(args, tmp)
+        return
+
+    for mode in MODES:
+        subprocess.run([sys.executable, '-m', 'benchmarks.cold_start', '--mode', mode] + sys.argv[1:],
+                       env=dict(os.environ), check=True)
+
+
+if __name__ == '__main__':
+    main()
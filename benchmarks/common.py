@@ -0,0 +1,96 @@
+"""Shared helpers for the benchmark scripts"""
+import importlib
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+from flask import Flask
+from sqlalchemy import insert
+
+from models import db, Player, Participant, DraftPick
+
+
+@contextmanager
+def scratch_app():
+    """Yield a Flask app bound to an empty, throwaway SQLite database"""
+    with tempfile.TemporaryDirectory() as tmp:
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(tmp, 'bench.db')
+        app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(app)
+        with app.app_context():
+            db.create_all()
+            yield app
+            db.session.remove()
+            db.engine.dispose()
+
+
+def quiet_logs():
+    """Silence per-row INFO logging so it does not dominate the timings"""
+    logging.disable(logging.INFO)
+
+
+@contextmanager
+def timer(results, name):
+    """Store the elapsed wall-clock seconds of the block in ``results[name]``"""
+    start = time.perf_counter()
+    yield
+    results[name] = time.perf_counter() - start
+
+
+@contextmanager
+def app_with_scratch_db():
+    """Yield the real ``app`` module, configured against an empty throwaway SQLite database.
+
+    config.py reads DATABASE_URL and METRICS_DIR at import time, so this must run
+    before anything else in the process imports ``app`` or ``config``. The initial scrape of an empty database is
+    switched off, so the benchmark starts from an empty database. Request
+    metrics are written to the throwaway directory too.
+    """
+    if 'app' in sys.modules or 'config' in sys.modules:
+        raise RuntimeError("app or config was already imported; cannot point it at a scratch database")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tmp, 'bench.db')
+        os.environ['INITIAL_LOAD'] = '0'
+        os.environ['METRICS_DIR'] = os.path.join(tmp, 'metrics')
+        app_module = importlib.import_module('app')
+        with app_module.app.app_context():
+            yield app_module
+            db.session.remove()
+            db.engine.dispose()
+
+
+def seed_draft(player_count, participant_count, pick_count, seed=2025):
+    """Bulk-insert synthetic players, participants and picks into the current database"""
+    rng = random.Random(seed)
+    db.session.execute(insert(Player), [
+        {'name': f'Player {i}', 'school': f'Team {i % 68}', 'position': rng.choice('GFC'),
+         'jersey_number': i % 50, 'year_in_school': 'Junior', 'ppg': round(rng.uniform(0, 25), 1),
+         'rpg': round(rng.uniform(0, 12), 1), 'apg': round(rng.uniform(0, 8), 1),
+         'school_seed': i % 68 // 4 + 1, 'region': ('East', 'West', 'South', 'Midwest')[i % 4]}
+        for i in range(player_count)
+    ])
+    db.session.execute(insert(Participant), [
+        {'name': f'Participant {i}', 'email': f'p{i}@example.com'} for i in range(participant_count)
+    ])
+    player_ids = rng.sample(range(1, player_count + 1), pick_count)
+    if player_ids:
+        db.session.execute(insert(DraftPick), [
+            {'participant_id': n % participant_count + 1, 'player_id': player_id, 'draft_position': n + 1}
+            for n, player_id in enumerate(player_ids)
+        ])
+    db.session.commit()
+
+
+def time_requests(client, url, repeat):
+    """Mean milliseconds per GET of ``url`` and the response size in bytes"""
+    response = client.get(url)
+    assert response.status_code == 200, (url, response.status_code)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        client.get(url)
+    return (time.perf_counter() - start) / repeat * 1000, len(response.data)
@@ -0,0 +1,187 @@
+"""Synthetic tournaments and drafts shaped like the real thing, for the benchmark suite.
+
+``generate_tournament`` builds a full field: 68 teams in four regions with the
+First Four, 15-player rosters with season averages, and all 67 games of the
+bracket, played out round by round with a box score line for every rostered
+player. ``as_of_round`` cuts it back to the state after a given round, which
+lets a benchmark ingest "new results" later. ``generate_draft`` runs a snake
+draft over it for any number of participants.
+
+``prime_scrape_cache`` writes the tournament into a scraper's cache in the
+shapes the scraper stores, so ``update_database`` and ``update_game_scores``
+run end to end without the network. ``load_draft`` writes participants and
+picks straight into the database.
+"""
+import random
+
+from sqlalchemy import insert, select
+
+from models import db, Player, Participant, DraftPick
+
+YEAR = 2025
+REGIONS = ('East', 'West', 'South', 'Midwest')
+FIRST_ROUND_SEEDS = ((1, 16), (8, 9), (5, 12), (4, 13), (6, 11), (3, 14), (7, 10), (2, 15))
+# Bracket slots filled by a First Four game: (region, seed)
+FIRST_FOUR = (('East', 16), ('West', 16), ('South', 11), ('Midwest', 11))
+ROUND_DATES = {0: '2025-03-18', 1: '2025-03-20', 2: '2025-03-22', 3: '2025-03-27',
+               4: '2025-03-29', 5: '2025-04-05', 6: '2025-04-07'}
+POSITIONS = 'GGFCGGFFCGFGFCG'
+YEARS_IN_SCHOOL = ('Freshman', 'Sophomore', 'Junior', 'Senior')
+
+
+def _play(rng, game_id, round_number, team1, team2, seeds):
+    """Play one game; returns its scraped-shape dict and the winner"""
+    strength1 = 17 - seeds[team1] + rng.gauss(0, 4)
+    strength2 = 17 - seeds[team2] + rng.gauss(0, 4)
+    winning_score = rng.randint(62, 92)
+    losing_score = winning_score - rng.randint(1, 25)
+    if strength1 >= strength2:
+        scores, winner = (winning_score, losing_score), team1
+    else:
+        scores, winner = (losing_score, winning_score), team2
+    game = {'game_id': game_id, 'round': round_number, 'game_date': ROUND_DATES[round_number],
+            'team1': team1, 'team2': team2, 'team1_score': scores[0], 'team2_score': scores[1],
+            'status': 'completed'}
+    return game, winner
+
+
+def _box_score(rng, game, rosters):
+    """Stat lines for every player of both teams, with points adding up to about the team's score"""
+    lines = []
+    for team, score in ((game['team1'], game['team1_score']), (game['team2'], game['team2_score'])):
+        roster = rosters[team]
+        weights = [player['ppg'] + 1 for player in roster]
+        total_weight = sum(weights)
+        for slot, (player, weight) in enumerate(zip(roster, weights)):
+            lines.append({
+                'name': player['name'], 'school': team, 'game_id': game['game_id'],
+                'points': round(score * weight / total_weight),
+                'rebounds': max(0, round(rng.gauss(player['rpg'], 2))),
+                'assists': max(0, round(rng.gauss(player['apg'], 1.5))),
+                'steals': rng.randint(0, 3), 'blocks': rng.randint(0, 2), 'turnovers': rng.randint(0, 4),
+                'minutes_played': max(0, round(rng.gauss(32 - slot * 2, 4)))
+            })
+    return lines
+
+
+def generate_tournament(roster_size=15, seed=YEAR):
+    """A complete tournament as a dict of ``teams``, ``players``, ``games`` and ``stat_lines``"""
+    rng = random.Random(seed)
+    teams = []
+    for seed_number in range(1, 17):
+        for region in REGIONS:
+            teams.append({'name': f'Team {len(teams) + 1}', 'seed': seed_number, 'region': region})
+    # The First Four adds a second team to four bracket slots
+    for region, seed_number in FIRST_FOUR:
+        teams.append({'name': f'Team {len(teams) + 1}', 'seed': seed_number, 'region': region})
+    seeds = {team['name']: team['seed'] for team in teams}
+
+    players, rosters = [], {}
+    for team in teams:
+        roster = rosters[team['name']] = []
+        for slot in range(roster_size):
+            player = {
+                'name': f'Player {slot + 1} ({team["name"]})', 'school': team['name'],
+                'position': POSITIONS[slot % len(POSITIONS)], 'jersey_number': rng.randint(0, 55),
+                'year_in_school': rng.choice(YEARS_IN_SCHOOL),
+                'ppg': round(max(0.0, rng.gauss(16 - slot * 1.1, 3)), 1),
+                'rpg': round(max(0.0, rng.gauss(7 - slot * 0.4, 2)), 1),
+                'apg': round(max(0.0, rng.gauss(4 - slot * 0.25, 1.5)), 1),
+                'school_seed': team['seed'], 'region': team['region']
+            }
+            roster.append(player)
+            players.append(player)
+
+    games, stat_lines = [], []
+
+    def play(round_number, team1, team2):
+        game, winner = _play(rng, len(games) + 1, round_number, team1, team2, seeds)
+        games.append(game)
+        stat_lines.extend(_box_score(rng, game, rosters))
+        return winner
+
+    slots = {(team['region'], team['seed']): team['name'] for team in teams[:64]}
+    for extra, (region, seed_number) in zip(teams[64:], FIRST_FOUR):
+        slots[(region, seed_number)] = play(0, slots[(region, seed_number)], extra['name'])
+
+    region_winners = []
+    for region in REGIONS:
+        alive = [slots[(region, seed_number)] for pair in FIRST_ROUND_SEEDS for seed_number in pair]
+        for round_number in (1, 2, 3, 4):
+            alive = [play(round_number, alive[i], alive[i + 1]) for i in range(0, len(alive), 2)]
+        region_winners.extend(alive)
+    finalists = [play(5, region_winners[0], region_winners[1]), play(5, region_winners[2], region_winners[3])]
+    play(6, *finalists)
+
+    return {'teams': teams, 'players': players, 'games': games, 'stat_lines': stat_lines}
+
+
+def as_of_round(tournament, last_round):
+    """Copy of ``tournament`` in which the games after ``last_round`` are scheduled and have no stats"""
+    games = [
+        game if game['round'] <= last_round
+        else dict(game, team1_score=None, team2_score=None, status='scheduled')
+        for game in tournament['games']
+    ]
+    played = {game['game_id'] for game in games if game['status'] == 'completed'}
+    stat_lines = [line for line in tournament['stat_lines'] if line['game_id'] in played]
+    return dict(tournament, games=games, stat_lines=stat_lines)
+
+
+def generate_draft(players, participant_count, rounds=10, seed=YEAR):
+    """Snake draft of ``players`` by ``participant_count`` participants.
+
+    Each participant picks ``rounds`` times, or fewer if there are not enough
+    players to go around. Picks favour the highest scorers still available.
+    Returns a list of ``(participant index, player name, school)`` in draft order.
+    """
+    rng = random.Random(seed)
+    rounds = min(rounds, len(players) // participant_count)
+    available = sorted(players, key=lambda player: -player['ppg'])
+    picks = []
+    for round_number in range(rounds):
+        order = range(participant_count) if round_number % 2 == 0 else reversed(range(participant_count))
+        for participant in order:
+            player = available.pop(min(len(available) - 1, int(rng.expovariate(0.5))))
+            picks.append((participant, player['name'], player['school']))
+    return picks
+
+
+def load_draft(participant_count, picks):
+    """Insert participants and ``picks`` (from ``generate_draft``) into the current database"""
+    db.session.execute(insert(Participant), [
+        {'name': f'Participant {i + 1}', 'email': f'participant{i + 1}@example.com'}
+        for i in range(participant_count)
+    ])
+    participant_ids = db.session.execute(select(Participant.id).order_by(Participant.id)).scalars().all()
+    player_ids = {(name, school): pk for name, school, pk in db.session.execute(
+        select(Player.name, Player.school, Player.id))}
+    if picks:
+        db.session.execute(insert(DraftPick), [
+            {'participant_id': participant_ids[participant], 'player_id': player_ids[(name, school)],
+             'draft_position': position}
+            for position, (participant, name, school) in enumerate(picks, 1)
+        ])
+    db.session.commit()
+
+
+def prime_scrape_cache(scraper, tournament, year=YEAR):
+    """Store ``tournament`` in ``scraper``'s cache the way its fetches would have"""
+    entries = {scraper.cache_key(f'tournament_teams_{year}.json'): tournament['teams'],
+               scraper.cache_key(f'tournament_games_{year}.json'): tournament['games']}
+    for team in tournament['teams']:
+        roster = [
+            {field: player[field] for field in ('name', 'position', 'jersey_number', 'year_in_school', 'school')}
+            for player in tournament['players'] if player['school'] == team['name']
+        ]
+        entries[scraper.cache_key(scraper.team_players_filename(team['name'], year))] = roster
+    for player in tournament['players']:
+        entries[scraper.cache_key(scraper.player_stats_filename(player['name'], player['school'], year))] = {
+            field: player[field] for field in ('ppg', 'rpg', 'apg')
+        }
+    for line in tournament['stat_lines']:
+        filename = scraper.player_game_stats_filename(line['name'], line['school'], line['game_id'], year)
+        entries[scraper.cache_key(filename)] = {
+            field: value for field, value in line.items() if field not in ('name', 'school', 'game_id')
+        }
+    scraper.cache.put_many(entries)
@@ -0,0 +1,134 @@
+"""Concurrency stress test for /api/draft_pick under multiple gunicorn workers.
+
+Fires hundreds of simultaneous picks at a real gunicorn server and checks the
+outcome against the database:
+
+    contested players: every player is requested by several participants at once;
+                       exactly one request per player may win.
+    contested slot: many different players all claim the same draft position;
+                    exactly one request may win, the rest are out of turn.
+
+Usage:
+
+    python -m benchmarks.draft_race --workers 4 --players 50 --contenders 8 --slot-claims 200
+"""
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from sqlalchemy import func, insert, select
+
+from benchmarks.common import app_with_scratch_db, quiet_logs
+from models import db, Player, Participant, DraftPick
+
+
+def start_server(workers, port):
+    """Start gunicorn on the scratch database (inherited via DATABASE_URL) and wait until it answers"""
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--workers', str(workers), '--threads', '8',
+         '--bind', f'127.0.0.1:{port}', '--log-level', 'warning', 'app:app'],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            requests.get(f'http://127.0.0.1:{port}/api/draft_picks', timeout=5)
+            return server
+        except requests.RequestException:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError('gunicorn did not start')
+
+
+def fire(url, payloads):
+    """POST every payload at once (released together by a barrier); returns the responses"""
+    barrier = threading.Barrier(len(payloads))
+    local = threading.local()
+
+    def post(payload):
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+        barrier.wait()
+        response = local.session.post(url, json=payload, timeout=60)
+        return payload, response.status_code, response.json()
+
+    with ThreadPoolExecutor(max_workers=len(payloads)) as pool:
+        return list(pool.map(post, payloads))
+
+
+def check(label, results, expected_wins):
+    statuses = Counter(status for _, status, _ in results)
+    conflicts = Counter(body.get('conflict') for _, status, body in results if status == 409)
+    wins = statuses.get(200, 0)
+    ok = wins == expected_wins and set(statuses) <= {200, 409}
+    print(f"  {label}: {len(results)} requests -> {wins} won, {dict(conflicts)} conflicts, "
+          f"statuses {dict(statuses)} [{'PASS' if ok else 'FAIL'}]")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--players', type=int, default=50)
+    parser.add_argument('--contenders', type=int, default=8)
+    parser.add_argument('--slot-claims', type=int, default=200)
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+    quiet_logs()
+
+    with app_with_scratch_db():
+        player_count = args.players + args.slot_claims
+        db.session.execute(insert(Player), [
+            {'name': f'Player {i}', 'school': f'Team {i % 68}', 'ppg': 10.0} for i in range(player_count)
+        ])
+        db.session.execute(insert(Participant), [
+            {'name': f'Participant {i}'} for i in range(args.contenders)
+        ])
+        db.session.commit()
+
+        server = start_server(args.workers, args.port)
+        url = f'http://127.0.0.1:{args.port}/api/draft_pick'
+        try:
+            print(f"gunicorn: {args.workers} workers x 8 threads")
+            start = time.perf_counter()
+            results = fire(url, [
+                {'participant_id': participant + 1, 'player_id': player + 1}
+                for player in range(args.players) for participant in range(args.contenders)
+            ])
+            elapsed = time.perf_counter() - start
+            ok = check('contested players', results, args.players)
+            print(f"    {len(results) / elapsed:.0f} picks/sec")
+
+            next_position = args.players + 1
+            ok &= check('contested slot', fire(url, [
+                {'participant_id': 1, 'player_id': args.players + n + 1, 'draft_position': next_position}
+                for n in range(args.slot_claims)
+            ]), 1)
+        finally:
+            server.terminate()
+            server.wait()
+
+        db.session.expire_all()
+        per_player = db.session.execute(
+            select(DraftPick.player_id, func.count()).group_by(DraftPick.player_id).having(func.count() > 1)
+        ).all()
+        positions = db.session.execute(select(DraftPick.draft_position).order_by(DraftPick.draft_position)).scalars().all()
+        contiguous = positions == list(range(1, args.players + 2))
+        print(f"  database: {len(positions)} picks, {len(per_player)} players picked twice, "
+              f"positions 1..{len(positions)} contiguous: {contiguous}")
+        ok &= not per_player and contiguous
+
+    print('PASS' if ok else 'FAIL')
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
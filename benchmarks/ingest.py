@@ -0,0 +1,107 @@
+"""Ingest throughput of the bulk IngestWriter vs the previous row-at-a-time commits.
+
+Both paths load the same synthetic rosters and box scores into a fresh SQLite
+database, then load them a second time so that the update path is measured as
+well. Usage:
+
+    python -m benchmarks.ingest --teams 68 --players 15 --games 67
+"""
+import argparse
+import random
+
+from benchmarks.common import quiet_logs, scratch_app, timer
+from ingest import IngestWriter, STAT_COLUMNS, game_row
+from models import db, Player, TournamentGame, PlayerTournamentStat
+
+
+def synthetic_data(team_count, roster_size, game_count):
+    rng = random.Random(2025)
+    teams = [f'Team {i}' for i in range(team_count)]
+    players = [
+        {'name': f'Player {n} ({team})', 'school': team, 'position': 'G', 'jersey_number': n,
+         'year_in_school': 'Junior', 'ppg': rng.uniform(0, 25), 'rpg': rng.uniform(0, 12),
+         'apg': rng.uniform(0, 8), 'school_seed': t % 16 + 1, 'region': 'East'}
+        for t, team in enumerate(teams) for n in range(roster_size)
+    ]
+    games = [
+        {'game_id': g + 1, 'round': 1, 'game_date': '2025-03-20', 'team1': teams[(2 * g) % team_count],
+         'team2': teams[(2 * g + 1) % team_count], 'team1_score': 70, 'team2_score': 65, 'status': 'completed'}
+        for g in range(game_count)
+    ]
+    stat_lines = [
+        {'name': p['name'], 'school': p['school'], 'game_id': game['game_id'],
+         'points': rng.randint(0, 30), 'rebounds': rng.randint(0, 15), 'assists': rng.randint(0, 10),
+         'steals': rng.randint(0, 5), 'blocks': rng.randint(0, 5), 'turnovers': rng.randint(0, 5),
+         'minutes_played': rng.randint(10, 40)}
+        for game in games for p in players if p['school'] in (game['team1'], game['team2'])
+    ]
+    return players, games, stat_lines
+
+
+def row_at_a_time(players, games, stat_lines):
+    """The pre-IngestWriter path: one lookup per row, commit per team / per stat line"""
+    for school in sorted({p['school'] for p in players}):
+        for player_data in (p for p in players if p['school'] == school):
+            player = Player.query.filter_by(name=player_data['name'], school=player_data['school']).first()
+            if player:
+                for key, value in player_data.items():
+                    setattr(player, key, value)
+            else:
+                db.session.add(Player(**player_data))
+        db.session.commit()
+
+    for game_data in games:
+        row = game_row(game_data)
+        game = TournamentGame.query.filter_by(game_id=row['game_id']).first()
+        if game:
+            for key, value in row.items():
+                setattr(game, key, value)
+        else:
+            db.session.add(TournamentGame(**row))
+        db.session.commit()
+
+    for line in stat_lines:
+        player = Player.query.filter_by(name=line['name'], school=line['school']).first()
+        game = TournamentGame.query.filter_by(game_id=line['game_id']).first()
+        stat = PlayerTournamentStat.query.filter_by(player_id=player.id, game_id=game.id).first()
+        values = {column: line[column] for column in STAT_COLUMNS}
+        if stat:
+            for key, value in values.items():
+                setattr(stat, key, value)
+        else:
+            db.session.add(PlayerTournamentStat(player_id=player.id, game_id=game.id, **values))
+        db.session.commit()
+
+
+def bulk(players, games, stat_lines):
+    writer = IngestWriter()
+    writer.upsert_players(players)
+    writer.upsert_games(games)
+    writer.upsert_player_game_stats(stat_lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--teams', type=int, default=68)
+    parser.add_argument('--players', type=int, default=15, help='Players per roster')
+    parser.add_argument('--games', type=int, default=67)
+    args = parser.parse_args()
+    quiet_logs()
+
+    players, games, stat_lines = synthetic_data(args.teams, args.players, args.games)
+    row_count = len(players) + len(games) + len(stat_lines)
+    print(f"Rows per load: {len(players)} players, {len(games)} games, {len(stat_lines)} stat lines")
+
+    for name, load in (('row-at-a-time', row_at_a_time), ('bulk', bulk)):
+        results = {}
+        with scratch_app():
+            with timer(results, 'insert'):
+                load([dict(p) for p in players], games, stat_lines)
+            with timer(results, 'update'):
+                load([dict(p) for p in players], games, stat_lines)
+        print(f"{name:>14}: insert {results['insert']:.2f}s ({row_count / results['insert']:,.0f} rows/sec), "
+              f"update {results['update']:.2f}s ({row_count / results['update']:,.0f} rows/sec)")
+
+
+if __name__ == '__main__':
+    main()
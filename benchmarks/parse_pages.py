@@ -0,0 +1,103 @@
+"""Parse time and peak memory per page type: full html.parser trees vs targeted parsing.
+
+Pages are read from ``--pages DIR`` when given, as ``<page_type>*.html`` files
+(page types: bracket, roster, player_stats, boxscore). Otherwise synthetic pages
+shaped like ESPN's are generated: a large navigation/script shell around the one
+element each scraper reads. Usage:
+
+    python -m benchmarks.parse_pages --repeat 20 [--pages saved_pages/]
+"""
+import argparse
+import glob
+import os
+import random
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+from parsing import PAGE_TARGETS, PARSER, parse_page
+
+
+def _shell(rng, body):
+    nav = ''.join(f'<li class="nav-item"><a href="/team/{i}">Team {i}</a></li>' for i in range(400))
+    scripts = ''.join(f'<script>window.__espn_{i} = {{"id": {i}, "v": "{rng.random()}"}};</script>' for i in range(60))
+    promos = ''.join(f'<div class="promo"><img src="/img/{i}.png"><p>Story {i} headline text</p></div>' for i in range(150))
+    return (f'<html><head><meta charset="utf-8"><title>ESPN</title>{scripts}</head><body>'
+            f'<nav><ul>{nav}</ul></nav><main>{body}</main><aside>{promos}</aside><footer>ESPN</footer></body></html>')
+
+
+def _table(rng, css_class, rows, columns):
+    header = ''.join(f'<th>C{c}</th>' for c in range(columns))
+    body = ''.join(
+        '<tr>' + ''.join(f'<td>{rng.randint(0, 40)}</td>' for _ in range(columns)) + '</tr>'
+        for _ in range(rows)
+    )
+    return f'<table class="{css_class}"><thead><tr>{header}</tr></thead><tbody>{body}</tbody></table>'
+
+
+def synthetic_pages():
+    rng = random.Random(2025)
+    matchups = ''.join(
+        f'<div class="matchup"><span class="team">Team {2 * i}</span><span class="team">Team {2 * i + 1}</span></div>'
+        for i in range(67)
+    )
+    return {
+        'bracket': _shell(rng, f'<div class="bracket">{matchups}</div>').encode('utf-8'),
+        'roster': _shell(rng, _table(rng, 'Table', 15, 7)).encode('utf-8'),
+        'player_stats': _shell(rng, _table(rng, 'Table', 35, 20)).encode('utf-8'),
+        'boxscore': _shell(rng, _table(rng, 'Boxscore', 15, 14) + _table(rng, 'Boxscore', 15, 14)).encode('utf-8'),
+    }
+
+
+def saved_pages(directory):
+    pages = {}
+    for page_type in PAGE_TARGETS:
+        for path in sorted(glob.glob(os.path.join(directory, f'{page_type}*.html'))):
+            with open(path, 'rb') as f:
+                pages[page_type] = f.read()
+            break
+    return pages
+
+
+def measure(parse, content, repeat):
+    parse(content)  # Warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse(content)
+    elapsed_ms = (time.perf_counter() - start) / repeat * 1000
+
+    tracemalloc.start()
+    parse(content)
+    peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+    return elapsed_ms, peak_kb
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', help='Directory of saved <page_type>*.html pages')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    pages = saved_pages(args.pages) if args.pages else synthetic_pages()
+    variants = [
+        # The original get_page: decoded text, full tree, html.parser
+        ('full html.parser', lambda content, page_type: BeautifulSoup(content.decode('utf-8'), 'html.parser')),
+        ('targeted html.parser', lambda content, page_type: parse_page(content, page_type, 'html.parser')),
+    ]
+    if PARSER != 'html.parser':
+        variants.append((f'targeted {PARSER}', lambda content, page_type: parse_page(content, page_type, PARSER)))
+
+    print(f"Best available parser: {PARSER}")
+    for page_type, content in pages.items():
+        print(f"\n{page_type} ({len(content) / 1024:.0f} KB)")
+        baseline = None
+        for name, parse in variants:
+            elapsed_ms, peak_kb = measure(lambda c: parse(c, page_type), content, args.repeat)
+            baseline = baseline or elapsed_ms
+            print(f"  {name:>22}: {elapsed_ms:7.2f} ms  {peak_kb:8.0f} KB peak  ({baseline / elapsed_ms:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
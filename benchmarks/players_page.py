@@ -0,0 +1,71 @@
+"""Latency and page size of /players, full listing vs keyset-paginated pages.
+
+Usage:
+
+    python -m benchmarks.players_page --players 20000 --picks 500 --repeat 10
+"""
+import argparse
+import re
+
+from flask import render_template, request
+
+from benchmarks.common import app_with_scratch_db, quiet_logs, seed_draft, time_requests
+
+
+def legacy_players():
+    """The original page: every matching player rendered, drafted state loaded per player"""
+    from fragment_cache import fragment_cache
+    from models import db, Player
+    query = Player.query
+    position = request.args.get('position')
+    if position:
+        query = query.filter(Player.position == position)
+    players = query.order_by(Player.ppg.desc()).all()
+    positions = sorted(p[0] for p in db.session.query(Player.position).distinct() if p[0])
+    schools = sorted(s[0] for s in db.session.query(Player.school).distinct() if s[0])
+    regions = sorted(r[0] for r in db.session.query(Player.region).distinct() if r[0])
+    page = {'players': players, 'drafted_ids': {p.id for p in players if p.draft_picks},
+            'next_url': None, 'first_url': None}
+    # Always render from scratch, as the page did before fragment caching
+    fragment_cache.clear()
+    return render_template('players.html', load_page=lambda: page, page_key=('legacy', position),
+                           positions=positions, schools=schools, regions=regions,
+                           sort_by='ppg', order='desc')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--players', type=int, default=20000)
+    parser.add_argument('--participants', type=int, default=50)
+    parser.add_argument('--picks', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+    quiet_logs()
+
+    with app_with_scratch_db() as app_module:
+        app = app_module.app
+        app.add_url_rule('/bench/legacy_players', 'legacy_players', legacy_players)
+        seed_draft(args.players, args.participants, args.picks)
+        client = app.test_client()
+
+        # A deep page: follow the Next links ten pages in
+        url = '/players?sort=ppg&order=desc'
+        for _ in range(10):
+            html = client.get(url).data.decode()
+            url = re.search(r'href="([^"]+)" class="btn btn-primary">\s*Next Page', html).group(1).replace('&amp;', '&')
+
+        print(f"{args.players} players, {args.picks} picks, mean of {args.repeat} requests")
+        baseline = None
+        for label, page_url in (
+            ('legacy', '/bench/legacy_players'),
+            ('first page', '/players?sort=ppg&order=desc'),
+            ('page 11', url),
+            ('filtered', '/players?sort=name&order=asc&position=G'),
+        ):
+            elapsed_ms, size = time_requests(client, page_url, args.repeat)
+            baseline = baseline or elapsed_ms
+            print(f"  {label:>12}: {elapsed_ms:7.1f} ms  {size / 1024:7.0f} KB  ({baseline / elapsed_ms:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
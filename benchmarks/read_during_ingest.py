@@ -0,0 +1,166 @@
+"""Read latency of the web pages while a stats ingest runs, per SQLite database mode.
+
+Starts gunicorn on a scratch database and times GETs of the leaderboard, the
+draft picks API and the players page from several reader threads. It reads
+first while nothing else happens, then while this process re-ingests every
+box score over and over, one transaction per pass as the scraper writes them,
+refreshing the leaderboard on every commit. Each mode runs in its own process so that config.py picks up its
+settings:
+
+    rollback: rollback journal, synchronous FULL, pysqlite's 5 s busy timeout and
+              no read engine (the setup before database.py)
+    wal:      the config.py defaults (WAL, busy timeout, query-only read engine)
+
+Usage:
+
+    python -m benchmarks.read_during_ingest --seconds 5 --readers 8 --workers 4
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+from benchmarks.common import app_with_scratch_db, quiet_logs, seed_draft
+
+MODES = {
+    'rollback': {'SQLITE_JOURNAL_MODE': 'DELETE', 'SQLITE_SYNCHRONOUS': 'FULL',
+                 'SQLITE_BUSY_TIMEOUT_MS': '5000', 'DATABASE_READ_SPLIT': '0'},
+    'wal': {}
+}
+READ_URLS = ['/leaderboard', '/api/draft_picks', '/players?sort=ppg&order=desc']
+
+
+def read_load(base_url, readers, seconds):
+    """GET ``READ_URLS`` round-robin from ``readers`` threads; returns (latencies in ms, error count)"""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.time() + seconds
+
+    def reader(offset):
+        session = requests.Session()
+        n = offset
+        while time.time() < deadline:
+            url = base_url + READ_URLS[n % len(READ_URLS)]
+            n += 1
+            start = time.perf_counter()
+            try:
+                ok = session.get(url, timeout=60).status_code == 200
+            except requests.RequestException:
+                ok = False
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(elapsed)
+                errors[0] += not ok
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors[0]
+
+
+def ingest_loop(app, games, stat_lines, stop):
+    """Re-ingest every game's box score, one transaction per pass, until ``stop`` is set"""
+    from ingest import IngestWriter
+
+    rng = random.Random(7)
+    commits, failures = 0, 0
+    with app.app_context():
+        writer = IngestWriter()
+        while not stop.is_set():
+            lines = [dict(line, points=rng.randint(0, 30)) for line in stat_lines]
+            try:
+                writer.upsert_player_game_stats(lines, games)
+                commits += 1
+            except Exception:
+                failures += 1
+    return commits, failures
+
+
+def summarize(label, latencies, errors, seconds):
+    latencies = sorted(latencies) or [0.0]
+
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))]
+
+    print(f"  {label:>14}: {len(latencies) / seconds:6.0f} req/s  p50 {pct(0.5):7.1f} ms  p95 {pct(0.95):7.1f} ms  "
+          f"p99 {pct(0.99):7.1f} ms  max {latencies[-1]:7.1f} ms  errors {errors}")
+
+
+def run_mode(args):
+    from benchmarks.draft_race import start_server
+    from models import db
+
+    with app_with_scratch_db() as app_module:
+        # Imported after the scratch database is configured: ingest imports config
+        from ingest import IngestWriter
+
+        seed_draft(args.players, args.participants, args.picks)
+        teams = [f'Team {i}' for i in range(68)]
+        games = [
+            {'game_id': g + 1, 'round': 1, 'game_date': '2025-03-20', 'team1': teams[2 * g], 'team2': teams[2 * g + 1],
+             'team1_score': 70, 'team2_score': 65, 'status': 'completed'}
+            for g in range(34)
+        ]
+        IngestWriter().upsert_games(games)
+        stat_lines = [
+            {'name': f'Player {i}', 'school': f'Team {i % 68}', 'game_id': i % 68 // 2 + 1, 'rebounds': 5, 'assists': 3}
+            for i in range(args.players)
+        ]
+        db.session.remove()
+
+        server = start_server(args.workers, args.port)
+        base_url = f'http://127.0.0.1:{args.port}'
+        try:
+            print(f"{args.mode}: gunicorn {args.workers} workers x 8 threads, {args.readers} readers, "
+                  f"{args.players} players")
+            latencies, errors = read_load(base_url, args.readers, args.seconds)
+            summarize('idle', latencies, errors, args.seconds)
+
+            stop = threading.Event()
+            result = {}
+            ingest = threading.Thread(target=lambda: result.update(zip(('commits', 'failures'),
+                                                                        ingest_loop(app_module.app, games, stat_lines, stop))))
+            ingest.start()
+            latencies, errors = read_load(base_url, args.readers, args.seconds)
+            stop.set()
+            ingest.join()
+            summarize('during ingest', latencies, errors, args.seconds)
+            print(f"  {'ingest':>14}: {result['commits'] / args.seconds:6.0f} commits/s  "
+                  f"failed transactions {result['failures']}")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mode', choices=sorted(MODES), help='Run a single mode (default: all, one process each)')
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--players', type=int, default=68 * 15)
+    parser.add_argument('--participants', type=int, default=10)
+    parser.add_argument('--picks', type=int, default=80)
+    parser.add_argument('--port', type=int, default=8766)
+    args = parser.parse_args()
+
+    if args.mode:
+        quiet_logs()
+        run_mode(args)
+        return
+
+    for mode, settings in MODES.items():
+        command = [sys.executable, '-m', 'benchmarks.read_during_ingest', '--mode', mode] + sys.argv[1:]
+        subprocess.run(command, env=dict(os.environ, **settings), check=True)
+
+
+if __name__ == '__main__':
+    main()
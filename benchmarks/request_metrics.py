@@ -0,0 +1,68 @@
+"""Overhead of the request metrics in metrics.py, and the cost of rendering /metrics.
+
+Each mode runs in a fresh process against a scratch database seeded with
+``--players`` players and a draft. It times GETs of cheap and expensive pages
+with the response and fragment caches warm, so the fixed per-request cost of
+the metrics is as visible as it gets:
+
+    off: METRICS=0, nothing installed
+    on:  METRICS=1, hooks and SQL listeners on every request
+
+With metrics on, it then times GET /metrics. Before that, ``--worker-files``
+extra worker files are written, as if that many gunicorn workers had served the
+same requests.
+
+Usage:
+
+    python -m benchmarks.request_metrics --repeat 500
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+
+from benchmarks.common import app_with_scratch_db, quiet_logs, seed_draft, time_requests
+
+MODES = ('off', 'on')
+URLS = ('/healthz', '/api/available_players', '/leaderboard', '/players?sort=ppg&order=desc')
+
+
+def run_mode(args):
+    os.environ['METRICS'] = '1' if args.mode == 'on' else '0'
+    with app_with_scratch_db() as app_module:
+        seed_draft(args.players, 50, args.players // 2)
+        client = app_module.app.test_client()
+        for url in URLS:
+            ms, size = time_requests(client, url, args.repeat)
+            print(f"  metrics {args.mode:<3}  GET {url:<32} {ms * 1000:8.1f} us/request  ({size / 1024:.1f} KB)")
+
+        if args.mode == 'on':
+            import metrics
+            metrics._writer.write()
+            for n in range(args.worker_files):
+                shutil.copy(metrics._writer.path, os.path.join(os.environ['METRICS_DIR'], f'copy-{n}.json'))
+            ms, size = time_requests(client, '/metrics', 50)
+            print(f"  GET /metrics with {args.worker_files + 1} worker files: {ms:.2f} ms  ({size / 1024:.1f} KB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mode', choices=MODES, help='Run a single mode (default: all, one process each)')
+    parser.add_argument('--players', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=500)
+    parser.add_argument('--worker-files', type=int, default=7)
+    args = parser.parse_args()
+
+    if args.mode:
+        quiet_logs()
+        run_mode(args)
+        return
+
+    for mode in MODES:
+        subprocess.run([sys.executable, '-m', 'benchmarks.request_metrics', '--mode', mode] + sys.argv[1:],
+                       check=True)
+
+
+if __name__ == '__main__':
+    main()
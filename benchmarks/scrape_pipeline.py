@@ -0,0 +1,69 @@
+"""Wall-clock comparison of sequential vs concurrent roster/player-stat fetching.
+
+Every HTTP request is answered by a simulated session that sleeps for a fixed
+latency, so the numbers reflect how well the fetch stage overlaps round trips
+rather than ESPN's response times. Usage:
+
+    python -m benchmarks.scrape_pipeline --teams 68 --latency 0.05 --workers 8
+"""
+import argparse
+import logging
+import tempfile
+import time
+
+import requests
+
+from scraper import MarchMadnessScraper
+
+
+class SimulatedSession:
+    """Stand-in for ``requests.Session`` that answers every GET after a fixed delay"""
+    def __init__(self, latency):
+        self.latency = latency
+        self.headers = {}
+
+    def get(self, url, **kwargs):
+        time.sleep(self.latency)
+        response = requests.models.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = b'<html><body></body></html>'
+        return response
+
+
+def run(team_count, latency, workers, requests_per_second):
+    """Fetch ``team_count`` teams with an empty cache and return elapsed seconds"""
+    teams = [{'name': f'Team {i}', 'seed': i % 16 + 1, 'region': 'East'} for i in range(team_count)]
+    with tempfile.TemporaryDirectory() as data_dir:
+        scraper = MarchMadnessScraper(data_dir=data_dir, max_workers=workers,
+                                      requests_per_second=requests_per_second)
+        scraper.session = SimulatedSession(latency)
+        start = time.perf_counter()
+        results = scraper.fetch_team_data(teams)
+        elapsed = time.perf_counter() - start
+    player_count = sum(len(players) for _, players in results)
+    return elapsed, player_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--teams', type=int, default=68)
+    parser.add_argument('--latency', type=float, default=0.05, help='Simulated seconds per request')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--rps', type=float, default=0, help='Per-host request limit (0 disables)')
+    args = parser.parse_args()
+
+    logging.getLogger('scraper').setLevel(logging.WARNING)
+
+    sequential, players = run(args.teams, args.latency, 1, args.rps)
+    concurrent, _ = run(args.teams, args.latency, args.workers, args.rps)
+
+    requests_made = args.teams + players
+    print(f"Teams: {args.teams}, players: {players}, requests: {requests_made}, latency: {args.latency * 1000:.0f} ms")
+    print(f"Sequential (1 worker):   {sequential:.2f}s")
+    print(f"Concurrent ({args.workers} workers): {concurrent:.2f}s")
+    print(f"Speedup: {sequential / concurrent:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""Scrape timings replayed from a recorded HTTP archive, with no network.
+
+Every run scrapes the same corpus into an empty cache: the bracket, each
+team's roster and player stats, and the box scores of the completed games.
+The requests are answered from an archive recorded by transport.py:
+
+    replay:   ReplayAdapter on the scraper's session, at each ``--workers``
+              count, with the recorded latencies and again with none (CPU,
+              parsing and cache I/O only)
+    stand-in: the archive served over local HTTP by ``transport.serve``, with
+              the recorded latencies, so connection handling is included
+
+Without ``--archive``, a corpus is recorded first from a local origin server
+that answers with synthetic ESPN-shaped pages (see parse_pages.py) after a
+random delay averaging ``--origin-latency``. Pass ``--archive`` to reuse a
+recording, e.g. one made with ``SCRAPER_TRANSPORT=record`` against ESPN.
+
+Usage:
+
+    python -m benchmarks.scrape_replay --workers 1 4 8 16
+    python -m benchmarks.scrape_replay --archive data/http_archive.db
+"""
+import argparse
+import hashlib
+import os
+import random
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.common import quiet_logs
+from benchmarks.parse_pages import synthetic_pages
+
+BASE_PATH = '/mens-college-basketball/'
+# URL path fragment -> page type, for the synthetic origin
+PAGE_PATHS = (('/tournament/bracket/', 'bracket'), ('/team/roster/', 'roster'),
+              ('/player/stats/', 'player_stats'), ('/boxscore/', 'boxscore'))
+
+
+def origin_server(latency):
+    """Local server answering every GET with a synthetic page after a random delay averaging ``latency``"""
+    pages = synthetic_pages()
+    rng = random.Random(2025)
+    rng_lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with rng_lock:
+                delay = rng.expovariate(1 / latency) if latency else 0
+            time.sleep(delay)
+            page_type = next((page_type for fragment, page_type in PAGE_PATHS if fragment in self.path), 'boxscore')
+            body = pages[page_type]
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('ETag', '"%s"' % hashlib.sha1(self.path.encode('utf-8')).hexdigest())
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def scrape(scraper):
+    """Scrape the bracket, rosters, player stats and completed box scores; returns the stat lines scraped"""
+    teams = scraper.scrape_tournament_teams()
+    scraper.fetch_team_data(teams)
+    games = [game for game in scraper.scrape_tournament_games() if game['status'] == 'completed']
+    return len(scraper.fetch_game_stats(games))
+
+
+def run(base_url, workers, transport, archive_path, latency_scale=1.0):
+    """Scrape into an empty cache; returns (seconds, stat lines, replay counters or None)"""
+    from scraper import MarchMadnessScraper
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        scraper = MarchMadnessScraper(base_url=base_url, data_dir=data_dir, max_workers=workers,
+                                      requests_per_second=0, transport=transport,
+                                      archive_path=archive_path, latency_scale=latency_scale)
+        start = time.perf_counter()
+        lines = scrape(scraper)
+        elapsed = time.perf_counter() - start
+        adapter = scraper.session.get_adapter(base_url)
+        return elapsed, lines, adapter.stats() if hasattr(adapter, 'stats') else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--archive', help='Recorded archive to replay (default: record a synthetic one)')
+    parser.add_argument('--origin-latency', type=float, default=0.08,
+                        help='Mean seconds per request of the synthetic origin')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    quiet_logs()
+    from transport import HttpArchive, serve
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive_path = args.archive
+        if not archive_path:
+            archive_path = os.path.join(tmp, 'http_archive.db')
+            origin = origin_server(args.origin_latency)
+            elapsed, _, _ = run(f'http://127.0.0.1:{origin.server_port}{BASE_PATH}', max(args.workers),
+                                'record', archive_path)
+            origin.shutdown()
+            print(f"Recorded a synthetic corpus from a local origin in {elapsed:.2f}s")
+        summary = HttpArchive(archive_path).summary()
+        print(f"Archive: {summary['responses']} responses, {summary['bytes'] / 1024 / 1024:.1f} MB, "
+              f"{summary['latency_seconds']:.2f}s of recorded latency")
+
+        # The host does not matter for replay: the archive is matched on paths
+        replay_url = 'https://replay.invalid' + BASE_PATH
+        for latency_scale in (1.0, 0.0):
+            for workers in args.workers:
+                elapsed, lines, stats = run(replay_url, workers, 'replay', archive_path, latency_scale)
+                print(f"replay   latency x{latency_scale:g}  {workers:>3} workers: {elapsed:7.2f}s  "
+                      f"{lines} stat lines  {stats}")
+
+        server = serve(archive_path, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            for workers in args.workers:
+                elapsed, lines, _ = run(f'http://127.0.0.1:{server.server_port}{BASE_PATH}', workers,
+                                        'live', archive_path)
+                print(f"stand-in latency x1  {workers:>3} workers: {elapsed:7.2f}s  {lines} stat lines")
+        finally:
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,299 @@
+"""Benchmark suite for the hot paths, with machine-readable results to compare between commits.
+
+For each participant count, a fresh process builds a tournament with
+dataset.py in a scratch database and times:
+
+    update_database       the first load into an empty database, then a re-run with nothing new
+    update_game_scores    ingesting the last three rounds' results, then a re-run with nothing new
+    GET pages and APIs    /leaderboard, /players sorts and filters and /api/available_players.
+                          Each is rendered from scratch (response and fragment caches cleared
+                          before every request) and then served from the caches
+    POST /api/draft_pick  the last picks of the draft, one request each
+
+The scrapes run the real scraper code against a primed scrape cache. update_game_scores
+always refetches the bracket, and both scrapes refetch the stat lines of the
+games they ingest; here those fetches are answered from the cache as well, so
+no request leaves the machine. Any fetch that would is reported.
+
+Every case reports the median, p95, mean, min and max milliseconds, SQL
+statements per call, and response bytes. ``--output`` writes the results as
+JSON, with the commit and environment. ``--compare`` checks them against an
+earlier file. It exits with status 1 when a case's median is slower than
+``--threshold`` times the earlier one.
+
+Usage:
+
+    python -m benchmarks.suite --participants 10 100 500 --output before.json
+    python -m benchmarks.suite --participants 10 100 500 --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import requests
+from sqlalchemy import event
+
+from benchmarks.common import app_with_scratch_db, quiet_logs
+from benchmarks.dataset import YEAR, as_of_round, generate_draft, generate_tournament, load_draft, prime_scrape_cache
+
+READ_CASES = (
+    ('GET /leaderboard', '/leaderboard'),
+    ('GET /players', '/players'),
+    ('GET /players sort=ppg', '/players?sort=ppg&order=desc'),
+    ('GET /players sort=seed region=East', '/players?sort=seed&region=East'),
+    ('GET /players position=C sort=rpg', '/players?position=C&sort=rpg&order=desc'),
+    ('GET /players school=Team 7', '/players?school=Team%207'),
+    ('GET /api/available_players', '/api/available_players'),
+    ('GET /api/available_players status=undrafted', '/api/available_players?status=undrafted'),
+)
+# Rounds already played when the database is first loaded; update_game_scores ingests the rest
+LOADED_THROUGH_ROUND = 3
+
+
+class QueryCounter:
+    """Counts the SQL statements executed on ``engines``"""
+    def __init__(self, engines):
+        self.count = 0
+        for engine in engines:
+            event.listen(engine, 'before_cursor_execute', self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+
+class OfflineSession:
+    """Stand-in for ``requests.Session`` that fails every request and records its URL"""
+    def __init__(self):
+        self.headers = {}
+        self.urls = []
+
+    def get(self, url, **kwargs):
+        self.urls.append(url)
+        raise requests.ConnectionError(f"benchmark scrape tried to fetch {url}")
+
+
+def offline_scraper_class(data_dir, session):
+    """``MarchMadnessScraper`` working from the scrape cache in ``data_dir`` without network access"""
+    from scraper import MarchMadnessScraper
+
+    class OfflineScraper(MarchMadnessScraper):
+        def __init__(self, **kwargs):
+            super().__init__(data_dir=data_dir, **kwargs)
+            self.session = session
+
+        def scrape_tournament_games(self, year=YEAR, force_refresh=False):
+            # update_game_scores always refetches the bracket; serve the primed copy
+            return super().scrape_tournament_games(year)
+
+        def scrape_player_game_stats(self, player_name, team_name, game_id, year=YEAR, force_refresh=False):
+            # Stat lines of changed games are always refetched; serve the primed copies
+            return super().scrape_player_game_stats(player_name, team_name, game_id, year)
+
+    return OfflineScraper
+
+
+def measure(results, case, participants, counter, call, repeat, setup=None):
+    """Time ``repeat`` calls of ``call`` (which returns a response size or None) and add a result"""
+    samples, queries, size = [], 0, None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        before = counter.count
+        start = time.perf_counter()
+        size = call()
+        samples.append((time.perf_counter() - start) * 1000)
+        queries += counter.count - before
+    samples.sort()
+    results.append({
+        'case': case,
+        'participants': participants,
+        'samples': len(samples),
+        'p50_ms': round(statistics.median(samples), 3),
+        'p95_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        'mean_ms': round(statistics.mean(samples), 3),
+        'min_ms': round(samples[0], 3),
+        'max_ms': round(samples[-1], 3),
+        'queries': round(queries / len(samples), 1),
+        'bytes': size
+    })
+    print(format_result(results[-1]), flush=True)
+
+
+def run_participants(args):
+    """Run every case for ``args.participants`` (a single count); returns the results"""
+    from models import db
+
+    results = []
+    participants = args.participants[0]
+    with app_with_scratch_db() as app_module, tempfile.TemporaryDirectory() as data_dir:
+        # Imported after the scratch database is configured: they import config
+        import scraper
+        from fragment_cache import fragment_cache
+        from response_cache import response_cache
+        from scoring import rebuild_scores
+
+        session = OfflineSession()
+        scraper.MarchMadnessScraper = offline_scraper_class(data_dir, session)
+        counter = QueryCounter(db.engines.values())
+        tournament = generate_tournament(args.roster_size)
+
+        def scrape(function):
+            def call():
+                function()
+                db.session.remove()
+            return call
+
+        prime_scrape_cache(scraper.MarchMadnessScraper(), as_of_round(tournament, LOADED_THROUGH_ROUND))
+        measure(results, 'update_database (empty database)', participants, counter,
+                scrape(scraper.update_tournament_data), 1)
+
+        picks = generate_draft(tournament['players'], participants, args.rounds)
+        held_back = picks[len(picks) - min(args.draft_picks, len(picks)):]
+        load_draft(participants, picks[:len(picks) - len(held_back)])
+        rebuild_scores()
+        db.session.commit()
+
+        prime_scrape_cache(scraper.MarchMadnessScraper(), tournament)
+        measure(results, 'update_game_scores (new results)', participants, counter,
+                scrape(scraper.update_game_scores), 1)
+        measure(results, 'update_game_scores (no changes)', participants, counter,
+                scrape(scraper.update_game_scores), args.scrape_repeat)
+        measure(results, 'update_database (no changes)', participants, counter,
+                scrape(scraper.update_tournament_data), args.scrape_repeat)
+        if session.urls:
+            print(f"  warning: the scrapes tried to fetch {len(session.urls)} URLs, e.g. {session.urls[0]}")
+
+        client = app_module.app.test_client()
+
+        def clear_caches():
+            response_cache.clear()
+            fragment_cache.clear()
+
+        def get(url):
+            def call():
+                response = client.get(url)
+                assert response.status_code == 200, (url, response.status_code)
+                return len(response.data)
+            return call
+
+        for case, url in READ_CASES:
+            measure(results, case, participants, counter, get(url), args.repeat, setup=clear_caches)
+            measure(results, f'{case} [cached]', participants, counter, get(url), args.repeat)
+
+        player_ids = {(name, school): pk for name, school, pk in db.session.execute(
+            db.select(app_module.Player.name, app_module.Player.school, app_module.Player.id))}
+        pending = [
+            {'participant_id': participant + 1, 'player_id': player_ids[(name, school)], 'draft_position': position}
+            for position, (participant, name, school) in enumerate(picks, 1)
+        ][len(picks) - len(held_back):]
+        db.session.remove()
+
+        def draft_pick():
+            response = client.post('/api/draft_pick', json=pending.pop(0))
+            assert response.status_code == 200, response.get_json()
+            return len(response.data)
+
+        if pending:
+            measure(results, 'POST /api/draft_pick', participants, counter, draft_pick, len(pending))
+    return results
+
+
+def format_result(result):
+    return (f"  {result['participants']:>4} participants  {result['case']:<52} p50 {result['p50_ms']:9.2f} ms  "
+            f"p95 {result['p95_ms']:9.2f} ms  {result['queries']:7.1f} queries  "
+            f"{(result['bytes'] or 0) / 1024:8.1f} KB")
+
+
+def environment():
+    """Commit and machine details stored alongside the results"""
+    def git(*command):
+        try:
+            return subprocess.run(['git'] + list(command), capture_output=True, text=True,
+                                  check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    return {
+        'commit': git('rev-parse', 'HEAD'),
+        'dirty': bool(git('status', '--porcelain', '--untracked-files=no')),
+        'timestamp': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count()
+    }
+
+
+def compare(results, baseline_path, threshold):
+    """Print each case's median against the baseline file; returns the cases that regressed"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    before = {(result['case'], result['participants']): result for result in baseline['results']}
+    print(f"\nCompared with {baseline_path} (commit {(baseline['environment'].get('commit') or '?')[:10]}):")
+    regressions = []
+    for result in results:
+        old = before.get((result['case'], result['participants']))
+        if old is None or not old['p50_ms']:
+            continue
+        ratio = result['p50_ms'] / old['p50_ms']
+        regressed = ratio > threshold
+        if regressed:
+            regressions.append(result)
+        print(f"  {result['participants']:>4} participants  {result['case']:<52} {old['p50_ms']:9.2f} -> "
+              f"{result['p50_ms']:9.2f} ms  ({ratio:.2f}x){'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--participants', type=int, nargs='+', default=[10, 100, 500])
+    parser.add_argument('--roster-size', type=int, default=15)
+    parser.add_argument('--rounds', type=int, default=10, help='Draft rounds (fewer if players run out)')
+    parser.add_argument('--repeat', type=int, default=20, help='Requests per page or API case')
+    parser.add_argument('--scrape-repeat', type=int, default=3, help='Runs per no-change scrape case')
+    parser.add_argument('--draft-picks', type=int, default=20, help='Picks left to time with POST /api/draft_pick')
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    parser.add_argument('--compare', help='Results JSON of an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help='Slowdown of a median that counts as a regression (default 1.2x)')
+    parser.add_argument('--results-file', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.results_file:
+        # One participant count, in a process of its own (app can only be imported once)
+        quiet_logs()
+        results = run_participants(args)
+        with open(args.results_file, 'w') as f:
+            json.dump(results, f)
+        return
+
+    results = []
+    options = ['--roster-size', str(args.roster_size), '--rounds', str(args.rounds), '--repeat', str(args.repeat),
+               '--scrape-repeat', str(args.scrape_repeat), '--draft-picks', str(args.draft_picks)]
+    with tempfile.TemporaryDirectory() as tmp:
+        for participants in args.participants:
+            results_file = os.path.join(tmp, f'{participants}.json')
+            subprocess.run([sys.executable, '-m', 'benchmarks.suite', '--participants', str(participants),
+                            '--results-file', results_file] + options, check=True)
+            with open(results_file) as f:
+                results.extend(json.load(f))
+
+    report = {'environment': environment(), 'options': vars(args), 'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Startup cost of a web worker: the time and memory to import ``app``.
+
+Each gunicorn worker imports app.py, so whatever it pulls in is paid once per
+worker. Every run imports it in a fresh interpreter against an empty scratch
+database. It reports the import time, the peak RSS, the number of loaded
+modules and running threads, and which of the scraping-only packages came
+along. The median of the runs is printed.
+
+Usage:
+
+    python -m benchmarks.web_startup --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+SCRAPING_MODULES = ('scraper', 'requests', 'bs4', 'apscheduler')
+
+PROBE = """
+import json, resource, sys, threading, time
+start = time.perf_counter()
+import app
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    'import_ms': elapsed * 1000,
+    'maxrss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'modules': len(sys.modules),
+    'threads': threading.active_count(),
+    'loaded': [name for name in %r if name in sys.modules],
+}))
+""" % (SCRAPING_MODULES,)
+
+
+def probe():
+    """Import ``app`` in a new interpreter on a scratch database; returns the probe's measurements"""
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DATABASE_URL='sqlite:///' + os.path.join(tmp, 'bench.db'), INITIAL_LOAD='0',
+                   METRICS_DIR=os.path.join(tmp, 'metrics'))
+        output = subprocess.run([sys.executable, '-c', PROBE], env=env, check=True,
+                                capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    # The first import also compiles bytecode; keep it out of the timings
+    probe()
+    results = [probe() for _ in range(args.runs)]
+
+    def median(key):
+        return statistics.median(result[key] for result in results)
+
+    print(f"import app ({args.runs} runs, median): {median('import_ms'):.0f} ms, "
+          f"max RSS {median('maxrss_mb'):.1f} MB, {median('modules'):.0f} modules, "
+          f"{median('threads'):.0f} threads")
+    loaded = results[-1]['loaded']
+    print(f"scraping modules loaded: {', '.join(loaded) if loaded else 'none'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Box scores for /api/game_stats.
+
+``box_score`` reads a game and every player's stat line for it in a single
+joined query and splits the lines by team. A completed game's box score rarely
+changes, so its serialized response is kept in ``completed_box_scores`` for the
+life of the process. The key includes the ``games`` and ``game_stats`` data
+versions (see versions.py), which every write of games or stat lines bumps, so a
+re-ingest or a stat-line correction is picked up even when the final score is
+unchanged. Games that are scheduled or in progress are always read fresh.
+"""
+import json
+
+from sqlalchemy import select
+
+from config import BOX_SCORE_CACHE_MAX_BYTES
+from models import db, Player, TournamentGame, PlayerTournamentStat
+from response_cache import LRUCache
+from versions import current_versions
+
+STAT_LINE_FIELDS = ('points', 'rebounds', 'assists', 'steals', 'blocks', 'turnovers', 'minutes_played')
+
+completed_box_scores = LRUCache(BOX_SCORE_CACHE_MAX_BYTES)
+
+def game_status(game):
+    """Scraped status, falling back to is_completed for rows that predate it"""
+    return game.status or ('completed' if game.is_completed else 'scheduled')
+
+def box_score(game_id):
+    """Game details plus both teams' stat lines (highest scorers first), or None if there is no such game"""
+    stat_columns = [getattr(PlayerTournamentStat, field) for field in STAT_LINE_FIELDS]
+    rows = db.session.execute(
+        select(TournamentGame, Player.name, Player.school, *stat_columns)
+        .outerjoin(PlayerTournamentStat, PlayerTournamentStat.game_id == TournamentGame.id)
+        .outerjoin(Player, Player.id == PlayerTournamentStat.player_id)
+        .where(TournamentGame.id == game_id)
+    ).all()
+    if not rows:
+        return None
+
+    game = rows[0][0]
+    teams = {game.team1: [], game.team2: []}
+    for _, name, school, *values in rows:
+        # Games without stats yield a single row of NULLs; lines of other schools are skipped
+        if name is not None and school in teams:
+            line = {'name': name}
+            line.update((field, value or 0) for field, value in zip(STAT_LINE_FIELDS, values))
+            teams[school].append(line)
+    for lines in teams.values():
+        lines.sort(key=lambda line: (-line['points'], line['name']))
+
+    return {
+        'id': game.id,
+        'game_id': game.game_id,
+        'round': game.round,
+        'game_date': game.game_date.isoformat() if game.game_date else None,
+        'team1': game.team1,
+        'team2': game.team2,
+        'team1_score': game.team1_score,
+        'team2_score': game.team2_score,
+        'status': game_status(game),
+        'team1_players': teams[game.team1],
+        'team2_players': teams[game.team2]
+    }
+
+def box_score_json(game_id):
+    """Serialized box score and whether it is final, or ``(None, False)`` for an unknown game.
+
+    Completed games are served from ``completed_box_scores`` after a primary-key
+    lookup of their status and of the data versions.
+    """
+    state = db.session.execute(
+        select(TournamentGame.status, TournamentGame.is_completed).where(TournamentGame.id == game_id)
+    ).first()
+    if state is None:
+        return None, False
+    completed = game_status(state) == 'completed'
+
+    if completed:
+        versions = current_versions('games', 'game_stats')
+        key = (game_id, versions['games'], versions['game_stats'])
+        body = completed_box_scores.get(key)
+        if body is not None:
+            return body, True
+
+    data = box_score(game_id)
+    if data is None:
+        return None, False
+    body = json.dumps(data, separators=(',', ':'))
+    if completed:
+        completed_box_scores.put(key, body)
+    return body, completed
@@ -0,0 +1,214 @@
+"""Storage backends for the scraper's cached data.
+
+``MarchMadnessScraper.save_data``/``load_data`` go through one of these stores:
+
+    JsonFileStore: One pretty-printed JSON file per key in ``data/`` (the original layout).
+    SqliteStore: A single indexed SQLite file holding every entry as compact JSON.
+
+Both backends write atomically and support bulk ``get_many``/``put_many``. The
+``get_entry``/``get_many_entries`` variants also return each entry's last write
+time (Unix seconds), which the scraper compares against its per-entity TTLs.
+``touch`` resets that time without rewriting the value, for entries whose page
+the server reports unchanged.
+
+Keys are the cache names used by the scraper without the ``.json`` suffix, e.g.
+``team_players_Gonzaga_2025``. ``import_json_files`` migrates an existing
+``data/*.json`` layout into any store.
+"""
+import glob
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+def _key_from_filename(filename):
+    return filename[:-len('.json')] if filename.endswith('.json') else filename
+
+class JsonFileStore:
+    """One JSON file per key, replaced atomically on write"""
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        if not os.path.exists(self.data_dir):
+            os.makedirs(self.data_dir)
+
+    def _path(self, key):
+        return os.path.join(self.data_dir, f"{key}.json")
+
+    def get_entry(self, key):
+        """Return ``(value, updated_at)`` for ``key``, or None if missing"""
+        path = self._path(key)
+        try:
+            updated_at = os.path.getmtime(path)
+            with open(path, 'r') as f:
+                return json.load(f), updated_at
+        except FileNotFoundError:
+            return None
+
+    def get(self, key):
+        entry = self.get_entry(key)
+        return entry[0] if entry else None
+
+    def put(self, key, value):
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(value, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def touch(self, key):
+        """Mark ``key`` as written now; returns False if it is missing"""
+        try:
+            os.utime(self._path(key))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def get_many_entries(self, keys):
+        found = {}
+        for key in keys:
+            entry = self.get_entry(key)
+            if entry is not None:
+                found[key] = entry
+        return found
+
+    def get_many(self, keys):
+        return {key: value for key, (value, _) in self.get_many_entries(keys).items()}
+
+    def put_many(self, items):
+        for key, value in items.items():
+            self.put(key, value)
+
+    def __len__(self):
+        return len(glob.glob(os.path.join(self.data_dir, '*.json')))
+
+    def close(self, all_threads=False):
+        """Nothing to release: files are opened per call"""
+
+class SqliteStore:
+    """All entries in one SQLite table keyed by cache name.
+
+    Each thread gets its own connection, which ``close`` releases once the
+    thread has finished (the scraper calls it when a fetch pool shuts down). The
+    database runs in WAL mode so that concurrent fetch workers can read while
+    another worker commits, and every ``put``/``put_many`` is a single
+    transaction.
+    """
+    def __init__(self, path):
+        self.path = path
+        # Thread -> its connection; only that thread uses it, but ``close`` may run elsewhere
+        self._connections = {}
+        self._lock = threading.Lock()
+        with self._connection() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache_entries ('
+                ' key TEXT PRIMARY KEY,'
+                ' value TEXT NOT NULL,'
+                ' updated_at REAL NOT NULL'
+                ') WITHOUT ROWID'
+            )
+
+    def _connection(self):
+        thread = threading.current_thread()
+        conn = self._connections.get(thread)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            with self._lock:
+                self._connections[thread] = conn
+        return conn
+
+    def close(self, all_threads=False):
+        """Close the connections of finished threads, or of every thread if ``all_threads``.
+
+        With ``all_threads``, no other thread may be using the store; each
+        reopens a connection on its next call.
+        """
+        with self._lock:
+            closing = [thread for thread in self._connections if all_threads or not thread.is_alive()]
+            connections = [self._connections.pop(thread) for thread in closing]
+        for conn in connections:
+            conn.close()
+
+    @staticmethod
+    def _dumps(value):
+        return json.dumps(value, separators=(',', ':'))
+
+    def get_entry(self, key):
+        """Return ``(value, updated_at)`` for ``key``, or None if missing"""
+        row = self._connection().execute(
+            'SELECT value, updated_at FROM cache_entries WHERE key = ?', (key,)
+        ).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def get(self, key):
+        entry = self.get_entry(key)
+        return entry[0] if entry else None
+
+    def put(self, key, value):
+        self.put_many({key: value})
+
+    def touch(self, key):
+        """Mark ``key`` as written now; returns False if it is missing"""
+        with self._connection() as conn:
+            cursor = conn.execute('UPDATE cache_entries SET updated_at = ? WHERE key = ?', (time.time(), key))
+        return cursor.rowcount > 0
+
+    def get_many_entries(self, keys):
+        keys = list(keys)
+        found = {}
+        conn = self._connection()
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = conn.execute(
+                f'SELECT key, value, updated_at FROM cache_entries WHERE key IN ({placeholders})', chunk
+            )
+            found.update((key, (json.loads(value), updated_at)) for key, value, updated_at in rows)
+        return found
+
+    def get_many(self, keys):
+        return {key: value for key, (value, _) in self.get_many_entries(keys).items()}
+
+    def put_many(self, items):
+        now = time.time()
+        with self._connection() as conn:
+            conn.executemany(
+                'INSERT INTO cache_entries (key, value, updated_at) VALUES (?, ?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at',
+                [(key, self._dumps(value), now) for key, value in items.items()]
+            )
+
+    def __len__(self):
+        return self._connection().execute('SELECT COUNT(*) FROM cache_entries').fetchone()[0]
+
+def import_json_files(store, data_dir):
+    """Copy every ``data_dir/*.json`` cache file into ``store``; returns the number imported"""
+    items = {}
+    for path in sorted(glob.glob(os.path.join(data_dir, '*.json'))):
+        try:
+            with open(path, 'r') as f:
+                items[_key_from_filename(os.path.basename(path))] = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Skipping unreadable cache file {path}: {e}")
+    if items:
+        store.put_many(items)
+    logger.info(f"Imported {len(items)} cache files from {data_dir}")
+    return len(items)
+
+def create_store(backend, data_dir):
+    """Build the configured store; a new SQLite store imports any existing JSON files"""
+    if backend == 'json':
+        return JsonFileStore(data_dir)
+    if backend == 'sqlite':
+        path = os.path.join(data_dir, 'scrape_cache.db')
+        is_new = not os.path.exists(path)
+        store = SqliteStore(path)
+        if is_new:
+            import_json_files(store, data_dir)
+        return store
+    raise ValueError(f"Unknown scrape cache backend: {backend}")
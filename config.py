@@ -5,12 +5,114 @@ from datetime import datetime
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
 
 # Database configuration
-SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(BASE_DIR, 'data', 'database.db')
+SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///' + os.path.join(BASE_DIR, 'data', 'database.db'))
 SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+# SQLite settings applied to every connection (see database.py). WAL lets pages be
+# read while the scraper writes; busy_timeout is how long a writer waits for the
+# write lock (ms) before failing with "database is locked"
+SQLITE_PRAGMAS = {
+    'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),  # NORMAL is durable in WAL mode
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 10000)),
+    'cache_size': -16000,  # KiB of page cache per connection
+    'temp_store': 'MEMORY'
+}
+
+# Connection pool of each engine in each web worker, sized for the gunicorn threads
+DATABASE_POOL_OPTIONS = {'pool_size': 8, 'max_overflow': 8, 'pool_timeout': 30, 'pool_recycle': 3600}
+
+# Send the queries of read-only requests to a separate, query-only engine, on
+# DATABASE_READ_URL (e.g. a replica) or by default the same database
+DATABASE_READ_SPLIT = os.environ.get('DATABASE_READ_SPLIT', '1') != '0'
+DATABASE_READ_URL = os.environ.get('DATABASE_READ_URL')
+
 # Scraping configuration
-ESPN_BASE_URL = 'https://www.espn.com/mens-college-basketball/'
+ESPN_BASE_URL = os.environ.get('ESPN_BASE_URL', 'https://www.espn.com/mens-college-basketball/')
 SCRAPING_INTERVAL_HOURS = 24  # Scrape once per day
+GAME_SCORES_INTERVAL_HOURS = 1
+
+# Queue a scrape of an empty database at startup (initial_load.py); set
+# INITIAL_LOAD=0 to start with an empty database instead, e.g. for benchmarks.
+# A failed load is queued again after INITIAL_LOAD_RETRY_SECONDS
+INITIAL_LOAD = os.environ.get('INITIAL_LOAD', '1') != '0'
+INITIAL_LOAD_RETRY_SECONDS = 60
+
+# Scraper worker (worker.py): only the process holding the lease runs the job
+# queue. It renews the lease every WORKER_LEASE_RENEW_SECONDS;
+# another process takes over once it has gone unrenewed for WORKER_LEASE_SECONDS
+WORKER_LEASE_SECONDS = 60
+WORKER_LEASE_RENEW_SECONDS = 20
+
+# Background job queue (jobs.py): how often the worker checks it for new jobs,
+# and how many finished jobs are kept for /api/jobs/<id>
+JOB_POLL_SECONDS = 2
+JOB_HISTORY = 100
+
+# Scrape run reports (scrape_report.py): how many are kept for /api/scrape_reports
+SCRAPE_REPORT_HISTORY = 50
+
+# Scraper concurrency: number of fetch workers sharing one pooled HTTP session,
+# and the maximum request rate sent to any single host across those workers
+SCRAPER_MAX_WORKERS = int(os.environ.get('SCRAPER_MAX_WORKERS', 8))
+SCRAPER_REQUESTS_PER_SECOND = float(os.environ.get('SCRAPER_REQUESTS_PER_SECOND', 10))
+SCRAPER_REQUEST_TIMEOUT = 15  # Seconds
+
+# Scraper HTTP transport (transport.py): 'live', 'record' (live, and every response
+# is saved to SCRAPER_ARCHIVE) or 'replay' (answered from SCRAPER_ARCHIVE, with no
+# network, after the recorded latency times SCRAPER_REPLAY_LATENCY_SCALE)
+SCRAPER_TRANSPORT = os.environ.get('SCRAPER_TRANSPORT', 'live')
+SCRAPER_ARCHIVE = os.environ.get('SCRAPER_ARCHIVE', os.path.join(BASE_DIR, 'data', 'http_archive.db'))
+SCRAPER_REPLAY_LATENCY_SCALE = float(os.environ.get('SCRAPER_REPLAY_LATENCY_SCALE', 1.0))
+
+# How long scraped data stays fresh, per cache entity type (seconds). Stale entries
+# are still served immediately while a background refresh fetches a new copy.
+SCRAPE_CACHE_TTL_SECONDS = {
+    'tournament_teams': SCRAPING_INTERVAL_HOURS * 3600,
+    'team_players': 3 * 24 * 3600,  # Rosters: days
+    'player_stats': 6 * 3600,  # Season stats: hours
+    'tournament_games': 15 * 60,
+    'player_game_stats': 5 * 60,  # Live game stats: minutes
+}
+
+# Scrape cache backend: 'sqlite' (one indexed file, data/scrape_cache.db) or
+# 'json' (one file per entry in data/)
+SCRAPE_CACHE_BACKEND = os.environ.get('SCRAPE_CACHE_BACKEND', 'sqlite')
+
+# Request metrics served at /metrics (metrics.py). Each web worker writes its totals
+# to METRICS_DIR at most every METRICS_FLUSH_SECONDS; set METRICS=0 to turn them off
+METRICS_ENABLED = os.environ.get('METRICS', '1') != '0'
+METRICS_DIR = os.environ.get('METRICS_DIR', os.path.join(BASE_DIR, 'data', 'metrics'))
+METRICS_FLUSH_SECONDS = 5
+
+# Query guard (query_guard.py), for development and CI: 'log' or 'raise' flags requests
+# that run one statement shape QUERY_GUARD_REPEATS times or more (N+1 lazy loads) or
+# run past their view's @query_budget
+QUERY_GUARD = os.environ.get('QUERY_GUARD', 'off')
+QUERY_GUARD_REPEATS = int(os.environ.get('QUERY_GUARD_REPEATS', 5))
+
+# Live updates (/api/stream): how often each web worker checks for new events,
+# how many events are kept for reconnecting browsers, and how long one stream is
+# held open before the browser reconnects (it resumes from its last event)
+EVENT_POLL_INTERVAL_SECONDS = float(os.environ.get('EVENT_POLL_INTERVAL_SECONDS', 0.5))
+EVENT_RETENTION = 1000
+STREAM_HEARTBEAT_SECONDS = 15
+STREAM_MAX_SECONDS = 300
+# Each open stream holds one of a web worker's gunicorn threads (--threads in Procfile).
+# A worker keeps at most STREAM_SLOTS streams open, so the other threads stay free for
+# pages and picks; browsers beyond that are answered as short polls (the events they
+# missed) and reconnect after STREAM_POLL_RETRY_MS
+STREAM_SLOTS = int(os.environ.get('STREAM_SLOTS', 4))
+STREAM_POLL_RETRY_MS = 3000
+
+# Serialized JSON API responses kept per web worker, keyed by data version (bytes)
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+
+# Rendered page fragments (player list, draft tables, standings) kept per web worker (bytes)
+FRAGMENT_CACHE_MAX_BYTES = int(os.environ.get('FRAGMENT_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+
+# Box scores of completed games, kept per web worker for the life of the process (bytes)
+BOX_SCORE_CACHE_MAX_BYTES = 8 * 1024 * 1024
 
 # Tournament configuration
 CURRENT_YEAR = datetime.now().year
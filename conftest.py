@@ -0,0 +1,59 @@
+"""Shared pytest fixtures: the real app against a throwaway SQLite database.
+
+config.py reads the environment at import time, so the scratch database is
+configured here, before any test module imports the app. Tests run with the
+query guard raising (see query_guard.py), so an N+1 or a blown query budget
+fails the test that hits it.
+"""
+import atexit
+import os
+import shutil
+import tempfile
+
+import pytest
+
+_tmp = tempfile.mkdtemp(prefix='march-madness-tests-')
+atexit.register(shutil.rmtree, _tmp, True)
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(_tmp, 'test.db')
+os.environ['INITIAL_LOAD'] = '0'
+os.environ['METRICS'] = '0'
+os.environ['QUERY_GUARD'] = 'raise'
+
+@pytest.fixture(scope='session')
+def app():
+    from app import app
+    return app
+
+@pytest.fixture
+def db(app):
+    """The app's ``db`` inside an app context, with the draft and tournament tables emptied"""
+    from sqlalchemy import delete, update
+    from models import (db, DataVersion, DraftPick, Event, Participant, ParticipantScore, PickScore, Player,
+                        PlayerTournamentStat, TournamentGame)
+
+    with app.app_context():
+        for model in (PickScore, ParticipantScore, DraftPick, PlayerTournamentStat, TournamentGame, Participant,
+                      Player, Event):
+            db.session.execute(delete(model))
+        # Every cached response and fragment is keyed on these, so none survives the reset
+        db.session.execute(update(DataVersion).values(version=DataVersion.version + 1))
+        db.session.commit()
+        yield db
+        db.session.remove()
+
+@pytest.fixture
+def client(app, db):
+    return app.test_client()
+
+@pytest.fixture
+def draft(db):
+    """Two participants and four players, as ``{'participants': [ids], 'players': [ids]}``"""
+    from models import Participant, Player
+
+    participants = [Participant(name=f'Participant {i}', email=f'p{i}@example.com') for i in range(2)]
+    players = [Player(name=f'Player {i}', school=f'Team {i}', position='G', ppg=10.0 + i, rpg=5.0, apg=3.0,
+                      school_seed=i + 1, region='East') for i in range(4)]
+    db.session.add_all(participants + players)
+    db.session.commit()
+    return {'participants': [participant.id for participant in participants],
+            'players': [player.id for player in players]}
@@ -0,0 +1,92 @@
+"""Database engine setup for multi-worker deployments.
+
+Every connection gets the ``SQLITE_PRAGMAS`` from config.py. By default these
+select WAL journaling, so readers keep reading the last committed data while
+the scraper writes. They also set a busy timeout, so a second writer waits for
+the write lock instead of failing with "database is locked". They tune
+``synchronous`` and the page cache for that mode as well.
+
+Requests that cannot change data (GET, HEAD, OPTIONS) run their queries on a
+separate ``read`` engine with its own connection pool. Its connections are
+``query_only``. They never take the write lock and never queue for a connection
+behind a long ingest. ``DATABASE_READ_URL`` can point that engine at a replica.
+Flushes and INSERT/UPDATE/DELETE statements always go to the primary engine.
+"""
+import logging
+import sqlite3
+
+from flask import request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.sql.dml import UpdateBase
+
+from config import DATABASE_POOL_OPTIONS, DATABASE_READ_SPLIT, DATABASE_READ_URL, SQLITE_PRAGMAS
+
+logger = logging.getLogger(__name__)
+
+READ_BIND = 'read'
+READ_ONLY_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+class RoutingSession(Session):
+    """Session that sends the reads of read-only requests to the ``read`` engine"""
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and self.info.get('read_only') and not self._flushing
+                and not isinstance(clause, UpdateBase)):
+            reader = self._db.engines.get(READ_BIND)
+            if reader is not None:
+                return reader
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+def _is_memory_sqlite(url):
+    url = make_url(url)
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+def engine_options(url):
+    """Pool settings for ``url`` (in-memory SQLite keeps its single static connection)"""
+    return {} if _is_memory_sqlite(url) else dict(DATABASE_POOL_OPTIONS)
+
+def configure_connection(dbapi_connection, read_only=False):
+    """Apply ``SQLITE_PRAGMAS`` to a new SQLite connection (other drivers are left alone)"""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        # The journal mode is a property of the file, set by the writers
+        if read_only and name == 'journal_mode':
+            continue
+        cursor.execute(f'PRAGMA {name}={value}')
+    if read_only:
+        cursor.execute('PRAGMA query_only=ON')
+    cursor.close()
+
+def configure_engine(engine, read_only=False):
+    """Run ``configure_connection`` on every connection ``engine`` opens"""
+    @event.listens_for(engine, 'connect')
+    def _on_connect(dbapi_connection, connection_record):
+        configure_connection(dbapi_connection, read_only)
+
+def init_app(app, db):
+    """Configure ``db``'s engines for ``app`` and route read-only requests to the read engine"""
+    url = app.config['SQLALCHEMY_DATABASE_URI']
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(url))
+    read_split = DATABASE_READ_SPLIT and not _is_memory_sqlite(url)
+    if read_split:
+        read_url = DATABASE_READ_URL or url
+        app.config.setdefault('SQLALCHEMY_BINDS', {})[READ_BIND] = dict(engine_options(read_url), url=read_url)
+    db.session.session_factory.class_ = RoutingSession
+    db.init_app(app)
+
+    with app.app_context():
+        for key, engine in db.engines.items():
+            configure_engine(engine, read_only=(key == READ_BIND))
+
+    if read_split:
+        @app.before_request
+        def _route_reads():
+            db.session.info['read_only'] = request.method in READ_ONLY_METHODS
+
+        @app.teardown_request
+        def _end_read_routing(exc):
+            # The session can outlive the request, e.g. under an app context pushed by a script
+            db.session.info.pop('read_only', None)
@@ -0,0 +1,194 @@
+"""Change events behind the /api/stream Server-Sent Events endpoint.
+
+Code that changes the draft or the leaderboard calls ``publish``, which inserts
+an ``Event`` row on the same connection as the change. The event therefore
+becomes visible exactly when, and only if, the change commits, and every
+gunicorn worker sees it because it lives in the shared database.
+
+Each web worker runs one ``EventBus`` poller thread while it has open streams.
+The poller reads new rows with a single indexed query per poll interval and fans
+them out to that worker's subscribers, so the cost of live updates does not grow
+with the number of open browsers. A browser that reconnects sends the id of the
+last event it saw and is replayed what it missed; if those events have already
+been pruned it is told to ``resync`` (reload its lists) instead.
+
+An open stream holds one of the worker's threads, so each worker keeps at most
+``STREAM_SLOTS`` of them. Browsers beyond that are answered as short polls from
+``replay``: what they missed, then a reconnect a few seconds later.
+
+Event kinds:
+    pick_added / pick_removed: One draft pick (see ``picks.pick_event_data``).
+    picks_reset: Every pick was deleted.
+    score_changed: ``{"scores": [{participant_id, total_points, pick_count}, ...]}``.
+    scores_rebuilt: Every score was recomputed.
+"""
+import json
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import delete, func, insert, select
+
+from config import EVENT_POLL_INTERVAL_SECONDS, EVENT_RETENTION, STREAM_SLOTS
+from models import db, Event
+
+logger = logging.getLogger(__name__)
+
+def publish(kind, data, connection=None):
+    """Record an event in the current transaction; it is delivered once that commits"""
+    connection = connection or db.session.connection()
+    connection.execute(insert(Event).values(
+        kind=kind,
+        payload=json.dumps(data, separators=(',', ':')),
+        created_at=datetime.utcnow()
+    ))
+
+def publish_all(kind, items, connection=None):
+    """Record one ``kind`` event per item of ``items`` in the current transaction, in one statement"""
+    if not items:
+        return
+    connection = connection or db.session.connection()
+    created_at = datetime.utcnow()
+    connection.execute(insert(Event), [
+        {'kind': kind, 'payload': json.dumps(data, separators=(',', ':')), 'created_at': created_at}
+        for data in items
+    ])
+
+class Subscription:
+    """Queue of ``(id, kind, payload)`` events for one open stream, in id order"""
+    def __init__(self, last_id):
+        self.last_id = last_id
+        self._queue = queue.Queue()
+
+    def put(self, event):
+        self._queue.put(event)
+
+    def get(self, timeout):
+        """Next undelivered event, or None if none arrives within ``timeout`` seconds"""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                event = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                return None
+            # Replayed backlog and the poller can overlap; skip anything already sent
+            if event[0] > self.last_id:
+                self.last_id = event[0]
+                return event
+
+class EventBus:
+    """Per-process fan-out of new ``Event`` rows to the open streams"""
+    def __init__(self, poll_interval=EVENT_POLL_INTERVAL_SECONDS, retention=EVENT_RETENTION,
+                 stream_slots=STREAM_SLOTS):
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.app = None
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._stream_slots = threading.BoundedSemaphore(stream_slots)
+        self._poller = None
+        self._last_id = 0
+
+    def init_app(self, app):
+        self.app = app
+
+    def subscribe(self, last_event_id=None):
+        """Register a stream, replaying events after ``last_event_id`` (needs an app context).
+
+        Returns None, registering nothing, when every stream slot of this worker is taken.
+        """
+        if not self._stream_slots.acquire(blocking=False):
+            return None
+        subscription = None
+        try:
+            latest = db.session.execute(select(func.max(Event.id))).scalar() or 0
+            if last_event_id is None or last_event_id > latest:
+                last_event_id = latest
+            subscription = Subscription(last_event_id)
+
+            # Catch up under the lock the poller fans out under, so that no event can be
+            # delivered to this stream ahead of an older one (ids commit in order)
+            with self._lock:
+                self._subscribers.add(subscription)
+                if self._poller is None:
+                    self._last_id = latest
+                    self._poller = threading.Thread(target=self._poll, name='event-bus', daemon=True)
+                    self._poller.start()
+                for event in self._missed(last_event_id, latest):
+                    subscription.put(event)
+        except Exception:
+            with self._lock:
+                self._subscribers.discard(subscription)
+            self._stream_slots.release()
+            raise
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribed = subscription in self._subscribers
+            self._subscribers.discard(subscription)
+        if subscribed:
+            self._stream_slots.release()
+
+    def replay(self, last_event_id=None):
+        """``(last_id, events)`` after ``last_event_id``, for a poll that opens no stream (needs an app context)"""
+        latest = db.session.execute(select(func.max(Event.id))).scalar() or 0
+        if last_event_id is None or last_event_id > latest:
+            last_event_id = latest
+        return last_event_id, self._missed(last_event_id, latest)
+
+    def _missed(self, last_event_id, latest):
+        oldest = db.session.execute(select(func.min(Event.id))).scalar()
+        if oldest is not None and oldest > last_event_id + 1:
+            # The events this client missed were pruned; it has to reload instead
+            return [(latest, 'resync', '{}')]
+        return [tuple(row) for row in db.session.execute(
+            select(Event.id, Event.kind, Event.payload).where(Event.id > last_event_id).order_by(Event.id)
+        )]
+
+    def _poll(self):
+        polls = 0
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    # Stop when the last stream closes; the next subscribe restarts it
+                    self._poller = None
+                    return
+            try:
+                with self.app.app_context():
+                    rows = db.session.execute(
+                        select(Event.id, Event.kind, Event.payload).where(Event.id > self._last_id).order_by(Event.id)
+                    ).all()
+                    polls += 1
+                    if polls % 600 == 0:
+                        self.prune()
+            except Exception as e:
+                logger.error(f"Error polling events: {e}")
+                rows = []
+
+            if rows:
+                self._last_id = rows[-1][0]
+                with self._lock:
+                    for subscription in self._subscribers:
+                        for row in rows:
+                            subscription.put(tuple(row))
+            time.sleep(self.poll_interval)
+
+    def prune(self):
+        """Delete all but the newest ``retention`` events (needs an app context)"""
+        cutoff = db.session.execute(select(func.max(Event.id))).scalar()
+        if cutoff is None:
+            return
+        db.session.execute(delete(Event).where(Event.id <= cutoff - self.retention))
+        db.session.commit()
+
+bus = EventBus()
+
+def format_sse(event_id, kind, payload):
+    """Serialize one event in the text/event-stream format"""
+    return f"id: {event_id}\nevent: {kind}\ndata: {payload}\n\n"
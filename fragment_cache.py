@@ -0,0 +1,75 @@
+"""Version-keyed caching of rendered template fragments.
+
+Wrapping an expensive block of a template in
+
+    {% cache 'draft_board', ['draft_picks', 'participants', 'players'] %}
+        {% set participants = load_board() %}
+        ...
+    {% endcache %}
+
+renders it once per combination of the named data version counters (see
+versions.py) and the optional third ``vary`` argument (e.g. the query string),
+then serves the stored HTML until one of those counters is bumped. A write
+therefore invalidates every fragment built from the data it touched, in every
+worker, without any explicit purge. The data a fragment needs is loaded inside
+the block through a function passed in by the view, so a cache hit skips the
+queries as well as the rendering.
+
+Fragments live in a per-process ``LRUCache`` bounded by
+``FRAGMENT_CACHE_MAX_BYTES``. Hit rates, overall and per fragment, are reported
+by ``stats`` (served at /api/cache_stats).
+"""
+import threading
+
+from jinja2 import nodes
+from jinja2.ext import Extension
+
+from config import FRAGMENT_CACHE_MAX_BYTES
+from response_cache import LRUCache
+from versions import current_versions
+
+fragment_cache = LRUCache(FRAGMENT_CACHE_MAX_BYTES)
+
+# Per-fragment hit and miss counts
+_fragment_counters = {}
+_counters_lock = threading.Lock()
+
+def _count(name, hit):
+    with _counters_lock:
+        counters = _fragment_counters.setdefault(name, {'hits': 0, 'misses': 0})
+        counters['hits' if hit else 'misses'] += 1
+
+def stats():
+    """Cache counters plus the hit rate of each fragment"""
+    with _counters_lock:
+        fragments = {
+            name: dict(counters, hit_rate=round(counters['hits'] / (counters['hits'] + counters['misses']), 3))
+            for name, counters in sorted(_fragment_counters.items())
+        }
+    return dict(fragment_cache.stats(), fragments=fragments)
+
+class FragmentCacheExtension(Extension):
+    """Jinja tag ``{% cache name, version_names[, vary] %}...{% endcache %}``"""
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        parser.stream.expect('comma')
+        args.append(parser.parse_expression())
+        if parser.stream.skip_if('comma'):
+            args.append(parser.parse_expression())
+        else:
+            args.append(nodes.Const(None))
+        body = parser.parse_statements(['name:endcache'], drop_needle=True)
+        return nodes.CallBlock(self.call_method('_render', args), [], [], body).set_lineno(lineno)
+
+    def _render(self, name, version_names, vary, caller):
+        versions = current_versions(*version_names)
+        key = (name, tuple(versions[version_name] for version_name in version_names), vary)
+        html = fragment_cache.get(key)
+        _count(name, html is not None)
+        if html is None:
+            html = caller()
+            fragment_cache.put(key, html)
+        return html
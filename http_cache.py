@@ -0,0 +1,115 @@
+"""On-disk HTTP validator cache used by MarchMadnessScraper.get_page.
+
+For every URL that answered with an ``ETag`` or ``Last-Modified`` header, the
+cache keeps the validators and the raw response body. Later requests for the
+URL are sent as conditional GETs, and a ``304 Not Modified`` answer is served
+from the stored body instead of being downloaded again.
+
+Counters:
+    hits: 304 answers served from the cache.
+    misses: Requests sent without validators (nothing cached for the URL).
+    revalidated: Conditional requests whose page had changed (full 200 body).
+    bytes_downloaded: Response body bytes received over the network.
+    bytes_saved: Cached body bytes that did not have to be downloaded.
+    parses_skipped: 304 answers where the caller skipped HTML parsing entirely.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+class HttpCache:
+    """Per-URL store of response validators and bodies.
+
+    Entries are two files named after the SHA-1 of the URL: ``<key>.json`` holds
+    the validators and ``<key>.body`` the raw bytes. Both are written atomically
+    so concurrent fetch workers never observe a partial entry.
+    """
+    COUNTERS = ('hits', 'misses', 'revalidated', 'bytes_downloaded', 'bytes_saved', 'parses_skipped')
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+        self._lock = threading.Lock()
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
+
+    def _paths(self, url):
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + '.json', base + '.body'
+
+    def _count(self, **increments):
+        with self._lock:
+            for name, value in increments.items():
+                self.counters[name] += value
+
+    def conditional_headers(self, url):
+        """Request headers that make a GET for ``url`` conditional, if it is cached"""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not os.path.exists(body_path):
+            return {}
+
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def load_body(self, url):
+        """Return the cached body bytes for ``url``, or None if missing"""
+        _, body_path = self._paths(url)
+        try:
+            with open(body_path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def store(self, url, response, conditional=False):
+        """Record a full (200) response, keeping its body if it carries validators"""
+        self._count(bytes_downloaded=len(response.content),
+                    **{'revalidated' if conditional else 'misses': 1})
+
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+
+        meta_path, body_path = self._paths(url)
+        try:
+            self._write_atomic(body_path, response.content)
+            self._write_atomic(meta_path, json.dumps({
+                'url': url,
+                'etag': etag,
+                'last_modified': last_modified
+            }).encode('utf-8'))
+        except OSError as e:
+            logger.error(f"Error caching response for {url}: {e}")
+
+    def record_not_modified(self, url, body_size, parsed):
+        """Count a 304 answer that was served from the cached body"""
+        self._count(hits=1, bytes_saved=body_size, parses_skipped=0 if parsed else 1)
+
+    def stats(self):
+        """Snapshot of the counters, plus the hit ratio over all requests"""
+        with self._lock:
+            stats = dict(self.counters)
+        requests_made = stats['hits'] + stats['misses'] + stats['revalidated']
+        stats['hit_ratio'] = round(stats['hits'] / requests_made, 3) if requests_made else 0.0
+        return stats
+
+    @staticmethod
+    def _write_atomic(path, data):
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
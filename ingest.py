@@ -0,0 +1,284 @@
+"""Bulk ingest of scraped players, games and per-game player stats.
+
+``IngestWriter`` preloads the natural keys of existing rows into dictionaries,
+so each batch needs one lookup query instead of one per row. It then writes all
+inserts and updates for the batch in a single transaction. On SQLite (3.24+) it
+uses a native ``INSERT ... ON CONFLICT DO UPDATE`` keyed on the primary key it
+already resolved. Other databases fall back to SQLAlchemy's bulk insert and
+bulk update-by-primary-key.
+
+Every batch is recorded as an ``IngestStats`` entry and logged with its
+throughput in rows/sec.
+
+Per-game stats are ingested incrementally. When a game's stats are written, the
+game is stamped with a fingerprint of its scraped data (status, teams, scores).
+``games_needing_stats`` then picks only completed games that have never been
+ingested or whose fingerprint has changed since.
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from datetime import datetime
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from models import db, Player, TournamentGame, PlayerTournamentStat
+from scoring import refresh_player_scores
+from versions import bump_version
+
+logger = logging.getLogger(__name__)
+
+PLAYER_COLUMNS = ['name', 'school', 'position', 'jersey_number', 'year_in_school',
+                  'ppg', 'rpg', 'apg', 'school_seed', 'region']
+STAT_COLUMNS = ['points', 'rebounds', 'assists', 'steals', 'blocks', 'turnovers', 'minutes_played']
+
+ROUND_NAMES = {
+    0: 'First Four',
+    1: 'First Round',
+    2: 'Second Round',
+    3: 'Sweet 16',
+    4: 'Elite Eight',
+    5: 'Final Four',
+    6: 'Championship'
+}
+
+def game_row(game_data):
+    """Map a scraped game dict onto TournamentGame columns"""
+    game_date = game_data.get('game_date')
+    if isinstance(game_date, str):
+        game_date = datetime.strptime(game_date, '%Y-%m-%d').date()
+    return {
+        'game_id': game_data['game_id'],
+        'round_name': ROUND_NAMES.get(game_data.get('round'), game_data.get('round_name')),
+        'game_date': game_date,
+        'team1': game_data['team1'],
+        'team2': game_data['team2'],
+        'team1_score': game_data.get('team1_score'),
+        'team2_score': game_data.get('team2_score'),
+        'is_completed': game_data.get('status') == 'completed',
+        'status': game_data.get('status')
+    }
+
+def game_fingerprint(game_data):
+    """Stable hash of the scraped fields that determine a game's box score"""
+    fields = {field: game_data.get(field) for field in ('status', 'team1', 'team2', 'team1_score', 'team2_score')}
+    return hashlib.sha1(json.dumps(fields, sort_keys=True).encode('utf-8')).hexdigest()
+
+class IngestStats:
+    """Row counts and timing for one ingest batch"""
+    def __init__(self, entity):
+        self.entity = entity
+        self.inserted = 0
+        self.updated = 0
+        self.skipped = 0
+        self.seconds = 0.0
+
+    @property
+    def rows(self):
+        return self.inserted + self.updated
+
+    @property
+    def rows_per_sec(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def to_dict(self):
+        return {
+            'entity': self.entity,
+            'inserted': self.inserted,
+            'updated': self.updated,
+            'skipped': self.skipped,
+            'seconds': round(self.seconds, 4),
+            'rows_per_sec': round(self.rows_per_sec, 1)
+        }
+
+    def __repr__(self):
+        return (f'<IngestStats {self.entity}: {self.inserted} inserted, {self.updated} updated, '
+                f'{self.skipped} skipped in {self.seconds:.3f}s ({self.rows_per_sec:.0f} rows/sec)>')
+
+class IngestWriter:
+    """Writes scraped rows in bulk, one transaction per batch.
+
+    Attributes:
+        session: SQLAlchemy session used for all statements (defaults to ``db.session``).
+        batches: ``IngestStats`` for every batch written by this writer, in order.
+        games_ingested: Completed games whose stats were (re)ingested by this writer.
+        games_skipped: Completed games skipped because their data was unchanged.
+    """
+    def __init__(self, session=None):
+        self.session = session or db.session
+        self.batches = []
+        self.games_ingested = 0
+        self.games_skipped = 0
+        self._player_ids = None
+        self._game_ids = None
+
+    @property
+    def native_upsert(self):
+        """Whether the bound database supports SQLite's ``ON CONFLICT DO UPDATE``"""
+        return (self.session.get_bind().dialect.name == 'sqlite'
+                and sqlite3.sqlite_version_info >= (3, 24, 0))
+
+    def player_ids(self):
+        """Map of ``(name, school)`` to player id, loaded once per writer"""
+        if self._player_ids is None:
+            rows = self.session.execute(select(Player.name, Player.school, Player.id))
+            self._player_ids = {(name, school): pk for name, school, pk in rows}
+        return self._player_ids
+
+    def game_ids(self):
+        """Map of scraped game id to TournamentGame id, loaded once per writer"""
+        if self._game_ids is None:
+            rows = self.session.execute(
+                select(TournamentGame.game_id, TournamentGame.id).where(TournamentGame.game_id.isnot(None))
+            )
+            self._game_ids = dict(rows.all())
+        return self._game_ids
+
+    def upsert_players(self, players):
+        """Insert or update scraped player dicts, keyed on ``(name, school)``"""
+        existing = self.player_ids()
+        rows = {}
+        for player_data in players:
+            key = (player_data['name'], player_data['school'])
+            row = {column: player_data.get(column) for column in PLAYER_COLUMNS}
+            row['id'] = existing.get(key)
+            rows[key] = row
+
+        stats = self._write(Player, 'players', list(rows.values()), after_write=lambda: bump_version('players'))
+        self._player_ids = None
+        return stats
+
+    def upsert_games(self, games):
+        """Insert or update scraped game dicts, keyed on the scraped game id"""
+        existing = self.game_ids()
+        rows = {}
+        for game_data in games:
+            row = game_row(game_data)
+            row['id'] = existing.get(row['game_id'])
+            rows[row['game_id']] = row
+
+        stats = self._write(TournamentGame, 'games', list(rows.values()), after_write=lambda: bump_version('games'))
+        self._game_ids = None
+        return stats
+
+    def games_needing_stats(self, games, force=False):
+        """Completed games whose stats are missing or stale, i.e. whose fingerprint changed"""
+        completed = [game_data for game_data in games if game_data.get('status') == 'completed']
+        if force:
+            return completed
+
+        fingerprints = dict(self.session.execute(
+            select(TournamentGame.game_id, TournamentGame.stats_fingerprint)
+            .where(TournamentGame.game_id.in_([game_data['game_id'] for game_data in completed]))
+        ).all())
+        needed = [game_data for game_data in completed
+                  if fingerprints.get(game_data['game_id']) != game_fingerprint(game_data)]
+        self.games_skipped += len(completed) - len(needed)
+        return needed
+
+    def upsert_player_game_stats(self, stat_lines, games=()):
+        """Insert or update per-game stat lines and refresh the affected leaderboard scores.
+
+        Each stat line is a dict with ``name``, ``school`` and ``game_id`` (the scraped
+        game id) plus the stat values. Lines for unknown players or games are skipped.
+        The scraped ``games`` the lines belong to are stamped with their fingerprint in
+        the same transaction.
+        """
+        player_ids = self.player_ids()
+        game_ids = self.game_ids()
+
+        rows = {}
+        skipped = 0
+        for line in stat_lines:
+            player_id = player_ids.get((line['name'], line['school']))
+            game_pk = game_ids.get(line['game_id'])
+            if player_id is None or game_pk is None:
+                logger.error(f"Skipping stats for {line['name']} ({line['school']}), game {line['game_id']}: "
+                             f"{'player' if player_id is None else 'game'} not found in database")
+                skipped += 1
+                continue
+            row = {column: line.get(column, 0) for column in STAT_COLUMNS}
+            row.update(player_id=player_id, game_id=game_pk)
+            rows[(player_id, game_pk)] = row
+
+        # Preload the existing stat rows for just the games in this batch
+        existing = {}
+        batch_game_ids = sorted({game_pk for _, game_pk in rows})
+        for start in range(0, len(batch_game_ids), 500):
+            result = self.session.execute(
+                select(PlayerTournamentStat.player_id, PlayerTournamentStat.game_id, PlayerTournamentStat.id)
+                .where(PlayerTournamentStat.game_id.in_(batch_game_ids[start:start + 500]))
+            )
+            existing.update({(player_id, game_pk): pk for player_id, game_pk, pk in result})
+        for key, row in rows.items():
+            row['id'] = existing.get(key)
+
+        affected_players = {player_id for player_id, _ in rows}
+
+        def after_write():
+            refresh_player_scores(affected_players)
+            self._stamp_games(games)
+            bump_version('game_stats')
+
+        stats = self._write(PlayerTournamentStat, 'player_game_stats', list(rows.values()), after_write)
+        stats.skipped = skipped
+        self.games_ingested += len(games)
+        return stats
+
+    def _stamp_games(self, games):
+        now = datetime.utcnow()
+        for game_data in games:
+            self.session.execute(
+                update(TournamentGame)
+                .where(TournamentGame.game_id == game_data['game_id'])
+                .values(stats_fingerprint=game_fingerprint(game_data), stats_ingested_at=now)
+            )
+
+    def _write(self, model, entity, rows, after_write=None):
+        """Apply ``rows`` (new rows have ``id`` None) to ``model`` in one transaction"""
+        stats = IngestStats(entity)
+        stats.inserted = sum(1 for row in rows if row['id'] is None)
+        stats.updated = len(rows) - stats.inserted
+
+        start = time.perf_counter()
+        try:
+            if rows:
+                now = datetime.utcnow()
+                if self.native_upsert:
+                    self._sqlite_upsert(model, rows, now)
+                else:
+                    self._bulk_insert_update(model, rows, now)
+            if after_write:
+                after_write()
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        stats.seconds = time.perf_counter() - start
+
+        self.batches.append(stats)
+        logger.info(f"Ingested {stats.rows} {entity} ({stats.inserted} inserted, {stats.updated} updated) "
+                    f"in {stats.seconds:.3f}s ({stats.rows_per_sec:.0f} rows/sec)")
+        return stats
+
+    def _sqlite_upsert(self, model, rows, now):
+        for row in rows:
+            row['updated_at'] = now
+        stmt = sqlite_insert(model)
+        columns = [column for column in rows[0] if column != 'id']
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['id'],
+            set_={column: stmt.excluded[column] for column in columns}
+        )
+        self.session.execute(stmt, rows)
+
+    def _bulk_insert_update(self, model, rows, now):
+        inserts = [{k: v for k, v in row.items() if k != 'id'} for row in rows if row['id'] is None]
+        updates = [dict(row, updated_at=now) for row in rows if row['id'] is not None]
+        if inserts:
+            self.session.execute(insert(model), inserts)
+        if updates:
+            self.session.execute(update(model), updates)
@@ -0,0 +1,122 @@
+"""Initial data load for an empty database, run as a worker job.
+
+A fresh deploy has no players until the first full scrape finishes, which takes
+minutes. When the web app starts on an empty database, ``start`` records the
+load in the single ``InitialLoad`` row and queues an ``update_data`` job (see
+jobs.py) for the worker process (worker.py), so no web worker ever scrapes.
+Pages show a "loading data" screen meanwhile (see app.py), and ``/readyz``
+reports the job's stage and progress until the load is done.
+
+The worker calls ``supervise`` each time it runs the job queue. It marks the
+load ready once an ``update_data`` job has succeeded, and queues another one
+``INITIAL_LOAD_RETRY_SECONDS`` after a failed one, so a failed load is retried
+without restarting anything.
+"""
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy.exc import IntegrityError
+
+from config import INITIAL_LOAD, INITIAL_LOAD_RETRY_SECONDS
+from jobs import enqueue
+from models import db, Player, InitialLoad, Job
+
+logger = logging.getLogger(__name__)
+
+LOAD_ID = 1
+JOB_KIND = 'update_data'
+
+# Scraper progress stages in the order a load goes through them, with labels for the loading page
+STAGES = {
+    'teams': 'Tournament teams',
+    'rosters': 'Team rosters',
+    'player_stats': 'Player season stats',
+    'players': 'Saving players',
+    'games': 'Tournament games',
+    'game_stats': 'Box scores',
+}
+
+# Job status -> load status reported to the loading page
+JOB_STATUSES = {'queued': 'pending', 'running': 'running', 'failed': 'failed'}
+
+_ready = False
+
+def load_state():
+    """The ``InitialLoad`` row, or None if the database already had data when the app started"""
+    return db.session.get(InitialLoad, LOAD_ID)
+
+def load_job():
+    """The latest ``update_data`` job, if any"""
+    return Job.query.filter(Job.kind == JOB_KIND).order_by(Job.id.desc()).first()
+
+def is_ready():
+    """Whether the data has been loaded; once it has, this process answers without a query"""
+    global _ready
+    if not _ready:
+        state = load_state()
+        _ready = state is None or state.status == 'ready'
+    return _ready
+
+def progress(state):
+    """JSON-ready summary of ``state`` and its job for /readyz and the loading page"""
+    if state is None or state.status == 'ready':
+        return {'status': 'ready'}
+    job = load_job()
+    stage = job.stage if job else None
+    stages = list(STAGES)
+    return {
+        'status': JOB_STATUSES.get(job.status, 'running') if job else 'pending',
+        'job_id': job.id if job else None,
+        'stage': stage,
+        'stage_label': STAGES.get(stage),
+        'step': stages.index(stage) + 1 if stage in STAGES else 0,
+        'steps': len(stages),
+        'done': job.done if job else 0,
+        'total': job.total if job else 0,
+        'error': job.error if job else None,
+        'started_at': state.started_at.isoformat() if state.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job and job.finished_at else None
+    }
+
+def start():
+    """Queue the initial load if the database has no data; returns whether a load is under way.
+
+    Must be called within an app context. Does nothing when ``INITIAL_LOAD`` is off.
+    """
+    if not INITIAL_LOAD:
+        return False
+    state = load_state()
+    if state is None:
+        if Player.query.first() is not None:
+            return False
+        db.session.add(InitialLoad(id=LOAD_ID, status='pending', started_at=datetime.utcnow()))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Another worker started at the same moment and created the row
+            db.session.rollback()
+    elif state.status == 'ready':
+        return False
+
+    job, created = enqueue(JOB_KIND)
+    if created:
+        logger.info(f"No data in the database; queued job {job.id} to load it")
+    return True
+
+def supervise():
+    """Mark the load ready once its job has succeeded, or queue it again after a failure (worker only)"""
+    state = load_state()
+    if state is None or state.status == 'ready':
+        return
+    job = load_job()
+    if job is not None and job.status == 'succeeded' and (state.started_at is None
+                                                          or job.finished_at >= state.started_at):
+        state.status, state.finished_at = 'ready', job.finished_at
+        db.session.commit()
+        logger.info(f"Initial data load completed by job {job.id}")
+        return
+    retry_after = datetime.utcnow() - timedelta(seconds=INITIAL_LOAD_RETRY_SECONDS)
+    # A job that succeeded before the load started (the data was deleted since) does not count
+    if job is None or job.status == 'succeeded' or (job.status == 'failed' and job.finished_at <= retry_after):
+        job, _ = enqueue(JOB_KIND)
+        logger.warning(f"Initial data load not done; queued job {job.id} to retry it")
@@ -0,0 +1,187 @@
+"""Queue of background scrape jobs, persisted in the ``job`` table.
+
+The web app only enqueues. ``/api/update_data`` and ``/api/update_game_scores``
+return a job id at once instead of scraping inside the request, and
+``/api/jobs/<id>`` reports how the job is doing. The worker process (worker.py)
+runs the queue one job at a time, and its schedule enqueues the periodic
+scrapes the same way.
+
+Jobs are deduplicated by kind. While a job of one kind is queued or running,
+enqueueing that kind again returns the active job, so two admins clicking at
+once start a single scrape. A partial unique index on ``job.kind`` enforces
+this across processes.
+
+A running job records the scraper's current stage and counts, and the time
+spent in each stage. Once it is done it records its result (the ingest batch
+statistics) or its error. Finished jobs are kept for the last ``JOB_HISTORY``
+runs.
+"""
+import importlib
+import json
+import logging
+import time
+from datetime import datetime
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+
+from config import JOB_HISTORY
+from models import db, Job
+
+logger = logging.getLogger(__name__)
+
+# Job kind -> scraper function that runs it
+JOB_KINDS = {
+    'update_data': 'update_tournament_data',
+    'update_game_scores': 'update_game_scores',
+}
+ACTIVE_STATUSES = ('queued', 'running')
+
+# Progress counts are written at most this often; stage changes are written at once
+PROGRESS_WRITE_SECONDS = 1.0
+
+def active_job(kind):
+    """The queued or running ``kind`` job, if any"""
+    return Job.query.filter(Job.kind == kind, Job.status.in_(ACTIVE_STATUSES)).first()
+
+def enqueue(kind):
+    """Queue a ``kind`` job unless one is already queued or running; returns ``(job, created)``"""
+    if kind not in JOB_KINDS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    job = active_job(kind)
+    if job is not None:
+        return job, False
+
+    job = Job(kind=kind, status='queued')
+    db.session.add(job)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Another process queued one between the lookup and the insert
+        db.session.rollback()
+        return enqueue(kind)
+    logger.info(f"Queued job {job.id} ({kind})")
+    return job, True
+
+def describe(job):
+    """JSON-ready view of ``job`` for /api/jobs/<id>"""
+    def iso(value):
+        return value.isoformat() if value else None
+
+    end = job.finished_at or datetime.utcnow()
+    return {
+        'id': job.id,
+        'kind': job.kind,
+        'status': job.status,
+        'stage': job.stage,
+        'done': job.done,
+        'total': job.total,
+        'stage_timings': [{'stage': stage, 'seconds': seconds}
+                          for stage, seconds in json.loads(job.stage_timings or '[]')],
+        'result': json.loads(job.result) if job.result else None,
+        'error': job.error,
+        'created_at': iso(job.created_at),
+        'started_at': iso(job.started_at),
+        'finished_at': iso(job.finished_at),
+        'seconds': round((end - job.started_at).total_seconds(), 3) if job.started_at else None
+    }
+
+def claim_next(owner):
+    """Mark the oldest queued job as running by ``owner`` and return it, or None if the queue is empty"""
+    while True:
+        job_id = db.session.execute(
+            select(Job.id).where(Job.status == 'queued').order_by(Job.id).limit(1)
+        ).scalar()
+        if job_id is None:
+            db.session.rollback()
+            return None
+        claimed = db.session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == 'queued')
+            .values(status='running', owner=owner, started_at=datetime.utcnow())
+        ).rowcount
+        db.session.commit()
+        if claimed:
+            return db.session.get(Job, job_id)
+
+def fail_interrupted(owner):
+    """Fail the jobs left running by workers other than ``owner``; returns how many there were.
+
+    Called when ``owner`` starts running the queue, so a job whose worker died
+    does not block its kind forever.
+    """
+    count = db.session.execute(
+        update(Job)
+        .where(Job.status == 'running', Job.owner != owner)
+        .values(status='failed', error='Interrupted: the worker running it stopped', finished_at=datetime.utcnow())
+    ).rowcount
+    db.session.commit()
+    if count:
+        logger.warning(f"Failed {count} jobs interrupted by a stopped worker")
+    return count
+
+class _StageTimer:
+    """``progress`` callback for the scraper: records the job's stage, counts and time per stage"""
+    def __init__(self, job):
+        self.job = job
+        self.timings = []
+        self.stage = None
+        self.stage_started = self.written_at = time.monotonic()
+
+    def __call__(self, stage, done=0, total=0):
+        now = time.monotonic()
+        if stage != self.stage:
+            self._time_stage(now)
+            self.timings.append([stage, 0.0])
+            self.stage, self.stage_started = stage, now
+        elif now - self.written_at < PROGRESS_WRITE_SECONDS:
+            return
+        self._time_stage(now)
+        self.job.stage, self.job.done, self.job.total = stage, done, total
+        db.session.commit()
+        self.written_at = now
+
+    def _time_stage(self, now):
+        if self.timings:
+            self.timings[-1][1] = round(now - self.stage_started, 3)
+        self.job.stage_timings = json.dumps(self.timings)
+
+    def finish(self):
+        self._time_stage(time.monotonic())
+
+def run_job(job):
+    """Run a claimed job to completion, recording its progress and then its result or error"""
+    run = getattr(importlib.import_module('scraper'), JOB_KINDS[job.kind])
+    timer = _StageTimer(job)
+    logger.info(f"Running job {job.id} ({job.kind})")
+    try:
+        batches = run(progress=timer)
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Job {job.id} ({job.kind}) failed: {e}")
+        job.status, job.error = 'failed', str(e)
+    else:
+        job.status = 'succeeded'
+        job.result = json.dumps({'batches': [stats.to_dict() for stats in batches or []]})
+        logger.info(f"Job {job.id} ({job.kind}) succeeded")
+    timer.finish()
+    job.finished_at = datetime.utcnow()
+    db.session.commit()
+    prune()
+
+def run_queued_jobs(owner):
+    """Run queued jobs one after another until the queue is empty"""
+    while True:
+        job = claim_next(owner)
+        if job is None:
+            return
+        run_job(job)
+
+def prune(keep=JOB_HISTORY):
+    """Delete finished jobs beyond the ``keep`` most recent"""
+    oldest_kept = db.session.execute(
+        select(Job.id).where(Job.status.notin_(ACTIVE_STATUSES)).order_by(Job.id.desc()).offset(keep - 1).limit(1)
+    ).scalar()
+    if oldest_kept is not None:
+        db.session.execute(delete(Job).where(Job.status.notin_(ACTIVE_STATUSES), Job.id < oldest_kept))
+        db.session.commit()
@@ -0,0 +1,59 @@
+"""Time-limited leases in the database, so that one process at a time does a job.
+
+A process holds the ``name`` lease until ``expires_at`` and keeps it by renewing
+it before then. Once it stops renewing (it exited or crashed), any other
+process may take the lease over. worker.py uses the ``scheduler`` lease to
+elect the process that runs the scheduled scrapes and the job queue.
+"""
+import os
+import socket
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, or_, update
+from sqlalchemy.exc import IntegrityError
+
+from config import WORKER_LEASE_SECONDS
+from models import db, WorkerLease
+
+# Held by the worker.py process that runs the schedule and the job queue
+SCHEDULER_LEASE = 'scheduler'
+
+def process_owner():
+    """Lease owner name of this process, ``host:pid``"""
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+def acquire_lease(name, owner, seconds=WORKER_LEASE_SECONDS):
+    """Take or renew the ``name`` lease for ``owner``; returns whether ``owner`` holds it"""
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=seconds)
+    try:
+        taken = db.session.execute(
+            update(WorkerLease)
+            .where(WorkerLease.name == name, or_(WorkerLease.owner == owner, WorkerLease.expires_at < now))
+            .values(owner=owner, expires_at=expires_at)
+        ).rowcount
+        if not taken and db.session.get(WorkerLease, name) is None:
+            db.session.execute(insert(WorkerLease).values(name=name, owner=owner, expires_at=expires_at))
+            taken = 1
+        db.session.commit()
+    except IntegrityError:
+        # Another process created the lease first
+        db.session.rollback()
+        taken = 0
+    return bool(taken)
+
+def release_lease(name, owner):
+    """Give up the ``name`` lease if ``owner`` holds it, so another process can take over now"""
+    db.session.execute(
+        update(WorkerLease)
+        .where(WorkerLease.name == name, WorkerLease.owner == owner)
+        .values(expires_at=datetime.utcnow())
+    )
+    db.session.commit()
+
+def lease_holder(name):
+    """Owner of the unexpired ``name`` lease, or None if nobody holds it"""
+    lease = db.session.get(WorkerLease, name)
+    if lease is None or lease.expires_at < datetime.utcnow():
+        return None
+    return lease.owner
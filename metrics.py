@@ -0,0 +1,328 @@
+"""Per-route request metrics, served in the Prometheus text format at ``/metrics``.
+
+For every request, ``init_app`` records under its method and route (the URL
+rule, e.g. ``/api/jobs/<int:job_id>``):
+
+    http_requests_total               requests by status code
+    http_request_duration_seconds     time from the first before_request hook to the finished response
+    http_request_sql_statements       SQL statements executed
+    http_request_sql_seconds          time spent executing them
+    http_response_size_bytes          response body size (not recorded for streamed responses)
+
+All but the first are histograms. Each web worker counts in memory and writes
+its totals to a file of its own in ``METRICS_DIR``, at most every
+``METRICS_FLUSH_SECONDS``. ``/metrics`` sums the files of all workers, so any
+worker answers for the whole app. The totals of stopped workers must still
+count, so that they never go backwards while gunicorn replaces workers. At
+startup and on every ``/metrics``, ``fold_exited`` adds the files of exited
+processes on this host to ``exited.json`` and deletes them, so the directory
+holds one file per running worker plus that one. The directory can be emptied
+whenever the app is stopped.
+
+With ``METRICS=0`` nothing is installed: no hooks, no SQL listeners and no
+``/metrics``.
+"""
+import atexit
+import glob
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: exited workers' files are kept instead of folded
+    fcntl = None
+
+from flask import g, request
+from sqlalchemy import event
+
+from config import METRICS_DIR, METRICS_ENABLED, METRICS_FLUSH_SECONDS
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+# Histogram name -> (help text, bucket upper bounds)
+HISTOGRAMS = {
+    'http_request_duration_seconds': ('Time to build the response, in seconds', LATENCY_BUCKETS),
+    'http_request_sql_statements': ('SQL statements executed per request',
+                                    (0, 1, 2, 5, 10, 20, 50, 100, 250, 500)),
+    'http_request_sql_seconds': ('Time spent executing SQL per request, in seconds', LATENCY_BUCKETS),
+    'http_response_size_bytes': ('Response body size, in bytes',
+                                 (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)),
+}
+REQUESTS_HELP = 'Requests answered, by status code'
+
+# Totals of exited workers, and the lock file that serializes folding them in
+EXITED_FILE = 'exited.json'
+LOCK_FILE = 'exited.lock'
+
+# SQL totals of the request running on this thread: [statements, seconds]
+_local = threading.local()
+
+class Registry:
+    """Request counters and histograms of this process"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (method, route, status) -> count
+        self.requests = {}
+        # (histogram name, method, route) -> [count per bucket (the last is +Inf), sum]
+        self.histograms = {}
+
+    def observe(self, method, route, status, values):
+        """Record one request: ``values`` maps histogram names to its observations"""
+        with self._lock:
+            key = (method, route, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            for name, value in values.items():
+                buckets = HISTOGRAMS[name][1]
+                series = self.histograms.get((name, method, route))
+                if series is None:
+                    series = self.histograms[(name, method, route)] = [[0] * (len(buckets) + 1), 0]
+                index = next((i for i, bound in enumerate(buckets) if value <= bound), len(buckets))
+                series[0][index] += 1
+                series[1] += value
+
+    def snapshot(self):
+        """JSON-ready copy of the totals"""
+        with self._lock:
+            return {
+                'requests': [[method, route, status, count]
+                             for (method, route, status), count in self.requests.items()],
+                'histograms': [[name, method, route, list(counts), total]
+                               for (name, method, route), (counts, total) in self.histograms.items()]
+            }
+
+registry = Registry()
+
+class _Writer:
+    """Writes this process's snapshot to its file in ``METRICS_DIR``, at most every ``METRICS_FLUSH_SECONDS``"""
+    def __init__(self, directory):
+        self.directory = directory
+        # Unique per process, so a restarted worker reusing a pid starts a file of its own.
+        # The host and pid tell fold_exited whether the process is still running
+        self.path = os.path.join(directory, f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}.json")
+        self.written_at = 0.0
+        self._lock = threading.Lock()
+
+    def maybe_write(self):
+        if time.monotonic() - self.written_at >= METRICS_FLUSH_SECONDS:
+            self.write()
+
+    def write(self):
+        with self._lock:
+            self.written_at = time.monotonic()
+            tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                with open(tmp_path, 'w') as f:
+                    json.dump(registry.snapshot(), f, separators=(',', ':'))
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.error(f"Error writing metrics to {self.path}: {e}")
+
+_writer = None
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if getattr(_local, 'sql', None) is not None:
+        conn.info.setdefault('metrics_query_start', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    sql = getattr(_local, 'sql', None)
+    starts = conn.info.get('metrics_query_start')
+    if sql is None or not starts:
+        return
+    sql[0] += 1
+    sql[1] += time.perf_counter() - starts.pop()
+
+def init_app(app, db):
+    """Record request metrics for ``app`` and SQL metrics on ``db``'s engines, unless ``METRICS=0``"""
+    global _writer
+    if not METRICS_ENABLED:
+        return
+    _writer = _Writer(METRICS_DIR)
+    atexit.register(_writer.write)
+    fold_exited(METRICS_DIR)
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+    @app.before_request
+    def _start_metrics():
+        g.metrics_start = time.perf_counter()
+        _local.sql = [0, 0.0]
+
+    @app.after_request
+    def _record_metrics(response):
+        start = g.pop('metrics_start', None)
+        sql = getattr(_local, 'sql', None)
+        _local.sql = None
+        if start is None or sql is None:
+            return response
+        values = {
+            'http_request_duration_seconds': time.perf_counter() - start,
+            'http_request_sql_statements': sql[0],
+            'http_request_sql_seconds': sql[1],
+        }
+        if not response.is_streamed:
+            values['http_response_size_bytes'] = response.calculate_content_length() or 0
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        registry.observe(request.method, route, response.status_code, values)
+        _writer.maybe_write()
+        return response
+
+    @app.teardown_request
+    def _end_metrics(exc):
+        _local.sql = None
+
+def enabled():
+    return _writer is not None
+
+def _read(path):
+    """The snapshot in ``path``, or None if it cannot be read"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error(f"Skipping unreadable metrics file {path}: {e}")
+        return None
+
+def _add(totals, snapshot):
+    """Add ``snapshot`` to ``totals``, a ``(requests_total, histograms)`` pair"""
+    requests_total, histograms = totals
+    for method, route, status, count in snapshot['requests']:
+        key = (method, route, status)
+        requests_total[key] = requests_total.get(key, 0) + count
+    for name, method, route, counts, total in snapshot['histograms']:
+        # Skip series written with other buckets by an older version
+        if name not in HISTOGRAMS or len(counts) != len(HISTOGRAMS[name][1]) + 1:
+            continue
+        series = histograms.setdefault((name, method, route), [[0] * len(counts), 0])
+        series[0] = [a + b for a, b in zip(series[0], counts)]
+        series[1] += total
+
+def _running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # It exists but belongs to another user
+        return True
+    return True
+
+def _exited_files(directory):
+    """Paths of the worker files in ``directory`` whose process on this host has exited"""
+    host = socket.gethostname()
+    paths = []
+    for path in glob.glob(os.path.join(directory, '*.json')):
+        # <host>-<pid>-<uuid>.json; anything else (exited.json, files of older versions) is left alone
+        parts = os.path.basename(path)[:-len('.json')].rsplit('-', 2)
+        if len(parts) == 3 and parts[0] == host and parts[1].isdigit() and not _running(int(parts[1])):
+            paths.append(path)
+    return paths
+
+@contextmanager
+def _locked(directory, operation):
+    """Hold the folding lock of ``directory``: LOCK_EX to fold, LOCK_SH to read a consistent set of files"""
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, LOCK_FILE), 'a') as lock:
+        fcntl.flock(lock, operation)
+        yield
+
+def fold_exited(directory):
+    """Add the files of exited workers on this host to ``exited.json`` and delete them; returns how many"""
+    if fcntl is None:
+        return 0
+    exited_path = os.path.join(directory, EXITED_FILE)
+    try:
+        with _locked(directory, fcntl.LOCK_EX):
+            exited = _read(exited_path) if os.path.exists(exited_path) else None
+            # Files already counted in exited.json by a fold that stopped before deleting them
+            for name in (exited or {}).get('folded', []):
+                if os.path.exists(os.path.join(directory, name)):
+                    os.remove(os.path.join(directory, name))
+            paths = _exited_files(directory)
+            if not paths:
+                return 0
+
+            totals = ({}, {})
+            if exited is not None:
+                _add(totals, exited)
+            folded = []
+            for path in paths:
+                snapshot = _read(path)
+                if snapshot is not None:
+                    _add(totals, snapshot)
+                    folded.append(os.path.basename(path))
+            requests_total, histograms = totals
+            tmp_path = f"{exited_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({
+                    'requests': [[method, route, status, count]
+                                 for (method, route, status), count in requests_total.items()],
+                    'histograms': [[name, method, route, counts, total]
+                                   for (name, method, route), (counts, total) in histograms.items()],
+                    'folded': folded
+                }, f, separators=(',', ':'))
+            os.replace(tmp_path, exited_path)
+            for name in folded:
+                os.remove(os.path.join(directory, name))
+    except OSError as e:
+        logger.error(f"Error folding exited workers' metrics into {exited_path}: {e}")
+        return 0
+    if folded:
+        logger.info(f"Folded the metrics of {len(folded)} exited workers into {exited_path}")
+    return len(folded)
+
+def _merge(directory):
+    """Sum the snapshots of every worker file in ``directory``"""
+    totals = ({}, {})
+    snapshots = {}
+    # Shared with other readers, but never in the middle of a fold
+    with _locked(directory, fcntl.LOCK_SH if fcntl else None):
+        for path in glob.glob(os.path.join(directory, '*.json')):
+            snapshot = _read(path)
+            if snapshot is not None:
+                snapshots[os.path.basename(path)] = snapshot
+    # A file listed as folded is already counted in exited.json
+    folded = set(snapshots.get(EXITED_FILE, {}).get('folded', []))
+    for name, snapshot in snapshots.items():
+        if name not in folded:
+            _add(totals, snapshot)
+    return totals
+
+def _labels(**labels):
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return '{' + ','.join(f'{name}="{escape(value)}"' for name, value in labels.items()) + '}'
+
+def render():
+    """All workers' metrics in the Prometheus text exposition format"""
+    _writer.write()
+    fold_exited(METRICS_DIR)
+    requests_total, histograms = _merge(METRICS_DIR)
+    lines = [f'# HELP http_requests_total {REQUESTS_HELP}', '# TYPE http_requests_total counter']
+    for (method, route, status), count in sorted(requests_total.items()):
+        lines.append(f'http_requests_total{_labels(method=method, route=route, status=status)} {count}')
+    for name, (help_text, buckets) in HISTOGRAMS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} histogram')
+        for (series_name, method, route), (counts, total) in sorted(histograms.items()):
+            if series_name != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(list(buckets) + ['+Inf'], counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{_labels(method=method, route=route, le=bound)} {cumulative}')
+            lines.append(f'{name}_sum{_labels(method=method, route=route)} {round(total, 6)}')
+            lines.append(f'{name}_count{_labels(method=method, route=route)} {cumulative}')
+    return '\n'.join(lines) + '\n'
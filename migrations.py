@@ -0,0 +1,252 @@
+"""Versioned schema migrations for existing databases.
+
+``db.create_all()`` only creates missing tables, so columns and indexes added to
+``models.py`` never reach a ``data/database.db`` created by an older version.
+``upgrade`` first creates any missing tables and then applies each pending
+migration in ``MIGRATIONS`` in its own transaction. Applied versions are recorded
+in the ``schema_migrations`` table.
+
+Every migration is written to be a no-op against a schema that already has its
+changes (a database fresh from ``create_all``), so new and old databases end up
+identical. Table creation and each migration run while holding the database
+write lock, so several gunicorn workers starting at once apply each migration
+exactly once.
+
+The app runs ``upgrade`` at startup. Running this module applies pending
+migrations to the configured database and prints a before/after query plan
+report for the hot lookups:
+
+    python migrations.py
+"""
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+
+from sqlalchemy import (Column, DateTime, Integer, MetaData, String, Table, case, create_engine,
+                        false, inspect, select, text, true)
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from models import db, Player, DraftPick, TournamentGame, PlayerTournamentStat
+from scoring import rebuild_scores
+from versions import bump_version
+
+logger = logging.getLogger(__name__)
+
+schema_migrations = Table(
+    'schema_migrations', MetaData(),
+    Column('version', Integer, primary_key=True),
+    Column('description', String(200), nullable=False),
+    Column('applied_at', DateTime, nullable=False)
+)
+
+# (version, description, apply(connection)) in the order they are applied
+MIGRATIONS = []
+
+def migration(version, description):
+    """Register the decorated function as migration ``version``"""
+    def register(apply):
+        MIGRATIONS.append((version, description, apply))
+        return apply
+    return register
+
+def add_columns(connection, model, *names):
+    """Add the model's ``names`` columns to its table where they are missing"""
+    table = model.__table__
+    existing = {column['name'] for column in inspect(connection).get_columns(table.name)}
+    for name in names:
+        if name in existing:
+            continue
+        column = table.c[name]
+        column_type = column.type.compile(dialect=connection.dialect)
+        connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {name} {column_type}'))
+        logger.info(f"Added column {table.name}.{name}")
+
+def create_indexes(connection, model, *names):
+    """Create the model's declared indexes ``names`` unless they already exist"""
+    indexes = {index.name: index for index in model.__table__.indexes}
+    for name in names:
+        connection.execute(CreateIndex(indexes[name], if_not_exists=True))
+
+def _merge_duplicates(connection, model, key_columns, references, keep=min):
+    """Collapse rows sharing ``key_columns`` into one, repointing ``references`` to it.
+
+    ``references`` are foreign key columns that point at ``model``; ``keep`` picks
+    the surviving id of each group. Returns the number of rows removed.
+    """
+    table = model.__table__
+    keys = [table.c[name] for name in key_columns]
+    groups = {}
+    for row in connection.execute(select(table.c.id, *keys).where(*(key.isnot(None) for key in keys))):
+        groups.setdefault(tuple(row[1:]), []).append(row[0])
+
+    removed = 0
+    for ids in groups.values():
+        if len(ids) < 2:
+            continue
+        kept_id = keep(ids)
+        duplicate_ids = [pk for pk in ids if pk != kept_id]
+        for reference in references:
+            connection.execute(reference.table.update()
+                               .where(reference.in_(duplicate_ids))
+                               .values({reference.name: kept_id}))
+        connection.execute(table.delete().where(table.c.id.in_(duplicate_ids)))
+        removed += len(duplicate_ids)
+    if removed:
+        logger.warning(f"Merged {removed} duplicate {table.name} rows on ({', '.join(key_columns)})")
+    return removed
+
+@migration(1, 'Scraped game id, status and stats fingerprint columns on tournament_game')
+def _tournament_game_scrape_columns(connection):
+    add_columns(connection, TournamentGame, 'game_id', 'status', 'stats_fingerprint', 'stats_ingested_at')
+
+@migration(2, 'Sort and filter indexes for the players page')
+def _player_page_indexes(connection):
+    create_indexes(connection, Player, 'ix_player_name', 'ix_player_ppg', 'ix_player_rpg', 'ix_player_apg',
+                   'ix_player_school_seed', 'ix_player_position_ppg', 'ix_player_school_name',
+                   'ix_player_region_school_seed')
+
+@migration(3, 'Unique natural keys and lookup indexes for players, games, picks and stat lines')
+def _natural_keys(connection):
+    # Older versions could insert duplicates; merge them so the unique indexes can be built
+    removed = _merge_duplicates(connection, TournamentGame, ['game_id'], [PlayerTournamentStat.__table__.c.game_id])
+    removed += _merge_duplicates(connection, Player, ['name', 'school'],
+                                 [DraftPick.__table__.c.player_id, PlayerTournamentStat.__table__.c.player_id])
+    # Keep the most recently ingested line for a player in a game
+    removed += _merge_duplicates(connection, PlayerTournamentStat, ['player_id', 'game_id'], [], keep=max)
+    if removed:
+        rebuild_scores(connection)
+        bump_version('players', connection)
+        bump_version('draft_picks', connection)
+
+    create_indexes(connection, Player, 'uq_player_name_school')
+    create_indexes(connection, TournamentGame, 'uq_tournament_game_game_id')
+    create_indexes(connection, DraftPick, 'ix_draft_pick_participant_id')
+    create_indexes(connection, PlayerTournamentStat, 'uq_player_tournament_stat_player_game',
+                   'ix_player_tournament_stat_game_id')
+
+@migration(4, 'Unique player and draft position per draft pick')
+def _unique_draft_picks(connection):
+    # Keep the first pick of a player that was drafted more than once
+    removed = _merge_duplicates(connection, DraftPick, ['player_id'], [])
+    if removed:
+        rebuild_scores(connection)
+        bump_version('draft_picks', connection)
+
+    picks = DraftPick.__table__
+    positions = connection.execute(select(picks.c.draft_position).where(picks.c.draft_position.isnot(None))).scalars().all()
+    if len(positions) != len(set(positions)):
+        # Positions were typed in by hand; renumber the picks in their current order
+        ordered = connection.execute(select(picks.c.id).where(picks.c.draft_position.isnot(None))
+                                     .order_by(picks.c.draft_position, picks.c.id)).scalars().all()
+        for position, pick_id in enumerate(ordered, start=1):
+            connection.execute(picks.update().where(picks.c.id == pick_id).values(draft_position=position))
+        bump_version('draft_picks', connection)
+        logger.warning(f"Renumbered {len(ordered)} draft picks with duplicate draft positions")
+
+    connection.execute(text('DROP INDEX IF EXISTS ix_draft_pick_player_id'))
+    create_indexes(connection, DraftPick, 'uq_draft_pick_player_id', 'uq_draft_pick_draft_position')
+
+@migration(5, 'Full box score stat lines and backfilled game status')
+def _box_score_columns(connection):
+    add_columns(connection, PlayerTournamentStat, 'steals', 'blocks', 'turnovers', 'minutes_played')
+    games = TournamentGame.__table__
+    # Games ingested before the status column only recorded is_completed
+    connection.execute(games.update().where(games.c.status.is_(None)).values(
+        status=case((games.c.is_completed == true(), 'completed'), else_='scheduled')
+    ))
+
+def applied_versions(connection):
+    return set(connection.execute(select(schema_migrations.c.version)).scalars())
+
+@contextmanager
+def _write_locked(engine):
+    """Transaction that holds the database write lock from its first statement"""
+    with engine.begin() as connection:
+        # A write, even one matching no rows, takes SQLite's write lock until commit
+        connection.execute(schema_migrations.update().where(false()).values(version=0))
+        yield connection
+
+def upgrade(engine):
+    """Create missing tables and apply pending migrations; returns the versions applied"""
+    with engine.begin() as connection:
+        connection.execute(CreateTable(schema_migrations, if_not_exists=True))
+    with _write_locked(engine) as connection:
+        db.metadata.create_all(connection)
+
+    applied = []
+    for version, description, apply in sorted(MIGRATIONS, key=lambda entry: entry[0]):
+        with _write_locked(engine) as connection:
+            # Checked under the lock, so concurrent upgrades apply each migration once
+            if version in applied_versions(connection):
+                continue
+            apply(connection)
+            connection.execute(schema_migrations.insert().values(
+                version=version, description=description, applied_at=datetime.utcnow()
+            ))
+        logger.info(f"Applied migration {version}: {description}")
+        applied.append(version)
+    return applied
+
+# Lookups on the hot paths, with representative parameters
+HOT_QUERIES = {
+    'player by (name, school) [scraper]':
+        ("SELECT id FROM player WHERE name = :name AND school = :school", {'name': 'x', 'school': 'x'}),
+    'players of a school [api_game_stats]':
+        ("SELECT * FROM player WHERE school = :school", {'school': 'x'}),
+    'pick of a player [api_draft_pick]':
+        ("SELECT id FROM draft_pick WHERE player_id = :id", {'id': 1}),
+    'picks of a participant [draft board]':
+        ("SELECT * FROM draft_pick WHERE participant_id = :id ORDER BY draft_position", {'id': 1}),
+    'stat line of a player in a game [stat ingest]':
+        ("SELECT id FROM player_tournament_stat WHERE player_id = :player AND game_id = :game",
+         {'player': 1, 'game': 1}),
+    'stat lines of a game [api_game_stats]':
+        ("SELECT * FROM player_tournament_stat WHERE game_id = :game", {'game': 1}),
+    'game by scraped id [game ingest]':
+        ("SELECT id FROM tournament_game WHERE game_id = :game", {'game': 1}),
+}
+
+def query_plans(engine):
+    """SQLite query plan (one line per step) for each of ``HOT_QUERIES``"""
+    if engine.dialect.name != 'sqlite':
+        return {}
+    plans = {}
+    with engine.connect() as connection:
+        for label, (sql, params) in HOT_QUERIES.items():
+            try:
+                rows = connection.execute(text('EXPLAIN QUERY PLAN ' + sql), params)
+            except OperationalError:
+                # A table or column that the upgrade creates
+                plans[label] = 'not available on this schema'
+                continue
+            plans[label] = '; '.join(row[-1] for row in rows)
+    return plans
+
+def plan_report(before, after):
+    """Format before/after query plans side by side"""
+    lines = []
+    for label in HOT_QUERIES:
+        if label not in after:
+            continue
+        lines.append(label)
+        lines.append(f"  before: {before.get(label, '-')}")
+        lines.append(f"  after:  {after[label]}")
+    return '\n'.join(lines)
+
+def main():
+    from config import SQLALCHEMY_DATABASE_URI
+    from database import configure_engine
+
+    logging.basicConfig(level=logging.INFO)
+    engine = create_engine(SQLALCHEMY_DATABASE_URI)
+    configure_engine(engine)
+    before = query_plans(engine)
+    applied = upgrade(engine)
+    print(f"Applied migrations: {', '.join(map(str, applied)) or 'none pending'}")
+    report = plan_report(before, query_plans(engine))
+    if report:
+        print(report)
+
+if __name__ == '__main__':
+    main()
@@ -22,25 +22,43 @@ class Player(db.Model):
     draft_picks = db.relationship('DraftPick', backref='player', lazy=True)
     tournament_stats = db.relationship('PlayerTournamentStat', backref='player', lazy=True)
     
+    # Indexes behind the /players sorts (id is implicitly the last column of every
+    # SQLite index, so these also serve the keyset tie-breaker) and filter + sort pairs
+    __table_args__ = (
+        db.Index('ix_player_name', 'name'),
+        db.Index('ix_player_ppg', 'ppg'),
+        db.Index('ix_player_rpg', 'rpg'),
+        db.Index('ix_player_apg', 'apg'),
+        db.Index('ix_player_school_seed', 'school_seed'),
+        db.Index('ix_player_position_ppg', 'position', 'ppg'),
+        db.Index('ix_player_school_name', 'school', 'name'),
+        db.Index('ix_player_region_school_seed', 'region', 'school_seed'),
+        # Natural key used by the scraper and ingest
+        db.Index('uq_player_name_school', 'name', 'school', unique=True),
+    )
+    
     def __repr__(self):
         return f'<Player {self.name} ({self.school})>'
         
+    # Keys of to_dict() and the attributes they are read from
+    DICT_FIELDS = {
+        'id': 'id',
+        'name': 'name',
+        'school': 'school',
+        'position': 'position',
+        'jersey_number': 'jersey_number',
+        'year': 'year_in_school',
+        'ppg': 'ppg',
+        'rpg': 'rpg',
+        'apg': 'apg',
+        'school_seed': 'school_seed',
+        'region': 'region',
+        'is_active': 'is_active'
+    }
+        
     def to_dict(self):
         """Convert player to dictionary for JSON serialization"""
-        return {
-            'id': self.id,
-            'name': self.name,
-            'school': self.school,
-            'position': self.position,
-            'jersey_number': self.jersey_number,
-            'year': self.year_in_school,
-            'ppg': self.ppg,
-            'rpg': self.rpg,
-            'apg': self.apg,
-            'school_seed': self.school_seed,
-            'region': self.region,
-            'is_active': self.is_active
-        }
+        return {key: getattr(self, attr) for key, attr in self.DICT_FIELDS.items()}
     
 class Participant(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -68,11 +86,19 @@ class DraftPick(db.Model):
     draft_position = db.Column(db.Integer)  # Position in the draft order
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # A player can be drafted once and every draft slot holds one pick (see picks.py)
+    __table_args__ = (
+        db.Index('uq_draft_pick_player_id', 'player_id', unique=True),
+        db.Index('uq_draft_pick_draft_position', 'draft_position', unique=True),
+        db.Index('ix_draft_pick_participant_id', 'participant_id', 'draft_position'),
+    )
+    
     def __repr__(self):
         return f'<DraftPick {self.participant.name} - {self.player.name}>'
 
 class TournamentGame(db.Model):
     id = db.Column(db.Integer, primary_key=True)
+    game_id = db.Column(db.Integer)  # Game id on the scraped source (ESPN)
     game_date = db.Column(db.Date, nullable=False)
     round_name = db.Column(db.String(50))  # e.g., "First Round", "Sweet 16"
     team1 = db.Column(db.String(100), nullable=False)
@@ -80,11 +106,23 @@ class TournamentGame(db.Model):
     team1_score = db.Column(db.Integer)
     team2_score = db.Column(db.Integer)
     is_completed = db.Column(db.Boolean, default=False)
+    status = db.Column(db.String(20))  # Scraped status, e.g. "scheduled", "completed"
+    stats_fingerprint = db.Column(db.String(40))  # Fingerprint of the game data when its stats were last ingested
+    stats_ingested_at = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     player_stats = db.relationship('PlayerTournamentStat', backref='game', lazy=True)
     
+    __table_args__ = (
+        db.Index('uq_tournament_game_game_id', 'game_id', unique=True),
+    )
+    
+    @property
+    def round(self):
+        """Round name (e.g. Sweet 16), as shown on the games page"""
+        return self.round_name
+    
     def __repr__(self):
         return f'<Game {self.team1} vs {self.team2} ({self.game_date})>'
 
@@ -95,8 +133,124 @@ class PlayerTournamentStat(db.Model):
     points = db.Column(db.Integer, default=0)
     rebounds = db.Column(db.Integer, default=0)
     assists = db.Column(db.Integer, default=0)
+    steals = db.Column(db.Integer, default=0)
+    blocks = db.Column(db.Integer, default=0)
+    turnovers = db.Column(db.Integer, default=0)
+    minutes_played = db.Column(db.Integer, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # One stat line per player per game; game_id alone serves box score lookups
+    __table_args__ = (
+        db.Index('uq_player_tournament_stat_player_game', 'player_id', 'game_id', unique=True),
+        db.Index('ix_player_tournament_stat_game_id', 'game_id'),
+    )
+    
     def __repr__(self):
         return f'<PlayerStat {self.player.name} - {self.points}pts>'
+
+class PickScore(db.Model):
+    """Materialized points earned by a single draft pick, maintained by scoring.py"""
+    # Derived table: no foreign keys, so rows can be rebuilt independently of the source tables
+    draft_pick_id = db.Column(db.Integer, primary_key=True)
+    participant_id = db.Column(db.Integer, nullable=False, index=True)
+    player_id = db.Column(db.Integer, nullable=False, index=True)
+    points = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<PickScore pick {self.draft_pick_id} - {self.points}pts>'
+
+class ParticipantScore(db.Model):
+    """Materialized leaderboard row for a participant, maintained by scoring.py"""
+    participant_id = db.Column(db.Integer, primary_key=True)
+    total_points = db.Column(db.Integer, nullable=False, default=0, index=True)
+    pick_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<ParticipantScore participant {self.participant_id} - {self.total_points}pts>'
+
+class DataVersion(db.Model):
+    """Counter bumped whenever the data it names changes, maintained by versions.py"""
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<DataVersion {self.name} v{self.version}>'
+
+class Event(db.Model):
+    """Change notification streamed to browsers by /api/stream, published by events.py"""
+    # AUTOINCREMENT keeps ids increasing after old events are pruned; clients resume from them
+    __table_args__ = {'sqlite_autoincrement': True}
+    
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(30), nullable=False)  # e.g. "pick_added", "score_changed"
+    payload = db.Column(db.Text, nullable=False)  # JSON
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<Event {self.id} {self.kind}>'
+
+class WorkerLease(db.Model):
+    """Time-limited lock held by one background worker process, maintained by worker.py"""
+    name = db.Column(db.String(50), primary_key=True)  # e.g. "scheduler"
+    owner = db.Column(db.String(100), nullable=False)  # host:pid of the holder
+    expires_at = db.Column(db.DateTime, nullable=False)
+    
+    def __repr__(self):
+        return f'<WorkerLease {self.name} held by {self.owner} until {self.expires_at}>'
+
+class InitialLoad(db.Model):
+    """The first scrape into an empty database, maintained by initial_load.py; its progress is its job's"""
+    id = db.Column(db.Integer, primary_key=True)  # a single row, id 1
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending until its job succeeds, then ready
+    stage = db.Column(db.String(30))  # scraper progress stage, e.g. "rosters"
+    done = db.Column(db.Integer, nullable=False, default=0)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text)
+    started_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+    
+    def __repr__(self):
+        return f'<InitialLoad {self.status} {self.stage} {self.done}/{self.total}>'
+
+class Job(db.Model):
+    """Background scrape requested through the API or the schedule, queued and run by jobs.py"""
+    # At most one queued or running job of each kind; a second request joins the active one
+    __table_args__ = (
+        db.Index('uq_job_active_kind', 'kind', unique=True,
+                 sqlite_where=db.text("status IN ('queued', 'running')")),
+        db.Index('ix_job_status_id', 'status', 'id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(30), nullable=False)  # e.g. "update_game_scores"
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, succeeded, failed
+    stage = db.Column(db.String(30))  # scraper progress stage, e.g. "game_stats"
+    done = db.Column(db.Integer, nullable=False, default=0)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    stage_timings = db.Column(db.Text)  # JSON list of [stage, seconds]
+    result = db.Column(db.Text)  # JSON
+    error = db.Column(db.Text)
+    owner = db.Column(db.String(100))  # host:pid of the worker running it
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    
+    def __repr__(self):
+        return f'<Job {self.id} {self.kind} {self.status}>'
+
+class ScrapeRun(db.Model):
+    """Report of one finished scrape run, saved by scrape_report.py"""
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(30), nullable=False)  # e.g. "update_game_scores"
+    status = db.Column(db.String(20), nullable=False)  # succeeded, failed
+    error = db.Column(db.Text)
+    started_at = db.Column(db.DateTime, nullable=False)
+    finished_at = db.Column(db.DateTime, nullable=False)
+    report = db.Column(db.Text, nullable=False)  # JSON, see ScrapeReport.to_dict
+    
+    def __repr__(self):
+        return f'<ScrapeRun {self.id} {self.kind} {self.status}>'
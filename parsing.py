@@ -0,0 +1,30 @@
+"""Targeted HTML parsing for scraped pages.
+
+Each scraper only reads one part of its page (the bracket, a roster table, a box
+score), so ``parse_page`` builds a tree of just those elements with a
+``SoupStrainer`` instead of the whole document. Pages are parsed straight from
+the response bytes, which lets the parser detect the encoding itself and skips
+``requests``' own charset detection. lxml is used when it is installed; it is
+optional and considerably faster than the built-in ``html.parser``.
+"""
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    PARSER = 'lxml'
+except ImportError:
+    PARSER = 'html.parser'
+
+# The elements each page type's scraper reads; other page types are parsed in full
+PAGE_TARGETS = {
+    'bracket': SoupStrainer(class_=re.compile(r'\bbracket', re.I)),
+    'roster': SoupStrainer('table'),
+    'player_stats': SoupStrainer('table'),
+    'boxscore': SoupStrainer(['table', 'div'], class_=re.compile(r'\bboxscore', re.I)),
+}
+
+def parse_page(content, page_type=None, parser=PARSER):
+    """Parse ``content`` (bytes or str), keeping only the target elements of ``page_type``"""
+    return BeautifulSoup(content, parser, parse_only=PAGE_TARGETS.get(page_type))
@@ -0,0 +1,199 @@
+"""Atomic draft pick submission.
+
+``make_pick`` records a pick with a single ``INSERT ... SELECT`` whose ``WHERE``
+clause checks everything that other drafters can change concurrently: the
+player must still be undrafted and the requested ``draft_position`` must be the
+next open slot (one past the highest position taken). Without an explicit
+position, the statement assigns that next slot itself. The unique indexes on
+``draft_pick.player_id`` and ``draft_pick.draft_position`` back the check, so
+two racing picks can never both be stored, whatever the isolation level.
+
+While a draft runs, the browser sends its ``DraftOrder`` with every pick: the
+participants in order, snake or standard, and the slot the draft started at.
+The same ``WHERE`` clause then also checks that the participant is the one on
+the clock for the slot, so of two participants racing for a slot only the one
+whose turn it is can take it. Picks made outside a draft carry no order and
+may go to any participant.
+
+A pick that inserts nothing is explained afterwards by ``PickConflict``, which
+names the winning pick, the slot that is actually on the clock or the
+participant whose turn it is.
+
+Adding or removing a pick publishes a ``pick_added``/``pick_removed`` event in
+the same transaction, for the live draft board.
+"""
+import logging
+from datetime import datetime
+
+from sqlalchemy import case, exists, func, insert, literal, select
+from sqlalchemy.exc import IntegrityError
+
+from events import publish
+from models import db, Player, Participant, DraftPick
+from scoring import refresh_pick_scores
+from versions import bump_version
+
+logger = logging.getLogger(__name__)
+
+class PickConflict(Exception):
+    """A pick that could not be made because of the current state of the draft.
+
+    Attributes:
+        reason: ``player_taken``, ``out_of_turn``, ``wrong_participant`` or ``not_found``.
+        details: Extra JSON-serializable fields describing the conflict.
+    """
+    def __init__(self, reason, message, **details):
+        super().__init__(message)
+        self.reason = reason
+        self.details = details
+
+    @property
+    def status_code(self):
+        return 404 if self.reason == 'not_found' else 409
+
+    def to_dict(self):
+        return dict(self.details, error=str(self), conflict=self.reason)
+
+class DraftOrder:
+    """Who is on the clock for each slot of a draft started at ``first_position``"""
+    def __init__(self, participant_ids, snake=True, first_position=1):
+        if not participant_ids:
+            raise ValueError("A draft order needs at least one participant")
+        # One full cycle of turns: in a snake draft every other round runs backwards
+        self.cycle = list(participant_ids) + (list(reversed(participant_ids)) if snake else [])
+        self.first_position = first_position
+
+    def on_the_clock(self, position):
+        """The participant id whose turn ``position`` is, or None if it is before the draft started"""
+        if position < self.first_position:
+            return None
+        return self.cycle[(position - self.first_position) % len(self.cycle)]
+
+    def on_the_clock_clause(self, position):
+        """SQL for ``on_the_clock`` of the ``position`` expression"""
+        turn = (position - self.first_position) % len(self.cycle)
+        return case({index: participant_id for index, participant_id in enumerate(self.cycle)},
+                    value=case((position >= self.first_position, turn), else_=-1))
+
+def next_draft_position(session=None):
+    """The draft position that the next pick must take"""
+    session = session or db.session
+    return session.execute(select(func.coalesce(func.max(DraftPick.draft_position), 0) + 1)).scalar()
+
+def _pick_events(condition, session):
+    """``pick_event_data`` of every pick matching ``condition``, in draft order, from one query"""
+    rows = session.execute(
+        select(DraftPick, Participant.name, Player)
+        .join(Participant, Participant.id == DraftPick.participant_id)
+        .join(Player, Player.id == DraftPick.player_id)
+        .where(condition)
+        .order_by(DraftPick.draft_position)
+    )
+    return [{
+        'id': pick.id,
+        'participant_id': pick.participant_id,
+        'participant_name': participant_name,
+        'player_id': pick.player_id,
+        'player_name': player.name,
+        'player_school': player.school,
+        'player_ppg': player.ppg or '0.0',
+        'player_rpg': player.rpg or '0.0',
+        'player_apg': player.apg or '0.0',
+        'draft_position': pick.draft_position,
+        'player': player.to_dict()
+    } for pick, participant_name, player in rows]
+
+def pick_event_data(pick_id, session=None):
+    """The pick as listed by /api/draft_picks, plus its player and the next open slot"""
+    data, = _pick_events(DraftPick.id == pick_id, session or db.session)
+    return data
+
+def participant_pick_events(participant_id, session=None):
+    """``pick_event_data`` of each of a participant's picks, in one query"""
+    return _pick_events(DraftPick.participant_id == participant_id, session or db.session)
+
+def make_pick(participant_id, player_id, draft_position=None, draft_order=None, session=None):
+    """Record a pick in one statement and return it, or raise ``PickConflict``.
+
+    With a ``DraftOrder``, the participant must also be the one on the clock for the slot.
+    """
+    session = session or db.session
+    next_position = select(func.coalesce(func.max(DraftPick.draft_position), 0) + 1).scalar_subquery()
+    position = next_position if draft_position is None else literal(draft_position)
+
+    conditions = [
+        exists().where(Player.id == player_id),
+        exists().where(Participant.id == participant_id),
+        ~exists().where(DraftPick.player_id == player_id)
+    ]
+    if draft_position is not None:
+        conditions.append(literal(draft_position) == next_position)
+    if draft_order is not None:
+        conditions.append(draft_order.on_the_clock_clause(next_position) == participant_id)
+
+    stmt = insert(DraftPick).from_select(
+        ['participant_id', 'player_id', 'draft_position', 'created_at'],
+        select(literal(participant_id), literal(player_id), position, literal(datetime.utcnow())).where(*conditions)
+    )
+    try:
+        inserted = session.execute(stmt).rowcount
+        if inserted:
+            pick = session.execute(select(DraftPick).where(DraftPick.player_id == player_id)).scalar_one()
+            # The insert bypasses the ORM flush hooks that maintain scores and versions
+            refresh_pick_scores([pick.id], session.connection())
+            bump_version('draft_picks', session.connection())
+            publish('pick_added', dict(pick_event_data(pick.id, session),
+                                       next_draft_position=pick.draft_position + 1), session.connection())
+        session.commit()
+    except IntegrityError:
+        # Lost a race that the WHERE clause could not see (e.g. under weaker isolation)
+        session.rollback()
+        inserted = 0
+
+    if not inserted:
+        raise _explain_conflict(session, participant_id, player_id, draft_position, draft_order)
+    logger.info(f"Pick {pick.draft_position}: player {player_id} to participant {participant_id}")
+    return pick
+
+def remove_pick(pick_id, session=None):
+    """Delete a pick and publish its removal; returns False if it does not exist"""
+    session = session or db.session
+    pick = session.get(DraftPick, pick_id)
+    if pick is None:
+        return False
+    data = pick_event_data(pick_id, session)
+    session.delete(pick)
+    session.flush()
+    publish('pick_removed', dict(data, next_draft_position=next_draft_position(session)), session.connection())
+    session.commit()
+    logger.info(f"Removed pick {data['draft_position']}: player {data['player_id']}")
+    return True
+
+def _explain_conflict(session, participant_id, player_id, draft_position, draft_order):
+    winner = session.execute(
+        select(DraftPick.participant_id, Participant.name, DraftPick.draft_position)
+        .join(Participant, Participant.id == DraftPick.participant_id)
+        .where(DraftPick.player_id == player_id)
+    ).first()
+    if winner:
+        return PickConflict('player_taken', f'Player already drafted by {winner.name} (pick {winner.draft_position})',
+                            drafted_by={'participant_id': winner.participant_id,
+                                        'participant_name': winner.name,
+                                        'draft_position': winner.draft_position})
+    if session.get(Player, player_id) is None:
+        return PickConflict('not_found', f'Player {player_id} not found')
+    if session.get(Participant, participant_id) is None:
+        return PickConflict('not_found', f'Participant {participant_id} not found')
+
+    expected = next_draft_position(session)
+    on_the_clock = draft_order.on_the_clock(expected) if draft_order is not None else participant_id
+    if on_the_clock != participant_id and draft_position in (None, expected):
+        name = session.execute(select(Participant.name).where(Participant.id == on_the_clock)).scalar()
+        return PickConflict('wrong_participant', f'Pick {expected} belongs to {name or "no participant"}',
+                            expected_draft_position=expected,
+                            on_the_clock={'participant_id': on_the_clock, 'participant_name': name})
+    if draft_position is None:
+        message = f'Another pick took the slot first; the next pick is {expected}'
+    else:
+        message = f'Pick {draft_position} is not on the clock; the next pick is {expected}'
+    return PickConflict('out_of_turn', message, expected_draft_position=expected)
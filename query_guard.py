@@ -0,0 +1,200 @@
+"""Opt-in N+1 query detector and per-endpoint query budgets, for development and CI.
+
+With ``QUERY_GUARD=log`` or ``QUERY_GUARD=raise``, every request is watched:
+
+    repeated statements: the same statement shape run ``QUERY_GUARD_REPEATS``
+        times or more in one request. These are usually lazy loads in a loop,
+        e.g. ``pick.player`` for every pick. Shapes compare the SQL text,
+        not the parameter values, so one query per row repeats the same
+        shape. ``IN`` lists of any length count as one shape.
+    query budgets: a view decorated with ``@query_budget(n)`` running more
+        than ``n`` statements.
+
+``log`` logs each offending request once it ends. The log line has the
+statement counts, the relationship being lazy loaded and the call site, which
+is the innermost frame of the app's own code or templates. ``raise`` raises
+``QueryGuardViolation`` from the offending statement itself, so tests fail
+with the stack of the loop that caused it. With the default ``QUERY_GUARD=off``
+nothing is installed.
+
+``watch`` applies the same checks to any block, whatever ``QUERY_GUARD`` is set to:
+
+    with watch('leaderboard', budget=5, mode='raise'):
+        client.get('/leaderboard')
+"""
+import logging
+import os
+import re
+import threading
+import traceback
+from contextlib import contextmanager
+
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from config import BASE_DIR, QUERY_GUARD, QUERY_GUARD_REPEATS
+
+logger = logging.getLogger(__name__)
+
+MODES = ('off', 'log', 'raise')
+# "IN (?, ?, ?)" of any length is one shape
+_IN_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+
+_local = threading.local()
+_installed_engines = set()
+
+class QueryGuardViolation(Exception):
+    """A watched block repeated a statement shape or ran past its query budget"""
+
+def statement_shape(statement):
+    return _IN_LIST.sub('(?...)', ' '.join(statement.split()))
+
+def call_site():
+    """``file:line in function`` of the innermost frame in the app's own code, or None"""
+    this_file = os.path.abspath(__file__)
+    for frame in reversed(traceback.extract_stack()):
+        filename = os.path.abspath(frame.filename)
+        if (filename.startswith(BASE_DIR + os.sep) and filename != this_file
+                and 'site-packages' not in filename):
+            return f"{os.path.relpath(filename, BASE_DIR)}:{frame.lineno} in {frame.name}"
+    return None
+
+def _at(site):
+    return f", at {site}" if site else ''
+
+class QueryWatch:
+    """Statement counts of one request or ``watch`` block"""
+    def __init__(self, label, budget=None, mode='log', repeats=QUERY_GUARD_REPEATS):
+        self.label = label
+        self.budget = budget
+        self.mode = mode
+        self.repeats = repeats
+        self.count = 0
+        # Statement shape -> [count, lazy-loaded relationship or None, call site when it hit ``repeats``]
+        self.shapes = {}
+        self.over_budget_at = None
+        self.lazy_load = None
+
+    def statement(self, statement):
+        self.count += 1
+        shape = statement_shape(statement)
+        entry = self.shapes.get(shape)
+        if entry is None:
+            entry = self.shapes[shape] = [0, None, None]
+        entry[0] += 1
+        if self.lazy_load:
+            entry[1], self.lazy_load = self.lazy_load, None
+        if entry[0] == self.repeats:
+            entry[2] = call_site()
+            self._violation(self._describe_repeat(shape, entry))
+        if self.budget is not None and self.count == self.budget + 1:
+            self.over_budget_at = call_site()
+            self._violation(f"ran more than its budget of {self.budget} queries{_at(self.over_budget_at)}")
+
+    def _violation(self, message):
+        if self.mode == 'raise':
+            raise QueryGuardViolation(f"{self.label} {message}")
+
+    @staticmethod
+    def _describe_repeat(shape, entry):
+        count, relationship, site = entry
+        what = f"lazy load of {relationship}" if relationship else 'statement'
+        return f"ran a {what} {count} times{_at(site)}: {shape[:200]}"
+
+    @property
+    def over_budget(self):
+        return self.budget is not None and self.count > self.budget
+
+    @property
+    def repeated(self):
+        """``(shape, entry)`` of the shapes run ``repeats`` times or more, most frequent first"""
+        return sorted(((shape, entry) for shape, entry in self.shapes.items() if entry[0] >= self.repeats),
+                      key=lambda item: -item[1][0])
+
+    def report(self):
+        """Log the repeated statements and budget overrun, if any"""
+        repeated = self.repeated
+        if not repeated and not self.over_budget:
+            return
+        lines = [f"Query guard: {self.label} ran {self.count} statements"
+                 + (f" (budget {self.budget})" if self.budget is not None else '')]
+        if self.over_budget:
+            lines.append(f"  over budget{_at(self.over_budget_at)}")
+        for shape, entry in repeated:
+            lines.append(f"  {self._describe_repeat(shape, entry)}")
+        logger.warning('\n'.join(lines))
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    for query_watch in getattr(_local, 'watches', ()):
+        query_watch.statement(statement)
+
+def _do_orm_execute(orm_execute_state):
+    # Runs just before the lazy load's statement, so the watch can label it
+    watches = getattr(_local, 'watches', None)
+    if watches and orm_execute_state.is_select and orm_execute_state.lazy_loaded_from is not None:
+        relationship = str(getattr(orm_execute_state.loader_strategy_path, 'prop', 'a relationship'))
+        for query_watch in watches:
+            query_watch.lazy_load = relationship
+
+def _install(db):
+    """Listen to ``db``'s engines and ORM sessions (needs an app context); safe to call repeatedly"""
+    if not _installed_engines:
+        event.listen(Session, 'do_orm_execute', _do_orm_execute)
+    for engine in db.engines.values():
+        if engine not in _installed_engines:
+            event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+            _installed_engines.add(engine)
+
+def _start(query_watch):
+    # Watches nest, e.g. a test's ``watch`` around a request: every active one counts each statement
+    _local.watches = getattr(_local, 'watches', ()) + (query_watch,)
+    return query_watch
+
+def _stop(query_watch):
+    _local.watches = tuple(active for active in getattr(_local, 'watches', ()) if active is not query_watch)
+
+@contextmanager
+def watch(label, budget=None, mode='raise', repeats=QUERY_GUARD_REPEATS):
+    """Watch the statements run by this thread inside the block; yields the ``QueryWatch``"""
+    from models import db
+
+    _install(db)
+    query_watch = _start(QueryWatch(label, budget, mode, repeats))
+    try:
+        yield query_watch
+    finally:
+        _stop(query_watch)
+        if mode == 'log':
+            query_watch.report()
+
+def query_budget(limit):
+    """Decorator setting the most SQL statements a view may run while the query guard is on"""
+    def decorator(view):
+        view.query_budget = limit
+        return view
+    return decorator
+
+def init_app(app, db):
+    """Watch every request of ``app`` when ``QUERY_GUARD`` is ``log`` or ``raise``"""
+    if QUERY_GUARD not in MODES:
+        raise ValueError(f"Unknown QUERY_GUARD mode: {QUERY_GUARD}")
+    if QUERY_GUARD == 'off':
+        return
+    with app.app_context():
+        _install(db)
+
+    @app.before_request
+    def _watch_request():
+        view = app.view_functions.get(request.endpoint)
+        g.query_watch = _start(QueryWatch(f"{request.method} {request.path}",
+                                          getattr(view, 'query_budget', None), QUERY_GUARD))
+
+    @app.teardown_request
+    def _report_request(exc):
+        query_watch = g.pop('query_watch', None)
+        if query_watch is None:
+            return
+        _stop(query_watch)
+        if QUERY_GUARD == 'log':
+            query_watch.report()
@@ -0,0 +1,129 @@
+"""Conditional GET support for the read-only JSON APIs.
+
+Views decorated with ``versioned_json('players', 'draft_picks', ...)`` are
+tagged with a strong ``ETag`` built from the current values of the data version
+counters they depend on (see versions.py) plus the query string. Reading those
+counters is one primary-key lookup. A request whose ``If-None-Match`` already
+names the current tag is answered ``304 Not Modified`` right after that lookup,
+before the view runs any query. Otherwise the serialized body is served from a
+per-process ``LRUCache`` keyed by the same versions, so each worker renders a
+given response at most once per data change.
+
+Writers keep the tags honest by bumping the counters in the transaction that
+changes the data. ORM writes to players, participants and picks are counted
+automatically; statements that bypass the ORM call ``bump_version`` themselves.
+"""
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+from flask import Response, current_app, request
+
+from config import RESPONSE_CACHE_MAX_BYTES
+from versions import current_versions
+
+logger = logging.getLogger(__name__)
+
+class LRUCache:
+    """Thread-safe least-recently-used cache of str or bytes values, bounded by their total length.
+
+    Counters:
+        hits: Lookups served from the cache.
+        misses: Lookups that found nothing.
+        evictions: Entries dropped to stay within ``max_bytes``.
+
+    Callers may keep ``extra_counters`` of their own alongside, updated with ``count``.
+    """
+    COUNTERS = ('hits', 'misses', 'evictions')
+
+    def __init__(self, max_bytes, extra_counters=()):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = dict.fromkeys(self.COUNTERS + tuple(extra_counters), 0)
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.counters['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.counters['hits'] += 1
+            return value
+
+    def put(self, key, value):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._entries[key] = value
+            self.size += len(value)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+                self.counters['evictions'] += 1
+
+    def count(self, counter):
+        with self._lock:
+            self.counters[counter] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self):
+        """Counters, hit rate and current size"""
+        with self._lock:
+            lookups = self.counters['hits'] + self.counters['misses']
+            return dict(self.counters,
+                        entries=len(self._entries),
+                        bytes=self.size,
+                        hit_rate=round(self.counters['hits'] / lookups, 3) if lookups else 0.0)
+
+# not_modified: conditional requests answered 304
+response_cache = LRUCache(RESPONSE_CACHE_MAX_BYTES, extra_counters=('not_modified',))
+
+def _variant():
+    """Short, order-independent digest of the query string ('' without one)"""
+    if not request.args:
+        return ''
+    args = sorted(request.args.items(multi=True))
+    return hashlib.sha1(repr(args).encode('utf-8')).hexdigest()[:12]
+
+def versioned_json(*names):
+    """Serve the decorated JSON view with an ETag derived from the ``names`` data versions"""
+    def decorate(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            versions = current_versions(*names)
+            variant = _variant()
+            etag = '-'.join([request.endpoint] + [str(versions[name]) for name in names] + ([variant] if variant else []))
+
+            if request.if_none_match.contains(etag):
+                response_cache.count('not_modified')
+                response = Response(status=304)
+            else:
+                key = (request.endpoint, variant, tuple(versions[name] for name in names))
+                body = response_cache.get(key)
+                if body is None:
+                    response = current_app.make_response(view(*args, **kwargs))
+                    if response.status_code != 200:
+                        # Errors are neither cached nor tagged
+                        return response
+                    body = response.get_data()
+                    response_cache.put(key, body)
+                response = Response(body, mimetype='application/json')
+
+            response.set_etag(etag)
+            # Browsers may keep the body but must revalidate it on every use
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorate
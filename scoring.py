@@ -0,0 +1,183 @@
+"""Materialized leaderboard scores.
+
+``PickScore`` holds the tournament points earned by each draft pick and
+``ParticipantScore`` the running total per participant, so the leaderboard is a
+single indexed read instead of walking draft_picks -> player -> tournament_stats
+for every participant.
+
+The rows are kept current by an ``after_flush`` hook that recomputes only the
+picks and participants touched by the flush. Statements that bypass the ORM
+(query-level deletes, bulk ingest) must call ``refresh_player_scores`` or
+``refresh_pick_scores`` themselves, and ``rebuild_scores`` recomputes
+everything from scratch for recovery.
+
+Totals that change bump the ``scores`` data version and are published as a
+``score_changed`` event for live leaderboards (see events.py).
+"""
+import logging
+from datetime import datetime
+
+from sqlalchemy import delete, event, func, insert, inspect, literal, select, union
+from sqlalchemy.orm import Session
+
+from events import publish
+from models import db, Participant, DraftPick, PlayerTournamentStat, PickScore, ParticipantScore
+from versions import bump_version
+
+logger = logging.getLogger(__name__)
+
+# Keep IN lists well below SQLite's bound-parameter limit
+CHUNK_SIZE = 500
+
+def _chunks(ids):
+    ids = sorted(ids)
+    for start in range(0, len(ids), CHUNK_SIZE):
+        yield ids[start:start + CHUNK_SIZE]
+
+def _pick_scores_select(condition=None):
+    """SELECT producing PickScore rows from draft picks and their players' stats"""
+    query = select(
+        DraftPick.id,
+        DraftPick.participant_id,
+        DraftPick.player_id,
+        func.coalesce(func.sum(PlayerTournamentStat.points), 0),
+        literal(datetime.utcnow())
+    ).select_from(DraftPick).outerjoin(
+        PlayerTournamentStat, PlayerTournamentStat.player_id == DraftPick.player_id
+    ).group_by(DraftPick.id)
+    if condition is not None:
+        query = query.where(condition)
+    return query
+
+def _participant_scores_select(condition=None):
+    """SELECT producing ParticipantScore rows from the materialized pick scores"""
+    query = select(
+        Participant.id,
+        func.coalesce(func.sum(PickScore.points), 0),
+        func.count(PickScore.draft_pick_id),
+        literal(datetime.utcnow())
+    ).select_from(Participant).outerjoin(
+        PickScore, PickScore.participant_id == Participant.id
+    ).group_by(Participant.id)
+    if condition is not None:
+        query = query.where(condition)
+    return query
+
+PICK_SCORE_COLUMNS = ['draft_pick_id', 'participant_id', 'player_id', 'points', 'updated_at']
+PARTICIPANT_SCORE_COLUMNS = ['participant_id', 'total_points', 'pick_count', 'updated_at']
+
+def refresh_participant_scores(participant_ids, connection=None):
+    """Recompute the leaderboard rows for the given participants"""
+    connection = connection or db.session.connection()
+    changed = []
+    for chunk in _chunks(participant_ids):
+        totals = select(
+            ParticipantScore.participant_id, ParticipantScore.total_points, ParticipantScore.pick_count
+        ).where(ParticipantScore.participant_id.in_(chunk))
+        before = {row[0]: tuple(row) for row in connection.execute(totals)}
+        connection.execute(delete(ParticipantScore).where(ParticipantScore.participant_id.in_(chunk)))
+        connection.execute(insert(ParticipantScore).from_select(
+            PARTICIPANT_SCORE_COLUMNS, _participant_scores_select(Participant.id.in_(chunk))
+        ))
+        changed.extend(row for row in connection.execute(totals) if before.get(row[0]) != tuple(row))
+    if changed:
+        bump_version('scores', connection)
+        publish('score_changed', {'scores': [
+            {'participant_id': participant_id, 'total_points': total_points, 'pick_count': pick_count}
+            for participant_id, total_points, pick_count in changed
+        ]}, connection)
+
+def refresh_pick_scores(pick_ids, connection=None):
+    """Recompute the score rows for the given draft picks and their participants' totals.
+
+    Picks that no longer exist lose their score row.
+    """
+    connection = connection or db.session.connection()
+    participant_ids = set()
+    for chunk in _chunks(pick_ids):
+        participant_ids.update(connection.execute(union(
+            select(PickScore.participant_id).where(PickScore.draft_pick_id.in_(chunk)),
+            select(DraftPick.participant_id).where(DraftPick.id.in_(chunk))
+        )).scalars())
+        connection.execute(delete(PickScore).where(PickScore.draft_pick_id.in_(chunk)))
+        connection.execute(insert(PickScore).from_select(
+            PICK_SCORE_COLUMNS, _pick_scores_select(DraftPick.id.in_(chunk))
+        ))
+    refresh_participant_scores(participant_ids, connection)
+
+def refresh_player_scores(player_ids, connection=None):
+    """Recompute scores for every pick of the given players, e.g. after a stats ingest"""
+    connection = connection or db.session.connection()
+    pick_ids = set()
+    for chunk in _chunks(player_ids):
+        pick_ids.update(connection.execute(union(
+            select(PickScore.draft_pick_id).where(PickScore.player_id.in_(chunk)),
+            select(DraftPick.id).where(DraftPick.player_id.in_(chunk))
+        )).scalars())
+    refresh_pick_scores(pick_ids, connection)
+
+def rebuild_scores(connection=None):
+    """Recompute every materialized score from the source tables"""
+    connection = connection or db.session.connection()
+    connection.execute(delete(PickScore))
+    connection.execute(insert(PickScore).from_select(PICK_SCORE_COLUMNS, _pick_scores_select()))
+    connection.execute(delete(ParticipantScore))
+    connection.execute(insert(ParticipantScore).from_select(
+        PARTICIPANT_SCORE_COLUMNS, _participant_scores_select()
+    ))
+    bump_version('scores', connection)
+    publish('scores_rebuilt', {}, connection)
+    logger.info("Rebuilt materialized leaderboard scores")
+
+def _changed_values(obj, *attrs):
+    """Current and previous values of ``attrs`` that changed on ``obj``"""
+    values = set()
+    state = inspect(obj)
+    for attr in attrs:
+        history = state.attrs[attr].history
+        if history.has_changes():
+            values.update(v for v in history.added + history.deleted if v is not None)
+    return values
+
+@event.listens_for(Session, 'after_flush')
+def _maintain_scores(session, flush_context):
+    """Apply score changes for stats, picks and participants written in this flush"""
+    player_ids, pick_ids, participant_ids, removed_participant_ids = set(), set(), set(), set()
+    
+    for obj in session.new:
+        if isinstance(obj, PlayerTournamentStat):
+            player_ids.add(obj.player_id)
+        elif isinstance(obj, DraftPick):
+            pick_ids.add(obj.id)
+        elif isinstance(obj, Participant):
+            participant_ids.add(obj.id)
+    
+    for obj in session.dirty:
+        if isinstance(obj, PlayerTournamentStat):
+            if _changed_values(obj, 'points'):
+                player_ids.add(obj.player_id)
+            player_ids.update(_changed_values(obj, 'player_id'))
+        elif isinstance(obj, DraftPick):
+            if _changed_values(obj, 'player_id', 'participant_id'):
+                pick_ids.add(obj.id)
+    
+    for obj in session.deleted:
+        if isinstance(obj, PlayerTournamentStat):
+            player_ids.add(obj.player_id)
+        elif isinstance(obj, DraftPick):
+            pick_ids.add(obj.id)
+        elif isinstance(obj, Participant):
+            removed_participant_ids.add(obj.id)
+    
+    if not (player_ids or pick_ids or participant_ids or removed_participant_ids):
+        return
+    
+    connection = session.connection()
+    for chunk in _chunks(removed_participant_ids):
+        connection.execute(delete(PickScore).where(PickScore.participant_id.in_(chunk)))
+    if player_ids:
+        refresh_player_scores(player_ids, connection)
+    if pick_ids:
+        refresh_pick_scores(pick_ids, connection)
+    if participant_ids or removed_participant_ids:
+        refresh_participant_scores(participant_ids | removed_participant_ids, connection)
@@ -0,0 +1,224 @@
+"""Structured reports of scrape runs, kept in the ``scrape_run`` table.
+
+Every ``MarchMadnessScraper`` fills a ``ScrapeReport`` while it runs. For each
+stage (teams, rosters, player_stats, players, games, game_stats) the report has:
+
+    wall_seconds     time the run spent in the stage, from its progress reports
+    fetch_seconds    HTTP requests, from sending to the full body
+    throttle_seconds waiting for the per-host rate limiter
+    parse_seconds    parsing pages
+    cache_seconds    scrape cache reads and writes
+    db_seconds       ingest batches writing to the database
+    requests, not_modified, errors and bytes downloaded
+    cache_hits, cache_stale and cache_misses of scrape cache lookups, and their hit ratio
+    rows_inserted, rows_updated and rows_skipped by the ingest
+
+Fetches, parsing and cache I/O are counted under the stage of the cache entry
+they serve, not the stage being reported. For example, a roster fetched while
+game stats are collected counts under rosters. These times are summed over the
+fetch workers, so they can add up to more than the stage's wall time. The
+report also lists the slowest URLs of the run.
+
+``update_tournament_data`` and ``update_game_scores`` save their report when
+they finish or fail. The last ``SCRAPE_REPORT_HISTORY`` are kept and served by
+``/api/scrape_reports``.
+"""
+import heapq
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from sqlalchemy import delete, select
+
+from config import SCRAPE_REPORT_HISTORY
+from models import db, ScrapeRun
+
+logger = logging.getLogger(__name__)
+
+STAGES = ('teams', 'rosters', 'player_stats', 'players', 'games', 'game_stats')
+# Scrape cache entity (key prefix) -> stage that its fetches and cache I/O count under
+ENTITY_STAGES = {
+    'tournament_teams': 'teams',
+    'team_players': 'rosters',
+    'player_stats': 'player_stats',
+    'tournament_games': 'games',
+    'player_game_stats': 'game_stats',
+}
+# Ingest batch entity -> stage
+INGEST_STAGES = {'players': 'players', 'games': 'games', 'player_game_stats': 'game_stats'}
+COUNTERS = ('wall_seconds', 'fetch_seconds', 'throttle_seconds', 'parse_seconds', 'cache_seconds', 'db_seconds',
+            'requests', 'not_modified', 'errors', 'bytes', 'cache_hits', 'cache_stale', 'cache_misses',
+            'rows_inserted', 'rows_updated', 'rows_skipped')
+SLOWEST_URLS = 10
+
+def entity_stage(cache_key):
+    """Stage of a scrape cache key or file name, e.g. ``team_players_Gonzaga_2025`` -> ``rosters``"""
+    for entity, stage in ENTITY_STAGES.items():
+        if cache_key.startswith(entity + '_'):
+            return stage
+    return None
+
+class ScrapeReport:
+    """Thread-safe per-stage totals of one scrape run"""
+    def __init__(self):
+        self.kind = None
+        self.started_at = datetime.utcnow()
+        self.finished_at = None
+        self._started = time.monotonic()
+        self._finished = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.stages = {}
+        self.slowest = []  # min-heap of (seconds, url, stage, status, bytes)
+        self._stage = None
+        self._stage_started = None
+
+    def track(self, progress):
+        """Wrap a ``progress`` callback so that the report also times each stage the run reports"""
+        def tracked(stage, done=0, total=0):
+            if stage != self._stage:
+                self._close_stage()
+                self._stage, self._stage_started = stage, time.monotonic()
+            progress(stage, done, total)
+        return tracked
+
+    def _close_stage(self):
+        if self._stage is not None:
+            self.add(self._stage, wall_seconds=time.monotonic() - self._stage_started)
+            self._stage = None
+
+    @contextmanager
+    def serving(self, cache_key):
+        """Count what runs in the block on this thread under the stage of ``cache_key``"""
+        previous = getattr(self._local, 'stage', None)
+        self._local.stage = entity_stage(cache_key) or previous
+        try:
+            yield
+        finally:
+            self._local.stage = previous
+
+    def add(self, stage=None, **amounts):
+        """Add ``amounts`` to ``stage``'s counters (default: the stage served on this thread)"""
+        stage = stage or getattr(self._local, 'stage', None) or self._stage or 'other'
+        with self._lock:
+            counters = self.stages.get(stage)
+            if counters is None:
+                counters = self.stages[stage] = dict.fromkeys(COUNTERS, 0)
+            for name, amount in amounts.items():
+                counters[name] += amount
+
+    def fetched(self, url, seconds, status, size):
+        """Record one HTTP request and its response"""
+        stage = getattr(self._local, 'stage', None) or self._stage or 'other'
+        self.add(stage, fetch_seconds=seconds, requests=1, bytes=size, not_modified=1 if status == 304 else 0)
+        with self._lock:
+            entry = (seconds, url, stage, status, size)
+            if len(self.slowest) < SLOWEST_URLS:
+                heapq.heappush(self.slowest, entry)
+            else:
+                heapq.heappushpop(self.slowest, entry)
+
+    def add_batches(self, batches):
+        """Count the ingest batches (``IngestStats``) of the run"""
+        for stats in batches:
+            self.add(INGEST_STAGES.get(stats.entity, stats.entity), db_seconds=stats.seconds,
+                     rows_inserted=stats.inserted, rows_updated=stats.updated, rows_skipped=stats.skipped)
+
+    def finish(self):
+        self._close_stage()
+        self._finished = time.monotonic()
+        self.finished_at = datetime.utcnow()
+
+    def to_dict(self):
+        """JSON-ready report: counters per stage in run order, totals and the slowest URLs"""
+        def rounded(counters):
+            counters = {name: round(value, 4) if isinstance(value, float) else value
+                        for name, value in counters.items()}
+            lookups = counters['cache_hits'] + counters['cache_stale'] + counters['cache_misses']
+            counters['cache_hit_ratio'] = round(counters['cache_hits'] / lookups, 3) if lookups else None
+            return counters
+
+        with self._lock:
+            order = list(STAGES) + sorted(set(self.stages) - set(STAGES))
+            stages = {stage: dict(self.stages[stage]) for stage in order if stage in self.stages}
+            slowest = sorted(self.slowest, reverse=True)
+        totals = dict.fromkeys(COUNTERS, 0)
+        for counters in stages.values():
+            for name in COUNTERS:
+                totals[name] += counters[name]
+        totals['wall_seconds'] = round((self._finished or time.monotonic()) - self._started, 4)
+        return {
+            'stages': [dict(rounded(counters), stage=stage) for stage, counters in stages.items()],
+            'totals': rounded(totals),
+            'slowest_urls': [{'url': url, 'stage': stage, 'seconds': round(seconds, 4), 'status': status,
+                              'bytes': size} for seconds, url, stage, status, size in slowest]
+        }
+
+    def summary(self):
+        """One log line: the run's wall time and the time spent on each kind of work"""
+        totals = self.to_dict()['totals']
+        return (f"{totals['wall_seconds']:.2f}s, {totals['requests']} requests "
+                f"({totals['bytes'] / 1024:.0f} KB) in {totals['fetch_seconds']:.2f}s, "
+                f"parse {totals['parse_seconds']:.2f}s, cache I/O {totals['cache_seconds']:.2f}s "
+                f"(hit ratio {totals['cache_hit_ratio']}), DB writes {totals['db_seconds']:.2f}s "
+                f"({totals['rows_inserted']} inserted, {totals['rows_updated']} updated)")
+
+@contextmanager
+def recorded(report, kind):
+    """Run the block as a ``kind`` scrape and save ``report`` when it finishes or fails"""
+    report.kind = kind
+    try:
+        yield report
+    except Exception as e:
+        save(report, error=str(e))
+        raise
+    save(report)
+
+def save(report, error=None):
+    """Persist a finished run's report and prune old ones; a failure to save is logged, not raised"""
+    report.finish()
+    logger.info(f"Scrape report ({report.kind}): {report.summary()}")
+    try:
+        if error:
+            # The failure may have left the session mid-transaction
+            db.session.rollback()
+        run = ScrapeRun(kind=report.kind, status='failed' if error else 'succeeded', error=error,
+                        started_at=report.started_at, finished_at=report.finished_at,
+                        report=json.dumps(report.to_dict()))
+        db.session.add(run)
+        db.session.commit()
+        prune()
+        return run
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error saving the scrape report: {e}")
+        return None
+
+def prune(keep=SCRAPE_REPORT_HISTORY):
+    """Delete reports beyond the ``keep`` most recent"""
+    oldest_kept = db.session.execute(
+        select(ScrapeRun.id).order_by(ScrapeRun.id.desc()).offset(keep - 1).limit(1)
+    ).scalar()
+    if oldest_kept is not None:
+        db.session.execute(delete(ScrapeRun).where(ScrapeRun.id < oldest_kept))
+        db.session.commit()
+
+def describe(run, full=True):
+    """JSON-ready view of a saved run for /api/scrape_reports; ``full`` includes the per-stage report"""
+    report = json.loads(run.report)
+    described = {
+        'id': run.id,
+        'kind': run.kind,
+        'status': run.status,
+        'error': run.error,
+        'started_at': run.started_at.isoformat() if run.started_at else None,
+        'finished_at': run.finished_at.isoformat() if run.finished_at else None,
+        'totals': report['totals']
+    }
+    if full:
+        described['stages'] = report['stages']
+        described['slowest_urls'] = report['slowest_urls']
+    return described
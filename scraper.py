@@ -1,25 +1,72 @@
 import requests
-from bs4 import BeautifulSoup
 import logging
+import threading
 import time
-import json
 import os
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from models import db, Player, TournamentGame, PlayerTournamentStat
-from config import TOURNAMENT_YEAR, ESPN_BASE_URL
+from functools import partial
+from urllib.parse import urlparse
+from http_cache import HttpCache
+from ingest import IngestWriter
+from parsing import parse_page
+from config import (TOURNAMENT_YEAR, ESPN_BASE_URL, SCRAPER_MAX_WORKERS,
+                    SCRAPER_REQUESTS_PER_SECOND, SCRAPER_REQUEST_TIMEOUT, SCRAPE_CACHE_BACKEND,
+                    SCRAPE_CACHE_TTL_SECONDS, SCRAPER_TRANSPORT, SCRAPER_ARCHIVE,
+                    SCRAPER_REPLAY_LATENCY_SCALE)
+from cache_store import create_store
+from transport import create_transport
+from scrape_report import ScrapeReport, entity_stage, recorded
 
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Returned by get_page(skip_if_unchanged=True) when the server answers 304
+NOT_MODIFIED = object()
+
+# Refreshes of cache entries, shared by all scraper instances and keyed by
+# (data_dir, cache key) so that concurrent requests for one entry fetch it once
+_refresh_pool = ThreadPoolExecutor(max_workers=SCRAPER_MAX_WORKERS, thread_name_prefix='scrape-refresh')
+_refresh_lock = threading.Lock()
+_refreshes_in_flight = {}
+
+def no_progress(stage, done=0, total=0):
+    """Default ``progress`` callback: scrape runs report their stage and item counts to it"""
+
+class HostRateLimiter:
+    """Spaces out requests to each host so that concurrent workers stay polite.
+
+    Every call to ``wait`` reserves the next free slot for the URL's host and
+    sleeps until that slot arrives. Slots are handed out under a lock, so the
+    limit holds across all threads sharing the limiter.
+    """
+    def __init__(self, requests_per_second=SCRAPER_REQUESTS_PER_SECOND):
+        self.min_interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, url):
+        """Block until a request to the host of ``url`` may be sent"""
+        if not self.min_interval:
+            return
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
 class MarchMadnessScraper:
     """
     Provides capabilities to scrape and manage data related to the NCAA March Madness tournament.
 
     This class supports methods to scrape tournament teams, team rosters, and player statistics.
-    Implementations include caching the data locally in JSON files to minimize redundant
-    network requests. It also interacts with web pages using the Beautiful Soup library to
+    Implementations include caching the data locally (see cache_store.py) to minimize
+    redundant network requests. It also interacts with web pages using the Beautiful Soup library to
     parse HTML content, and provides options for customizing requests such as forcing fresh
     scrapes instead of using cached data.
 
@@ -27,72 +74,241 @@ class MarchMadnessScraper:
         base_url: Base API or website URL for accessing NCAA or ESPN-related data.
         headers: HTTP headers used for making requests, including a User-Agent string to
                  minimize bot detection issues.
-        data_dir: Directory location where cached JSON data is stored.
+        data_dir: Directory location where cached data is stored.
+        cache: Store backing save_data/load_data, selected by SCRAPE_CACHE_BACKEND.
+        max_workers: Number of worker threads used to fetch rosters and player stats.
+        session: Pooled HTTP session shared by all workers. Its transport (see
+                 transport.py) sends requests live, records them or replays them.
+        rate_limiter: Per-host limiter applied to every outgoing request.
+        http_cache: Validator cache used to send conditional requests.
+        rosters: Rosters fetched by this instance, keyed by (team name, year), so that
+                 one update run fetches each roster at most once.
+        report: Per-stage timings and counts of this instance's run (see scrape_report.py).
     """
-    def __init__(self, base_url=ESPN_BASE_URL):
+    def __init__(self, base_url=ESPN_BASE_URL, data_dir=None, max_workers=SCRAPER_MAX_WORKERS,
+                 requests_per_second=SCRAPER_REQUESTS_PER_SECOND, cache_backend=SCRAPE_CACHE_BACKEND,
+                 transport=SCRAPER_TRANSPORT, archive_path=SCRAPER_ARCHIVE,
+                 latency_scale=SCRAPER_REPLAY_LATENCY_SCALE):
         self.base_url = base_url
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        self.data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+        self.data_dir = data_dir or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir)
+        self.cache = create_store(cache_backend, self.data_dir)
+        
+        # One session for all workers so connections are reused across requests
+        self.max_workers = max(1, max_workers)
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = create_transport(transport, archive_path, self.max_workers, latency_scale)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.rate_limiter = HostRateLimiter(requests_per_second)
+        self.http_cache = HttpCache(os.path.join(self.data_dir, 'http_cache'))
+        self.rosters = {}
+        self.report = ScrapeReport()
+    
+    @staticmethod
+    def cache_key(filename):
+        """Cache store key for a cache file name such as ``tournament_teams_2025.json``"""
+        return filename[:-len('.json')] if filename.endswith('.json') else filename
     
     def save_data(self, data, filename):
-        """Save data to a JSON file"""
-        filepath = os.path.join(self.data_dir, filename)
+        """Save data to the cache store"""
+        key = self.cache_key(filename)
+        start = time.perf_counter()
         try:
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=2)
-            logger.info(f"Data saved to {filepath}")
+            self.cache.put(key, data)
+            logger.info(f"Data saved to cache entry {key}")
             return True
         except Exception as e:
-            logger.error(f"Error saving data to {filepath}: {e}")
+            logger.error(f"Error saving data to cache entry {key}: {e}")
             return False
+        finally:
+            self.report.add(entity_stage(key), cache_seconds=time.perf_counter() - start)
+    
+    def revalidated(self, data, filename):
+        """Keep a cache entry whose page answered 304, restarting its TTL; returns ``data``"""
+        key = self.cache_key(filename)
+        start = time.perf_counter()
+        try:
+            if not self.cache.touch(key):
+                self.cache.put(key, data)
+            logger.info(f"Page unchanged since last fetch, keeping cached {filename}")
+        except Exception as e:
+            logger.error(f"Error revalidating cache entry {key}: {e}")
+        finally:
+            self.report.add(entity_stage(key), cache_seconds=time.perf_counter() - start)
+        return data
+    
+    def load_entry(self, filename):
+        """Load data from the cache store along with its write time, as ``(data, updated_at)``"""
+        key = self.cache_key(filename)
+        start = time.perf_counter()
+        try:
+            entry = self.cache.get_entry(key)
+        except Exception as e:
+            logger.error(f"Error loading data from cache entry {key}: {e}")
+            return None, None
+        finally:
+            self.report.add(entity_stage(key), cache_seconds=time.perf_counter() - start)
+        
+        if entry is None:
+            logger.info(f"No cached data found for {key}")
+            return None, None
+        logger.info(f"Data loaded from cache entry {key}")
+        return entry
     
     def load_data(self, filename):
-        """Load data from a JSON file"""
-        filepath = os.path.join(self.data_dir, filename)
-        if not os.path.exists(filepath):
-            logger.info(f"No cached data found at {filepath}")
-            return None
+        """Load data from the cache store"""
+        return self.load_entry(filename)[0]
+    
+    def load_many(self, filenames):
+        """Bulk-load cache entries; returns a dict of filename to ``(data, updated_at)`` for the entries found"""
+        keys = {self.cache_key(filename): filename for filename in filenames}
+        if not keys:
+            return {}
+        start = time.perf_counter()
+        try:
+            found = self.cache.get_many_entries(keys)
+        except Exception as e:
+            logger.error(f"Error bulk-loading {len(keys)} cache entries: {e}")
+            return {}
+        finally:
+            self.report.add(entity_stage(next(iter(keys))), cache_seconds=time.perf_counter() - start)
+        return {keys[key]: entry for key, entry in found.items() if entry[0]}
+    
+    def is_stale(self, filename, updated_at):
+        """Whether a cache entry written at ``updated_at`` has outlived its entity type's TTL"""
+        key = self.cache_key(filename)
+        for entity, ttl in SCRAPE_CACHE_TTL_SECONDS.items():
+            if key.startswith(entity + '_'):
+                return time.time() - updated_at > ttl
+        return False
+    
+    def cached_scrape(self, filename, fetch, force_refresh=False):
+        """Serve a cache entry with stale-while-revalidate semantics
+        
+        Fresh entries are returned as-is. Stale entries are returned immediately
+        while ``fetch`` runs in the background to replace them. Missing entries, or
+        any entry when ``force_refresh`` is set, are fetched before returning.
+        ``fetch`` is called with the currently cached data (or None) and returns
+        the new data. Concurrent fetches of the same entry are coalesced.
+        """
+        cached_data, updated_at = self.load_entry(filename)
+        stage = entity_stage(filename)
+        if cached_data and not force_refresh:
+            if self.is_stale(filename, updated_at):
+                logger.info(f"Serving stale {filename} while it refreshes in the background")
+                self.report.add(stage, cache_stale=1)
+                self._refresh(filename, fetch, cached_data, wait=False)
+            else:
+                self.report.add(stage, cache_hits=1)
+            return cached_data
+        self.report.add(stage, cache_misses=1)
+        return self._refresh(filename, fetch, cached_data, wait=True)
+    
+    def _refresh(self, filename, fetch, cached_data, wait):
+        """Run ``fetch`` for ``filename`` unless a fetch of it is already in flight"""
+        key = (self.data_dir, self.cache_key(filename))
+        with _refresh_lock:
+            future = _refreshes_in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                _refreshes_in_flight[key] = future
+        
+        if owner:
+            fetch = partial(self._fetch_reported, filename, fetch)
+            if wait:
+                self._run_refresh(key, future, fetch, cached_data)
+            else:
+                _refresh_pool.submit(self._run_refresh, key, future, fetch, cached_data)
         
+        return future.result() if wait else None
+    
+    def _fetch_reported(self, filename, fetch, cached_data):
+        """Run ``fetch``, counting its requests, parsing and cache writes under ``filename``'s stage"""
+        with self.report.serving(filename):
+            return fetch(cached_data)
+    
+    @staticmethod
+    def _run_refresh(key, future, fetch, cached_data):
         try:
-            with open(filepath, 'r') as f:
-                data = json.load(f)
-            logger.info(f"Data loaded from {filepath}")
-            return data
+            future.set_result(fetch(cached_data))
         except Exception as e:
-            logger.error(f"Error loading data from {filepath}: {e}")
-            return None
-            
-    def get_page(self, url):
-        """Fetch a web page and return the BeautifulSoup object"""
+            logger.error(f"Error refreshing cache entry {key[1]}: {e}")
+            future.set_exception(e)
+        finally:
+            with _refresh_lock:
+                _refreshes_in_flight.pop(key, None)
+    
+    def get_page(self, url, page_type=None, skip_if_unchanged=False):
+        """Fetch a web page and return the BeautifulSoup object
+        
+        Only the elements that ``page_type`` needs are parsed (see parsing.py). The
+        request is made conditional when the page is in the HTTP cache. On a 304 the
+        cached body is parsed instead, or, with ``skip_if_unchanged``, nothing is
+        parsed and ``NOT_MODIFIED`` is returned so the caller can reuse its own data.
+        """
         try:
-            response = requests.get(url, headers=self.headers)
+            start = time.perf_counter()
+            self.rate_limiter.wait(url)
+            self.report.add(throttle_seconds=time.perf_counter() - start)
+            conditional_headers = self.http_cache.conditional_headers(url)
+            response = self._timed_get(url, headers=conditional_headers)
+            
+            if response.status_code == 304:
+                body = self.http_cache.load_body(url)
+                if body is not None:
+                    self.http_cache.record_not_modified(url, len(body), parsed=not skip_if_unchanged)
+                    if skip_if_unchanged:
+                        return NOT_MODIFIED
+                    return self._timed_parse(body, page_type)
+                # The cached body disappeared underneath us; fetch the page in full
+                response = self._timed_get(url)
+            
             response.raise_for_status()
-            return BeautifulSoup(response.text, 'html.parser')
+            self.http_cache.store(url, response, conditional=bool(conditional_headers))
+            return self._timed_parse(response.content, page_type)
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching {url}: {e}")
+            self.report.add(errors=1)
             return None
     
+    def _timed_get(self, url, headers=None):
+        """GET ``url`` in full and record the request in the run report"""
+        start = time.perf_counter()
+        response = self.session.get(url, headers=headers, timeout=SCRAPER_REQUEST_TIMEOUT)
+        size = len(response.content)
+        self.report.fetched(url, time.perf_counter() - start, response.status_code, size)
+        return response
+    
+    def _timed_parse(self, content, page_type):
+        start = time.perf_counter()
+        try:
+            return parse_page(content, page_type)
+        finally:
+            self.report.add(parse_seconds=time.perf_counter() - start)
+    
     def scrape_tournament_teams(self, year=TOURNAMENT_YEAR, force_refresh=False):
         """Scrape all teams participating in the tournament for a given year"""
         cache_filename = f"tournament_teams_{year}.json"
-        
-        # Try to load from cache first if not forcing refresh
-        if not force_refresh:
-            cached_data = self.load_data(cache_filename)
-            if cached_data:
-                logger.info(f"Using cached tournament teams data for {year}")
-                return cached_data
-        
+        return self.cached_scrape(cache_filename, partial(self._fetch_tournament_teams, year, cache_filename),
+                                  force_refresh)
+    
+    def _fetch_tournament_teams(self, year, cache_filename, cached_data):
+        """Fetch the tournament teams and replace their cache entry"""
         logger.info(f"Scraping tournament teams for {year}")
         
         # This URL would need to be adjusted based on ESPN's actual URL structure
         url = f"{self.base_url}tournament/bracket/_/year/{year}"
-        soup = self.get_page(url)
+        soup = self.get_page(url, 'bracket', skip_if_unchanged=bool(cached_data))
         
+        if soup is NOT_MODIFIED:
+            return self.revalidated(cached_data, cache_filename)
         if not soup:
             return []
         
@@ -116,23 +332,38 @@ class MarchMadnessScraper:
         logger.info(f"Found {len(sample_teams)} tournament teams")
         return sample_teams
     
+    @staticmethod
+    def team_players_filename(team_name, year=TOURNAMENT_YEAR):
+        return f"team_players_{team_name}_{year}.json"
+    
+    @staticmethod
+    def player_stats_filename(player_name, team_name, year=TOURNAMENT_YEAR):
+        # Create a safe filename by replacing spaces and special characters
+        safe_player_name = player_name.replace(' ', '_').replace('/', '_').replace('\\', '_')
+        return f"player_stats_{safe_player_name}_{team_name}_{year}.json"
+    
+    @staticmethod
+    def player_game_stats_filename(player_name, team_name, game_id, year=TOURNAMENT_YEAR):
+        # Create a safe filename by replacing spaces and special characters
+        safe_player_name = player_name.replace(' ', '_').replace('/', '_').replace('\\', '_')
+        return f"player_game_stats_{safe_player_name}_{team_name}_game{game_id}_{year}.json"
+    
     def scrape_team_players(self, team_name, year=TOURNAMENT_YEAR, force_refresh=False):
         """Scrape all players from a specific team"""
-        cache_filename = f"team_players_{team_name}_{year}.json"
-        
-        # Try to load from cache first if not forcing refresh
-        if not force_refresh:
-            cached_data = self.load_data(cache_filename)
-            if cached_data:
-                logger.info(f"Using cached player data for {team_name} ({year})")
-                return cached_data
-        
+        cache_filename = self.team_players_filename(team_name, year)
+        return self.cached_scrape(cache_filename, partial(self._fetch_team_players, team_name, year, cache_filename),
+                                  force_refresh)
+    
+    def _fetch_team_players(self, team_name, year, cache_filename, cached_data):
+        """Fetch a team's roster and replace its cache entry"""
         logger.info(f"Scraping players for {team_name} ({year})")
         
         # This URL would need to be adjusted based on ESPN's actual URL structure
         url = f"{self.base_url}team/roster/_/id/{team_name}/year/{year}"
-        soup = self.get_page(url)
+        soup = self.get_page(url, 'roster', skip_if_unchanged=bool(cached_data))
         
+        if soup is NOT_MODIFIED:
+            return self.revalidated(cached_data, cache_filename)
         if not soup:
             return []
         
@@ -169,23 +400,20 @@ class MarchMadnessScraper:
     
     def scrape_player_stats(self, player_name, team_name, year=TOURNAMENT_YEAR, force_refresh=False):
         """Scrape statistics for a specific player"""
-        # Create a safe filename by replacing spaces and special characters
-        safe_player_name = player_name.replace(' ', '_').replace('/', '_').replace('\\', '_')
-        cache_filename = f"player_stats_{safe_player_name}_{team_name}_{year}.json"
-        
-        # Try to load from cache first if not forcing refresh
-        if not force_refresh:
-            cached_data = self.load_data(cache_filename)
-            if cached_data:
-                logger.info(f"Using cached stats for {player_name} ({team_name}, {year})")
-                return cached_data
-        
+        cache_filename = self.player_stats_filename(player_name, team_name, year)
+        return self.cached_scrape(cache_filename, partial(self._fetch_player_stats, player_name, team_name, year, cache_filename),
+                                  force_refresh)
+    
+    def _fetch_player_stats(self, player_name, team_name, year, cache_filename, cached_data):
+        """Fetch a player's season statistics and replace their cache entry"""
         logger.info(f"Scraping stats for {player_name} ({team_name}, {year})")
         
         # This URL would need to be adjusted based on ESPN's actual URL structure
         url = f"{self.base_url}player/stats/_/id/{player_name}/team/{team_name}/year/{year}"
-        soup = self.get_page(url)
+        soup = self.get_page(url, 'player_stats', skip_if_unchanged=bool(cached_data))
         
+        if soup is NOT_MODIFIED:
+            return self.revalidated(cached_data, cache_filename)
         if not soup:
             return {}
         
@@ -209,20 +437,19 @@ class MarchMadnessScraper:
     def scrape_tournament_games(self, year=TOURNAMENT_YEAR, force_refresh=False):
         """Scrape all tournament games and their results"""
         cache_filename = f"tournament_games_{year}.json"
-        
-        # Try to load from cache first if not forcing refresh
-        if not force_refresh:
-            cached_data = self.load_data(cache_filename)
-            if cached_data:
-                logger.info(f"Using cached tournament games data for {year}")
-                return cached_data
-        
+        return self.cached_scrape(cache_filename, partial(self._fetch_tournament_games, year, cache_filename),
+                                  force_refresh)
+    
+    def _fetch_tournament_games(self, year, cache_filename, cached_data):
+        """Fetch the tournament games and replace their cache entry"""
         logger.info(f"Scraping tournament games for {year}")
         
         # This URL would need to be adjusted based on ESPN's actual URL structure
         url = f"{self.base_url}tournament/bracket/_/year/{year}"
-        soup = self.get_page(url)
+        soup = self.get_page(url, 'bracket', skip_if_unchanged=bool(cached_data))
         
+        if soup is NOT_MODIFIED:
+            return self.revalidated(cached_data, cache_filename)
         if not soup:
             return []
         
@@ -269,23 +496,20 @@ class MarchMadnessScraper:
     
     def scrape_player_game_stats(self, player_name, team_name, game_id, year=TOURNAMENT_YEAR, force_refresh=False):
         """Scrape player statistics for a specific game"""
-        # Create a safe filename by replacing spaces and special characters
-        safe_player_name = player_name.replace(' ', '_').replace('/', '_').replace('\\', '_')
-        cache_filename = f"player_game_stats_{safe_player_name}_{team_name}_game{game_id}_{year}.json"
-        
-        # Try to load from cache first if not forcing refresh
-        if not force_refresh:
-            cached_data = self.load_data(cache_filename)
-            if cached_data:
-                logger.info(f"Using cached game stats for {player_name} ({team_name}, game {game_id}, {year})")
-                return cached_data
-        
+        cache_filename = self.player_game_stats_filename(player_name, team_name, game_id, year)
+        return self.cached_scrape(cache_filename, partial(self._fetch_player_game_stats, player_name, team_name, game_id, year, cache_filename),
+                                  force_refresh)
+    
+    def _fetch_player_game_stats(self, player_name, team_name, game_id, year, cache_filename, cached_data):
+        """Fetch a player's statistics for one game and replace their cache entry"""
         logger.info(f"Scraping game stats for {player_name} ({team_name}, game {game_id}, {year})")
         
         # This URL would need to be adjusted based on ESPN's actual URL structure
         url = f"{self.base_url}boxscore/_/gameId/{game_id}/year/{year}"
-        soup = self.get_page(url)
+        soup = self.get_page(url, 'boxscore', skip_if_unchanged=bool(cached_data))
         
+        if soup is NOT_MODIFIED:
+            return self.revalidated(cached_data, cache_filename)
         if not soup:
             return {}
         
@@ -310,160 +534,220 @@ class MarchMadnessScraper:
         logger.info(f"Scraped game stats for {player_name} (game {game_id}): {sample_game_stats}")
         return sample_game_stats
     
-    def update_database(self):
-        """Update the database with the latest tournament data"""
+    @contextmanager
+    def fetch_pool(self):
+        """Worker pool for one batch of fetches; its threads' cache connections are closed when it shuts down"""
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                yield pool
+        finally:
+            self.cache.close()
+    
+    def _submit_uncached(self, pool, cached, filename, fn, *args):
+        """Submit ``fn(*args)`` to the pool unless ``filename`` is fresh in the bulk-loaded ``cached`` dict"""
+        if filename in cached:
+            data, updated_at = cached[filename]
+            if not self.is_stale(filename, updated_at):
+                self.report.add(entity_stage(filename), cache_hits=1)
+                future = Future()
+                future.set_result(data)
+                return future
+        return pool.submit(fn, *args)
+    
+    def fetch_team_data(self, teams, year=TOURNAMENT_YEAR, progress=no_progress):
+        """Fetch every team's roster and each player's stats on the worker pool.
+
+        Cached entries are bulk-loaded first and only the misses are scraped. Roster
+        fetches are submitted for all teams up front, and each player's stats fetch is
+        submitted as soon as that player's roster arrives. Only scraping and cache I/O
+        happens on the workers; the database is left to the caller's thread.
+
+        Returns a list of ``(team, players)`` tuples in the same order as ``teams``,
+        where each player dict already includes seed, region and season stats.
+        Completed rosters and player stats are counted to ``progress`` as they arrive.
+        """
+        results = [(team, []) for team in teams]
+        
+        cached_rosters = self.load_many(self.team_players_filename(team['name'], year) for team in teams)
+        
+        with self.fetch_pool() as pool:
+            roster_futures = {
+                self._submit_uncached(pool, cached_rosters, self.team_players_filename(team['name'], year),
+                                      self.scrape_team_players, team['name'], year): index
+                for index, team in enumerate(teams)
+            }
+            stat_futures = {}
+            
+            for done, future in enumerate(as_completed(roster_futures), 1):
+                progress('rosters', done, len(teams))
+                index = roster_futures[future]
+                team = teams[index]
+                players = future.result()
+                self.rosters[(team['name'], year)] = players
+                cached_stats = self.load_many(
+                    self.player_stats_filename(player_data['name'], team['name'], year) for player_data in players
+                )
+                for player_data in players:
+                    # Add team info to player data
+                    player_data['school_seed'] = team['seed']
+                    player_data['region'] = team['region']
+                    results[index][1].append(player_data)
+                    
+                    stats_future = self._submit_uncached(
+                        pool, cached_stats, self.player_stats_filename(player_data['name'], team['name'], year),
+                        self.scrape_player_stats, player_data['name'], team['name'], year
+                    )
+                    stat_futures[stats_future] = player_data
+            
+            for done, future in enumerate(as_completed(stat_futures), 1):
+                progress('player_stats', done, len(stat_futures))
+                stat_futures[future].update(future.result())
+        
+        return results
+    
+    def fetch_game_stats(self, games, year=TOURNAMENT_YEAR, progress=no_progress, force_refresh=False,
+                         failed_games=None):
+        """Fetch every player's stat line for the given games on the worker pool.
+
+        Each team's roster is fetched once per run (see ``rosters``), however many of
+        the games it played, and cached entries are bulk-loaded so that only the
+        misses are scraped. With ``force_refresh``, every stat line is fetched
+        (conditionally) instead of served from the cache, which may be stale.
+        Returns a list of stat line dicts with ``name``, ``school`` and ``game_id``
+        merged in, ready for ``IngestWriter.upsert_player_game_stats``. Lines that
+        fail to fetch are left out, and their game ids are added to ``failed_games``.
+        """
+        teams = sorted({team for game_data in games for team in (game_data['team1'], game_data['team2'])})
+        missing_teams = [team for team in teams if (team, year) not in self.rosters]
+        stat_lines = []
+        
+        cached_rosters = self.load_many(self.team_players_filename(team, year) for team in missing_teams)
+        
+        with self.fetch_pool() as pool:
+            roster_futures = {
+                team: self._submit_uncached(pool, cached_rosters, self.team_players_filename(team, year),
+                                            self.scrape_team_players, team, year)
+                for team in missing_teams
+            }
+            for team, future in roster_futures.items():
+                self.rosters[(team, year)] = future.result()
+            rosters = {team: self.rosters[(team, year)] for team in teams}
+            
+            lines = [
+                (player_data['name'], team, game_data['game_id'])
+                for game_data in games
+                for team in (game_data['team1'], game_data['team2'])
+                for player_data in rosters[team]
+            ]
+            cached_stats = {} if force_refresh else self.load_many(
+                self.player_game_stats_filename(name, team, game_id, year) for name, team, game_id in lines
+            )
+            
+            stat_futures = []
+            for player_name, team, game_id in lines:
+                future = self._submit_uncached(
+                    pool, cached_stats, self.player_game_stats_filename(player_name, team, game_id, year),
+                    self.scrape_player_game_stats, player_name, team, game_id, year, force_refresh
+                )
+                stat_futures.append((future, player_name, team, game_id))
+            
+            for done, (future, player_name, team, game_id) in enumerate(stat_futures, 1):
+                progress('game_stats', done, len(stat_futures))
+                stat_line = dict(future.result())
+                if not stat_line:
+                    # The fetch failed; ingesting the line would record zeros
+                    if failed_games is not None:
+                        failed_games.add(game_id)
+                    continue
+                stat_line.update(name=player_name, school=team, game_id=game_id)
+                stat_lines.append(stat_line)
+        
+        return stat_lines
+    
+    def update_database(self, progress=no_progress):
+        """Update the database with the latest tournament data, reporting each stage to ``progress``"""
         logger.info("Starting database update")
+        progress = self.report.track(progress)
         
         # Get current year or use configured tournament year
         year = TOURNAMENT_YEAR
+        writer = IngestWriter()
         
         # Step 1: Get all tournament teams
+        progress('teams')
         teams = self.scrape_tournament_teams(year)
         
-        # Step 2: For each team, get all players and their stats
-        for team in teams:
-            players = self.scrape_team_players(team['name'], year)
-            
-            for player_data in players:
-                # Add team info to player data
-                player_data['school_seed'] = team['seed']
-                player_data['region'] = team['region']
-                
-                # Get player stats
-                stats = self.scrape_player_stats(player_data['name'], team['name'], year)
-                player_data.update(stats)
-                
-                # Check if player already exists in database
-                player = Player.query.filter_by(
-                    name=player_data['name'],
-                    school=player_data['school']
-                ).first()
-                
-                if player:
-                    # Update existing player
-                    for key, value in player_data.items():
-                        setattr(player, key, value)
-                else:
-                    # Create new player
-                    player = Player(**player_data)
-                    db.session.add(player)
-            
-            # Commit changes for this team
-            db.session.commit()
+        # Step 2: Fetch all rosters and player stats concurrently, then write
+        # them to the database from this thread in one batch
+        team_data = self.fetch_team_data(teams, year, progress)
+        progress('players')
+        writer.upsert_players([player_data for _, players in team_data for player_data in players])
         
         # Step 3: Get all tournament games
+        progress('games')
         games = self.scrape_tournament_games(year)
         
         # Step 4: Update or create tournament games in the database
-        for game_data in games:
-            # Check if game already exists in database
-            game = TournamentGame.query.filter_by(
-                game_id=game_data['game_id'],
-                team1=game_data['team1'],
-                team2=game_data['team2']
-            ).first()
-            
-            if game:
-                # Update existing game
-                for key, value in game_data.items():
-                    setattr(game, key, value)
-            else:
-                # Create new game
-                game = TournamentGame(**game_data)
-                db.session.add(game)
-            
-            # Commit changes for this game
-            db.session.commit()
-            
-            # If the game is completed, update player stats
-            if game_data['status'] == 'completed':
-                self.update_player_game_stats(game_data, year)
-        
-        logger.info("Database update completed")
-    
-    def update_player_game_stats(self, game_data, year=TOURNAMENT_YEAR):
-        """Update player statistics for a specific game"""
-        logger.info(f"Updating player stats for game {game_data['game_id']}")
-        
-        # Get all players from both teams
-        team1_players = self.scrape_team_players(game_data['team1'], year)
-        team2_players = self.scrape_team_players(game_data['team2'], year)
-        
-        # Get the game from the database
-        game = TournamentGame.query.filter_by(game_id=game_data['game_id']).first()
-        if not game:
-            logger.error(f"Game {game_data['game_id']} not found in database")
-            return
-        
-        # Update stats for team 1 players
-        for player_data in team1_players:
-            self.update_player_stats_for_game(player_data, game_data['team1'], game, year)
+        writer.upsert_games(games)
         
-        # Update stats for team 2 players
-        for player_data in team2_players:
-            self.update_player_stats_for_game(player_data, game_data['team2'], game, year)
+        # Step 5: Update player stats for newly completed or changed games
+        self.update_player_game_stats(games, year, writer, progress=progress)
         
-        logger.info(f"Player stats updated for game {game_data['game_id']}")
+        self.report.add_batches(writer.batches)
+        logger.info(f"HTTP cache: {self.http_cache.stats()}")
+        logger.info("Database update completed")
+        return writer.batches
     
-    def update_player_stats_for_game(self, player_data, team_name, game, year=TOURNAMENT_YEAR):
-        """Update statistics for a specific player in a specific game"""
-        player_name = player_data['name']
-        
-        # Get player from database
-        player = Player.query.filter_by(
-            name=player_name,
-            school=team_name
-        ).first()
-        
-        if not player:
-            logger.error(f"Player {player_name} ({team_name}) not found in database")
-            return
-        
-        # Get player game stats
-        game_stats = self.scrape_player_game_stats(player_name, team_name, game.game_id, year)
-        
-        # Check if player stats for this game already exist
-        player_game_stats = PlayerTournamentStat.query.filter_by(
-            player_id=player.id,
-            game_id=game.id
-        ).first()
-        
-        if player_game_stats:
-            # Update existing stats
-            for key, value in game_stats.items():
-                setattr(player_game_stats, key, value)
-        else:
-            # Create new stats
-            player_game_stats = PlayerTournamentStat(
-                player_id=player.id,
-                game_id=game.id,
-                **game_stats
-            )
-            db.session.add(player_game_stats)
+    def update_player_game_stats(self, games, year=TOURNAMENT_YEAR, writer=None, force=False, progress=no_progress):
+        """Update player statistics, in one ingest batch, for the completed games that are new or changed
+        
+        Completed games whose scraped data matches what was last ingested are skipped
+        unless ``force`` is set. The stat lines of the games that are ingested are
+        always fetched, not served stale from the cache: once a game is stamped with
+        its fingerprint it is skipped, so a correction fetched later would never be
+        ingested. Games with a line that failed to fetch are not stamped, so the next
+        run retries them.
+        """
+        writer = writer or IngestWriter()
+        changed_games = writer.games_needing_stats(games, force=force)
+        logger.info(f"Game stats: {len(changed_games)} games to ingest, {writer.games_skipped} unchanged games skipped")
+        if not changed_games:
+            return None
         
-        # Commit changes
-        db.session.commit()
+        failed_games = set()
+        stat_lines = self.fetch_game_stats(changed_games, year, progress, force_refresh=True, failed_games=failed_games)
+        if failed_games:
+            logger.warning(f"Stats of games {sorted(failed_games)} failed to fetch; they will be retried next run")
+        stats = writer.upsert_player_game_stats(
+            stat_lines, [game_data for game_data in changed_games if game_data['game_id'] not in failed_games]
+        )
         
-        logger.info(f"Updated game stats for {player_name} (game {game.game_id})")
+        logger.info(f"Player stats updated for games {[game_data['game_id'] for game_data in changed_games]}")
+        return stats
 
 # Function to initialize scraper and update database
-def update_tournament_data():
+def update_tournament_data(progress=no_progress):
     scraper = MarchMadnessScraper()
-    scraper.update_database()
+    with recorded(scraper.report, 'update_data'):
+        return scraper.update_database(progress)
 
 # Function to update game scores and player statistics
-def update_game_scores():
+def update_game_scores(force=False, progress=no_progress):
     logger.info("Starting game scores update")
     scraper = MarchMadnessScraper()
+    progress = scraper.report.track(progress)
     
-    # Get all tournament games
-    games = scraper.scrape_tournament_games(TOURNAMENT_YEAR, force_refresh=True)
-    
-    # Update games and player stats
-    for game_data in games:
-        # Check if game is completed
-        if game_data['status'] == 'completed':
-            # Update player stats for this game
-            scraper.update_player_game_stats(game_data, TOURNAMENT_YEAR)
+    with recorded(scraper.report, 'update_game_scores'):
+        # Get all tournament games
+        progress('games')
+        games = scraper.scrape_tournament_games(TOURNAMENT_YEAR, force_refresh=True)
+        
+        # Update games and player stats
+        writer = IngestWriter()
+        writer.upsert_games(games)
+        scraper.update_player_game_stats(games, TOURNAMENT_YEAR, writer, force=force, progress=progress)
+        scraper.report.add_batches(writer.batches)
     
+    logger.info(f"HTTP cache: {scraper.http_cache.stats()}")
     logger.info("Game scores update completed")
+    return writer.batches
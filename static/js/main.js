@@ -44,9 +44,35 @@ let currentDrafterIndex = 0;
 let draftOrder = [];
 let draftType = 'snake';
 let draftDirection = 'forward';
+let draftStartPosition = 1; // The pick the current draft started at
 let pausedDraftState = null; // Store the draft state when paused
 let autodraftParticipants = {}; // Track which participants have autodraft enabled
 
+// Keep the draft position input in step with the server after a pick or a conflict
+function syncDraftPosition(nextPosition) {
+    const draftPositionInput = document.getElementById('draft-position');
+    if (draftPositionInput && nextPosition) {
+        draftPositionInput.value = nextPosition;
+    }
+}
+
+// Body of a draft pick request; while a draft runs, the server checks the participant is on the clock
+function draftPickBody(participantId, playerId, draftPosition) {
+    const body = {
+        participant_id: participantId,
+        player_id: playerId,
+        draft_position: draftPosition
+    };
+    if (isDraftModeActive && draftOrder.length > 0) {
+        body.draft_order = {
+            participant_ids: draftOrder.map(drafter => drafter.id),
+            type: draftType,
+            first_position: draftStartPosition
+        };
+    }
+    return JSON.stringify(body);
+}
+
 // Function to initialize draft buttons
 function initializeDraftButtons() {
     console.log('initializeDraftButtons called');
@@ -85,15 +111,12 @@ function initializeDraftButtons() {
                 headers: {
                     'Content-Type': 'application/json',
                 },
-                body: JSON.stringify({
-                    participant_id: participantId,
-                    player_id: playerId,
-                    draft_position: draftPosition
-                }),
+                body: draftPickBody(participantId, playerId, draftPosition),
             })
             .then(response => {
                 if (!response.ok) {
                     return response.json().then(err => {
+                        syncDraftPosition(err.expected_draft_position);
                         throw new Error(err.error || 'Failed to draft player');
                     });
                 }
@@ -109,9 +132,7 @@ function initializeDraftButtons() {
                     this.innerHTML = '<i class="fas fa-check me-1"></i> Drafted';
                     
                     // Increment draft position
-                    if (draftPositionInput) {
-                        draftPositionInput.value = parseInt(draftPositionInput.value) + 1;
-                    }
+                    syncDraftPosition(data.pick.draft_position + 1);
                     
                     // Show success message
                     showAlert(`${playerName} drafted by ${participantName}!`, 'success');
@@ -137,10 +158,7 @@ function initializeDraftButtons() {
                     }
                     
                     // Update draft board and reload players
-                    setTimeout(() => {
-                        updateDraftBoard();
-                        loadAvailablePlayers();
-                    }, 500);
+                    setTimeout(refreshDraftLists, 500);
                 }
             })
             .catch(error => {
@@ -151,6 +169,76 @@ function initializeDraftButtons() {
     });
 }
 
+// Badge color for a player's region
+function regionBadgeClass(region) {
+    if (region === 'West') {
+        return 'bg-danger';
+    } else if (region === 'East') {
+        return 'bg-success';
+    } else if (region === 'South') {
+        return 'bg-warning text-dark';
+    } else if (region === 'Midwest') {
+        return 'bg-primary';
+    }
+    return 'bg-info';
+}
+
+// Function to build the available players card for a player
+function renderPlayerCard(player, drafted) {
+    const playerCard = document.createElement('div');
+    playerCard.className = 'col';
+    playerCard.dataset.playerId = player.id;
+    
+    playerCard.innerHTML = `
+        <div class="card h-100 player-card ${drafted ? 'drafted' : ''}">
+            <div class="card-body">
+                <h5 class="card-title player-name">${player.name}</h5>
+                <h6 class="card-subtitle mb-2 text-muted">
+                    <span class="player-seed">${player.school_seed}</span>
+                    <span class="player-school">${player.school}</span>
+                    <span class="ms-2 badge ${regionBadgeClass(player.region)}">${player.region}</span>
+                </h6>
+                <p class="card-text">
+                    <span class="badge bg-light text-dark">${player.position || 'N/A'}</span>
+                    <span class="ms-2">${player.year || 'N/A'}</span>
+                </p>
+                <div class="player-stats">
+                    <div class="row text-center">
+                        <div class="col">
+                            <div class="stat-value">${player.ppg || '0.0'}</div>
+                            <div class="stat-label">PPG</div>
+                        </div>
+                        <div class="col">
+                            <div class="stat-value">${player.rpg || '0.0'}</div>
+                            <div class="stat-label">RPG</div>
+                        </div>
+                        <div class="col">
+                            <div class="stat-value">${player.apg || '0.0'}</div>
+                            <div class="stat-label">APG</div>
+                        </div>
+                    </div>
+                </div>
+                ${!drafted ? `
+                <div class="mt-3">
+                    <button class="btn btn-sm btn-primary w-100 draft-player-btn" 
+                            data-player-id="${player.id}" 
+                            data-player-name="${player.name}">
+                        <i class="fas fa-plus-circle me-1"></i> Draft Player
+                    </button>
+                </div>
+                ` : `
+                <div class="mt-3">
+                    <button class="btn btn-sm btn-secondary w-100" disabled>
+                        <i class="fas fa-check me-1"></i> Drafted
+                    </button>
+                </div>
+                `}
+            </div>
+        </div>
+    `;
+    return playerCard;
+}
+
 // Function to load available players
 function loadAvailablePlayers() {
     console.log('loadAvailablePlayers called');
@@ -191,9 +279,14 @@ function loadAvailablePlayers() {
     `;
     console.log('Loading indicator displayed');
     
-    // Fetch players from the server
-    console.log('Fetching from /api/available_players');
-    fetch('/api/available_players')
+    // Get the selected filter value
+    const filterValue = availableStatusFilter ? availableStatusFilter.value : 'undrafted';
+    console.log('Filter value:', filterValue);
+    
+    // Fetch players from the server, asking only for the list we are going to show
+    const query = filterValue === 'all' ? '' : `?status=${filterValue}`;
+    console.log('Fetching from /api/available_players' + query);
+    fetch('/api/available_players' + query)
         .then(response => {
             console.log('Response received:', response);
             if (!response.ok) {
@@ -203,9 +296,6 @@ function loadAvailablePlayers() {
         })
         .then(data => {
             console.log('Data received:', data);
-            // Get the selected filter value
-            const filterValue = availableStatusFilter ? availableStatusFilter.value : 'undrafted';
-            console.log('Filter value:', filterValue);
             
             // Get the appropriate players based on the filter
             let players = [];
@@ -223,79 +313,18 @@ function loadAvailablePlayers() {
             
             if (players.length === 0) {
                 availablePlayersContainer.innerHTML = `
-                    <div class="col-12 text-center py-4">
+                    <div class="col-12 text-center py-4 no-players-found">
                         <p class="text-muted">No players found.</p>
                     </div>
                 `;
                 return;
             }
             
-            // Add each player to the container
+            // Add each player to the container ('all' lists drafted players too)
+            const draftedIds = new Set(filterValue === 'all' ? data.drafted.map(player => player.id) : []);
             players.forEach(player => {
-                const playerCard = document.createElement('div');
-                playerCard.className = 'col';
-                
-                // Determine region badge color
-                let regionBadgeClass = 'bg-info';
-                if (player.region === 'West') {
-                    regionBadgeClass = 'bg-danger';
-                } else if (player.region === 'East') {
-                    regionBadgeClass = 'bg-success';
-                } else if (player.region === 'South') {
-                    regionBadgeClass = 'bg-warning text-dark';
-                } else if (player.region === 'Midwest') {
-                    regionBadgeClass = 'bg-primary';
-                }
-                
-                playerCard.innerHTML = `
-                    <div class="card h-100 player-card ${filterValue === 'drafted' ? 'drafted' : ''}">
-                        <div class="card-body">
-                            <h5 class="card-title player-name">${player.name}</h5>
-                            <h6 class="card-subtitle mb-2 text-muted">
-                                <span class="player-seed">${player.school_seed}</span>
-                                <span class="player-school">${player.school}</span>
-                                <span class="ms-2 badge ${regionBadgeClass}">${player.region}</span>
-                            </h6>
-                            <p class="card-text">
-                                <span class="badge bg-light text-dark">${player.position || 'N/A'}</span>
-                                <span class="ms-2">${player.year || 'N/A'}</span>
-                            </p>
-                            <div class="player-stats">
-                                <div class="row text-center">
-                                    <div class="col">
-                                        <div class="stat-value">${player.ppg || '0.0'}</div>
-                                        <div class="stat-label">PPG</div>
-                                    </div>
-                                    <div class="col">
-                                        <div class="stat-value">${player.rpg || '0.0'}</div>
-                                        <div class="stat-label">RPG</div>
-                                    </div>
-                                    <div class="col">
-                                        <div class="stat-value">${player.apg || '0.0'}</div>
-                                        <div class="stat-label">APG</div>
-                                    </div>
-                                </div>
-                            </div>
-                            ${filterValue !== 'drafted' ? `
-                            <div class="mt-3">
-                                <button class="btn btn-sm btn-primary w-100 draft-player-btn" 
-                                        data-player-id="${player.id}" 
-                                        data-player-name="${player.name}">
-                                    <i class="fas fa-plus-circle me-1"></i> Draft Player
-                                </button>
-                            </div>
-                            ` : `
-                            <div class="mt-3">
-                                <button class="btn btn-sm btn-secondary w-100" disabled>
-                                    <i class="fas fa-check me-1"></i> Drafted
-                                </button>
-                            </div>
-                            `}
-                        </div>
-                    </div>
-                `;
-                
-                availablePlayersContainer.appendChild(playerCard);
+                const drafted = filterValue === 'drafted' || draftedIds.has(player.id);
+                availablePlayersContainer.appendChild(renderPlayerCard(player, drafted));
             });
             
             console.log('Players added to container:', players.length);
@@ -340,6 +369,9 @@ document.addEventListener('DOMContentLoaded', function() {
     
     // Initialize draft functionality
     initDraftFunctionality();
+    
+    // Patch the draft page and leaderboard from the live update stream
+    initLiveUpdates();
 });
 
 // Function to initialize sortable tables
@@ -519,15 +551,12 @@ function initDraftFunctionality() {
                 headers: {
                     'Content-Type': 'application/json',
                 },
-                body: JSON.stringify({
-                    participant_id: participantId,
-                    player_id: playerId,
-                    draft_position: draftPosition
-                }),
+                body: draftPickBody(participantId, playerId, draftPosition),
             })
             .then(response => {
                 if (!response.ok) {
                     return response.json().then(err => {
+                        syncDraftPosition(err.expected_draft_position);
                         throw new Error(err.error || 'Failed to draft player');
                     });
                 }
@@ -543,9 +572,7 @@ function initDraftFunctionality() {
                     this.innerHTML = '<i class="fas fa-check me-1"></i> Drafted';
                     
                     // Increment draft position
-                    if (draftPositionInput) {
-                        draftPositionInput.value = parseInt(draftPositionInput.value) + 1;
-                    }
+                    syncDraftPosition(data.pick.draft_position + 1);
                     
                     // Show success message
                     showAlert(`${playerName} drafted by ${participantName}!`, 'success');
@@ -571,10 +598,7 @@ function initDraftFunctionality() {
                     }
                     
                     // Update draft board and reload players
-                    setTimeout(() => {
-                        updateDraftBoard();
-                        loadAvailablePlayers();
-                    }, 500);
+                    setTimeout(refreshDraftLists, 500);
                 }
             })
             .catch(error => {
@@ -768,6 +792,8 @@ function initStartDraftButton() {
         currentDraftRound = 1;
         currentDrafterIndex = 0;
         draftDirection = 'forward';
+        const draftPositionInput = document.getElementById('draft-position');
+        draftStartPosition = (draftPositionInput && parseInt(draftPositionInput.value, 10)) || 1;
         
         // Save draft state to localStorage
         saveDraftStateToStorage();
@@ -819,6 +845,7 @@ function initStartDraftButton() {
                     draftOrder,
                     draftType,
                     draftDirection,
+                    draftStartPosition,
                     autodraftParticipants
                 };
                 localStorage.setItem('pausedDraftState', JSON.stringify(pausedDraftState));
@@ -866,6 +893,7 @@ function initStartDraftButton() {
                 draftOrder = pausedDraftState.draftOrder;
                 draftType = pausedDraftState.draftType;
                 draftDirection = pausedDraftState.draftDirection;
+                draftStartPosition = pausedDraftState.draftStartPosition || 1;
                 autodraftParticipants = pausedDraftState.autodraftParticipants || {};
                 
                 // Save the restored state
@@ -1052,7 +1080,7 @@ function autodraftPlayer(participantId, participantName) {
     console.log('Autodrafting for participant:', participantName);
     
     // Fetch available players
-    fetch('/api/available_players')
+    fetch('/api/available_players?status=undrafted&fields=id,name,ppg')
         .then(response => {
             if (!response.ok) {
                 throw new Error('Failed to fetch players');
@@ -1090,15 +1118,12 @@ function autodraftPlayer(participantId, participantName) {
                 headers: {
                     'Content-Type': 'application/json',
                 },
-                body: JSON.stringify({
-                    participant_id: participantId,
-                    player_id: topPlayer.id,
-                    draft_position: draftPosition
-                }),
+                body: draftPickBody(participantId, topPlayer.id, draftPosition),
             })
             .then(response => {
                 if (!response.ok) {
                     return response.json().then(err => {
+                        syncDraftPosition(err.expected_draft_position);
                         throw new Error(err.error || 'Failed to autodraft player');
                     });
                 }
@@ -1109,9 +1134,7 @@ function autodraftPlayer(participantId, participantName) {
                     showAlert(`Autodraft Error: ${data.error}`, 'danger');
                 } else {
                     // Increment draft position
-                    if (draftPositionInput) {
-                        draftPositionInput.value = parseInt(draftPositionInput.value) + 1;
-                    }
+                    syncDraftPosition(data.pick.draft_position + 1);
                     
                     // Show success message
                     showAlert(`AUTODRAFT: ${topPlayer.name} (${topPlayer.ppg} PPG) drafted by ${participantName}!`, 'success');
@@ -1128,8 +1151,7 @@ function autodraftPlayer(participantId, participantName) {
                     
                     // Update draft board and reload players
                     setTimeout(() => {
-                        updateDraftBoard();
-                        loadAvailablePlayers();
+                        refreshDraftLists();
                         
                         // Advance to next drafter
                         setTimeout(() => {
@@ -1186,8 +1208,7 @@ function initializeRemoveDraftButtons() {
                     showAlert(`${playerName} removed from draft!`, 'success');
                     
                     // Update draft board and reload available players
-                    updateDraftBoard();
-                    loadAvailablePlayers();
+                    refreshDraftLists();
                 })
                 .catch(error => {
                     console.error('Error:', error);
@@ -1198,6 +1219,82 @@ function initializeRemoveDraftButtons() {
     });
 }
 
+// Function to build the draft table row for a pick (as returned by /api/draft_picks)
+function renderDraftPickRow(pick) {
+    const row = document.createElement('tr');
+    row.className = 'draft-pick';
+    row.dataset.pickId = pick.id;
+    row.dataset.draftPosition = pick.draft_position;
+    
+    const player = pick.player || {};
+    row.innerHTML = `
+        <td>${pick.draft_position}</td>
+        <td>${pick.participant_name}</td>
+        <td>${pick.player_name}</td>
+        <td>
+            <span class="player-seed">${player.school_seed || ''}</span>
+            ${pick.player_school}
+            ${player.region ? `<span class="ms-2 badge ${regionBadgeClass(player.region)}">${player.region}</span>` : ''}
+        </td>
+        <td>${pick.player_ppg} PPG</td>
+        <td>
+            <button class="btn btn-sm btn-danger remove-draft-btn" 
+                    data-pick-id="${pick.id}" 
+                    data-player-name="${pick.player_name}">
+                <i class="fas fa-trash"></i>
+            </button>
+        </td>
+    `;
+    return row;
+}
+
+// Function to build an (empty) draft board column for a participant
+function renderDraftBoardColumn(participantId, participantName) {
+    const column = document.createElement('div');
+    column.className = 'col-md-3 mb-4';
+    column.dataset.participantId = participantId;
+    
+    const card = document.createElement('div');
+    card.className = 'card h-100';
+    
+    const cardHeader = document.createElement('div');
+    cardHeader.className = 'card-header';
+    cardHeader.textContent = participantName;
+    
+    const cardBody = document.createElement('div');
+    cardBody.className = 'card-body';
+    
+    const playerList = document.createElement('ul');
+    playerList.className = 'list-group';
+    
+    cardBody.appendChild(playerList);
+    card.appendChild(cardHeader);
+    card.appendChild(cardBody);
+    column.appendChild(card);
+    return column;
+}
+
+// Function to build the draft board entry for a pick
+function renderDraftBoardItem(pick) {
+    const listItem = document.createElement('li');
+    listItem.className = 'list-group-item';
+    listItem.dataset.pickId = pick.id;
+    listItem.dataset.draftPosition = pick.draft_position;
+    listItem.innerHTML = `
+        <div class="d-flex justify-content-between align-items-center">
+            <div>
+                <span class="draft-pick-number">#${pick.draft_position}</span>
+                <span class="ms-2">${pick.player_name}</span>
+            </div>
+            <span class="badge bg-primary">${pick.player_school}</span>
+        </div>
+        <div class="player-stats mt-1">
+            ${pick.player_ppg} PPG | ${pick.player_rpg} RPG | ${pick.player_apg} APG
+        </div>
+    `;
+    return listItem;
+}
+
 // Function to update the draft board
 function updateDraftBoard() {
     const draftBoard = document.getElementById('draft-board');
@@ -1230,33 +1327,12 @@ function updateDraftBoard() {
                 
                 // Add each pick to the table
                 sortedPicks.forEach(pick => {
-                    const row = document.createElement('tr');
-                    row.className = 'draft-pick';
-                    row.dataset.pickId = pick.id;
-                    
-                    row.innerHTML = `
-                        <td>${pick.draft_position}</td>
-                        <td>${pick.participant_name}</td>
-                        <td>${pick.player_name}</td>
-                        <td>
-                            <span class="player-seed">${pick.player_school.split(' ')[0]}</span>
-                            ${pick.player_school.split(' ').slice(1).join(' ')}
-                        </td>
-                        <td>${pick.player_ppg} PPG</td>
-                        <td>
-                            <button class="btn btn-sm btn-danger remove-draft-btn" 
-                                    data-pick-id="${pick.id}" 
-                                    data-player-name="${pick.player_name}">
-                                <i class="fas fa-trash"></i>
-                            </button>
-                        </td>
-                    `;
-                    
-                    draftTable.appendChild(row);
+                    draftTable.appendChild(renderDraftPickRow(pick));
                 });
                 
                 // Reinitialize remove draft buttons
                 initializeRemoveDraftButtons();
+                toggleDraftTable();
             }
             
             // Group picks by participant
@@ -1273,44 +1349,12 @@ function updateDraftBoard() {
                 const picks = picksByParticipant[participantId];
                 const participantName = picks[0].participant_name;
                 
-                const column = document.createElement('div');
-                column.className = 'col-md-3 mb-4';
-                
-                const card = document.createElement('div');
-                card.className = 'card h-100';
-                
-                const cardHeader = document.createElement('div');
-                cardHeader.className = 'card-header';
-                cardHeader.textContent = participantName;
-                
-                const cardBody = document.createElement('div');
-                cardBody.className = 'card-body';
-                
-                const playerList = document.createElement('ul');
-                playerList.className = 'list-group';
-                
+                const column = renderDraftBoardColumn(participantId, participantName);
+                const playerList = column.querySelector('.list-group');
                 picks.forEach(pick => {
-                    const listItem = document.createElement('li');
-                    listItem.className = 'list-group-item';
-                    listItem.innerHTML = `
-                        <div class="d-flex justify-content-between align-items-center">
-                            <div>
-                                <span class="draft-pick-number">#${pick.draft_position}</span>
-                                <span class="ms-2">${pick.player_name}</span>
-                            </div>
-                            <span class="badge bg-primary">${pick.player_school}</span>
-                        </div>
-                        <div class="player-stats mt-1">
-                            ${pick.player_ppg} PPG | ${pick.player_rpg} RPG | ${pick.player_apg} APG
-                        </div>
-                    `;
-                    playerList.appendChild(listItem);
+                    playerList.appendChild(renderDraftBoardItem(pick));
                 });
                 
-                cardBody.appendChild(playerList);
-                card.appendChild(cardHeader);
-                card.appendChild(cardBody);
-                column.appendChild(card);
                 draftBoard.appendChild(column);
             }
         })
@@ -1435,6 +1479,7 @@ function saveDraftStateToStorage() {
             draftOrder,
             draftType,
             draftDirection,
+            draftStartPosition,
             autodraftParticipants
         };
         localStorage.setItem('draftState', JSON.stringify(draftState));
@@ -1459,6 +1504,7 @@ function loadDraftStateFromStorage() {
             draftOrder = draftState.draftOrder;
             draftType = draftState.draftType;
             draftDirection = draftState.draftDirection;
+            draftStartPosition = draftState.draftStartPosition || 1;
             autodraftParticipants = draftState.autodraftParticipants || {};
             
             // If draft is active, update UI
@@ -1527,36 +1573,249 @@ function clearDraftStateFromStorage() {
     console.log('Cleared draft state from localStorage');
 }
 
-// Function to manually trigger data update
-function updateData() {
-    const updateButton = document.getElementById('update-data-btn');
-    if (updateButton) {
-        updateButton.disabled = true;
-        updateButton.innerHTML = '<span class="spinner-border spinner-border-sm" role="status" aria-hidden="true"></span> Updating...';
+// Poll a queued scrape job (see /api/jobs/<id>) until it finishes. Resolves with
+// the finished job; onProgress is called with the job after every poll
+function waitForJob(jobId, onProgress, intervalMs = 1000) {
+    return new Promise((resolve, reject) => {
+        function poll() {
+            fetch(`/api/jobs/${jobId}`, {cache: 'no-store'})
+                .then(response => response.json())
+                .then(job => {
+                    if (job.error && !job.status) {
+                        reject(new Error(job.error));
+                        return;
+                    }
+                    if (onProgress) onProgress(job);
+                    if (job.status === 'succeeded' || job.status === 'failed') {
+                        resolve(job);
+                    } else {
+                        setTimeout(poll, intervalMs);
+                    }
+                })
+                .catch(reject);
+        }
+        poll();
+    });
+}
+
+// Short description of a running job for its button, e.g. "Box scores 40/120"
+function describeJobProgress(job) {
+    if (job.status === 'queued') return 'Queued...';
+    if (!job.stage) return 'Starting...';
+    const stage = job.stage.replace(/_/g, ' ');
+    return job.total ? `Updating ${stage} ${job.done}/${job.total}...` : `Updating ${stage}...`;
+}
+
+// Queue a scrape job with a POST to url and show its progress on button until it
+// finishes; reloads the page once it succeeded
+function runQueuedUpdate(url, button, successMessage) {
+    const spinner = '<span class="spinner-border spinner-border-sm me-2" role="status" aria-hidden="true"></span>';
+    const idleHtml = button ? button.innerHTML : '';
+    if (button) {
+        button.disabled = true;
+        button.innerHTML = `${spinner} Queuing...`;
     }
     
-    fetch('/api/update_data', {
-        method: 'POST',
-    })
+    fetch(url, {method: 'POST'})
     .then(response => response.json())
     .then(data => {
-        if (data.error) {
-            showAlert(`Error: ${data.error}`, 'danger');
+        if (!data.job_id) throw new Error(data.error || 'The update could not be queued.');
+        if (!data.worker_running) {
+            showAlert('Update queued. It will run once the scraper worker is started.', 'warning');
+        }
+        return waitForJob(data.job_id, job => {
+            if (button) button.innerHTML = `${spinner} ${describeJobProgress(job)}`;
+        });
+    })
+    .then(job => {
+        if (job.status === 'succeeded') {
+            showAlert(`${successMessage} Refreshing page...`, 'success');
+            setTimeout(() => window.location.reload(), 1500);
         } else {
-            showAlert('Data updated successfully! Refreshing page...', 'success');
-            setTimeout(() => {
-                window.location.reload();
-            }, 2000);
+            showAlert(`Error: ${job.error || 'The update failed.'}`, 'danger');
         }
     })
     .catch(error => {
         console.error('Error:', error);
-        showAlert('An error occurred while updating data.', 'danger');
+        showAlert(`Error: ${error.message || 'An error occurred while updating data.'}`, 'danger');
     })
     .finally(() => {
-        if (updateButton) {
-            updateButton.disabled = false;
-            updateButton.innerHTML = 'Update Data';
+        if (button) {
+            button.disabled = false;
+            button.innerHTML = idleHtml;
         }
     });
 }
+
+// Function to manually trigger data update
+function updateData() {
+    runQueuedUpdate('/api/update_data', document.getElementById('update-data-btn'), 'Data updated successfully!');
+}
+
+// Live updates: /api/stream pushes pick and score events, which are applied to
+// the page in place instead of reloading the lists
+let liveUpdatesConnected = false;
+
+function initLiveUpdates() {
+    const hasDraftLists = document.getElementById('draft-board') || document.getElementById('available-players-container');
+    const hasLeaderboard = document.querySelector('.leaderboard');
+    if (!(hasDraftLists || hasLeaderboard) || !window.EventSource) return;
+    
+    // EventSource reconnects by itself and resumes from the last event it received
+    const source = new EventSource('/api/stream');
+    source.addEventListener('ready', () => {
+        liveUpdatesConnected = true;
+    });
+    source.addEventListener('error', () => {
+        liveUpdatesConnected = false;
+    });
+    source.addEventListener('pick_added', event => applyPickAdded(JSON.parse(event.data)));
+    source.addEventListener('pick_removed', event => applyPickRemoved(JSON.parse(event.data)));
+    source.addEventListener('score_changed', event => applyScoreChanges(JSON.parse(event.data).scores));
+    ['picks_reset', 'scores_rebuilt', 'resync'].forEach(kind => {
+        source.addEventListener(kind, resyncLiveState);
+    });
+}
+
+// Reload the lists after a local change, unless the live stream will patch them
+function refreshDraftLists() {
+    if (liveUpdatesConnected) return;
+    updateDraftBoard();
+    loadAvailablePlayers();
+}
+
+// Changes the stream cannot describe piece by piece: reload everything
+function resyncLiveState() {
+    if (document.querySelector('.leaderboard')) {
+        window.location.reload();
+        return;
+    }
+    updateDraftBoard();
+    loadAvailablePlayers();
+}
+
+// Insert an element among its siblings ordered by data-draft-position
+function insertByDraftPosition(parent, element) {
+    const position = parseInt(element.dataset.draftPosition);
+    const next = Array.from(parent.children).find(child =>
+        child.dataset.draftPosition && parseInt(child.dataset.draftPosition) > position);
+    parent.insertBefore(element, next || null);
+}
+
+// Show the draft table or the "no picks" message depending on whether there are picks
+function toggleDraftTable() {
+    const table = document.getElementById('draft-picks-table');
+    const body = document.getElementById('draft-picks-body');
+    const emptyMessage = document.getElementById('no-draft-picks');
+    if (!table || !body) return;
+    const hasPicks = body.children.length > 0;
+    table.style.display = hasPicks ? '' : 'none';
+    if (emptyMessage) {
+        emptyMessage.style.display = hasPicks ? 'none' : '';
+    }
+}
+
+// Add, replace or remove a player's available players card after their draft status changed
+function patchAvailablePlayer(player, drafted) {
+    const container = document.getElementById('available-players-container');
+    const filter = document.getElementById('available-status-filter');
+    if (!container || !filter || !player) return;
+    
+    const existing = container.querySelector(`[data-player-id="${player.id}"]`);
+    const belongs = filter.value === 'all' || (filter.value === 'drafted') === drafted;
+    if (!belongs) {
+        if (existing) existing.remove();
+    } else {
+        const card = renderPlayerCard(player, drafted);
+        if (existing) {
+            container.replaceChild(card, existing);
+        } else {
+            // Same order as /api/available_players: by player id
+            const next = Array.from(container.querySelectorAll('[data-player-id]'))
+                .find(other => parseInt(other.dataset.playerId) > player.id);
+            container.insertBefore(card, next || null);
+        }
+        initializeDraftButtons();
+    }
+    
+    // Keep the "No players found." message in step with the cards
+    const hasCards = container.querySelector('[data-player-id]') !== null;
+    const emptyMessage = container.querySelector('.no-players-found');
+    if (hasCards && emptyMessage) {
+        emptyMessage.remove();
+    } else if (!hasCards && !emptyMessage) {
+        container.insertAdjacentHTML('beforeend', `
+            <div class="col-12 text-center py-4 no-players-found">
+                <p class="text-muted">No players found.</p>
+            </div>
+        `);
+    }
+}
+
+function applyPickAdded(pick) {
+    syncDraftPosition(pick.next_draft_position);
+    
+    const tableBody = document.getElementById('draft-picks-body');
+    if (tableBody && !tableBody.querySelector(`[data-pick-id="${pick.id}"]`)) {
+        insertByDraftPosition(tableBody, renderDraftPickRow(pick));
+        initializeRemoveDraftButtons();
+        toggleDraftTable();
+    }
+    
+    const draftBoard = document.getElementById('draft-board');
+    if (draftBoard && !draftBoard.querySelector(`li[data-pick-id="${pick.id}"]`)) {
+        let column = draftBoard.querySelector(`[data-participant-id="${pick.participant_id}"]`);
+        if (!column) {
+            column = renderDraftBoardColumn(pick.participant_id, pick.participant_name);
+            draftBoard.appendChild(column);
+        }
+        const playerList = column.querySelector('.list-group');
+        const placeholder = playerList.querySelector('.no-picks');
+        if (placeholder) placeholder.remove();
+        insertByDraftPosition(playerList, renderDraftBoardItem(pick));
+    }
+    
+    patchAvailablePlayer(pick.player, true);
+}
+
+function applyPickRemoved(pick) {
+    syncDraftPosition(pick.next_draft_position);
+    
+    document.querySelectorAll(`.draft-pick[data-pick-id="${pick.id}"], #draft-board li[data-pick-id="${pick.id}"]`)
+        .forEach(element => {
+            const playerList = element.closest('#draft-board .list-group');
+            element.remove();
+            if (playerList && !playerList.querySelector('[data-pick-id]')) {
+                playerList.innerHTML = `
+                    <li class="list-group-item text-center text-muted no-picks">
+                        No players drafted
+                    </li>
+                `;
+            }
+        });
+    toggleDraftTable();
+    
+    patchAvailablePlayer(pick.player, false);
+}
+
+function applyScoreChanges(scores) {
+    const leaderboard = document.querySelector('.leaderboard');
+    if (!leaderboard) return;
+    
+    scores.forEach(score => {
+        const item = leaderboard.querySelector(`[data-participant-id="${score.participant_id}"]`);
+        if (!item) return;
+        item.querySelector('.score-value').textContent = score.total_points;
+        item.querySelector('.pick-count').textContent = score.pick_count;
+    });
+    
+    // Re-rank: highest score first, ties in their current order
+    const items = Array.from(leaderboard.querySelectorAll('.leaderboard-item'));
+    items.sort((a, b) => parseInt(b.querySelector('.score-value').textContent) - parseInt(a.querySelector('.score-value').textContent));
+    items.forEach((item, index) => {
+        item.querySelector('.leaderboard-rank').textContent = index + 1;
+        item.classList.toggle('bg-warning', index === 0);
+        item.classList.toggle('bg-opacity-25', index === 0);
+        leaderboard.appendChild(item);
+    });
+}
@@ -0,0 +1,24 @@
+from ingest import IngestWriter
+from models import TournamentGame
+
+GAME = {'game_id': 401, 'round': 1, 'game_date': '2025-03-20', 'team1': 'Team 0', 'team2': 'Team 1',
+        'team1_score': 70, 'team2_score': 65, 'status': 'completed'}
+
+def ingest_points(points):
+    writer = IngestWriter()
+    writer.upsert_games([GAME])
+    writer.upsert_player_game_stats([{'name': 'Player 0', 'school': 'Team 0', 'game_id': GAME['game_id'],
+                                      'points': points, 'rebounds': 4}], [GAME])
+
+def test_stat_line_correction_replaces_a_cached_final_box_score(client, draft):
+    ingest_points(20)
+    game_id = TournamentGame.query.filter_by(game_id=GAME['game_id']).one().id
+    first = client.get(f'/api/game_stats/{game_id}')
+    assert first.get_json()['team1_players'][0]['points'] == 20
+
+    # Same final score, so the same fingerprint: only the stat line changes
+    ingest_points(24)
+    second = client.get(f'/api/game_stats/{game_id}', headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 200
+    assert second.get_json()['team1_players'][0]['points'] == 24
+    assert second.headers['ETag'] != first.headers['ETag']
@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import initial_load
+from models import InitialLoad, Job
+
+@pytest.fixture
+def empty_database(db, monkeypatch):
+    """An empty database with ``INITIAL_LOAD`` on; removes the load and its jobs afterwards"""
+    monkeypatch.setattr(initial_load, 'INITIAL_LOAD', True)
+    yield db
+    db.session.rollback()
+    Job.query.delete()
+    InitialLoad.query.delete()
+    db.session.commit()
+
+def finish(job, status, seconds_ago=0):
+    job.status, job.finished_at = status, datetime.utcnow() - timedelta(seconds=seconds_ago)
+    if status == 'failed':
+        job.error = 'ESPN unreachable'
+
+def test_start_queues_the_load_for_the_worker(client, empty_database):
+    assert initial_load.start()
+    job = Job.query.one()
+    assert job.kind == 'update_data' and job.status == 'queued'
+    # A second web worker starting does not queue another
+    assert initial_load.start()
+    assert Job.query.count() == 1
+
+    job.status, job.stage, job.done, job.total = 'running', 'rosters', 3, 68
+    empty_database.session.commit()
+    response = client.get('/readyz')
+    assert response.status_code == 503
+    body = response.get_json()
+    assert (body['status'], body['stage'], body['done'], body['total']) == ('running', 'rosters', 3, 68)
+    assert body['job_id'] == job.id
+
+def test_failed_load_is_retried_then_ready(client, empty_database):
+    initial_load.start()
+    job = Job.query.one()
+    finish(job, 'failed')
+    empty_database.session.commit()
+    assert client.get('/readyz').get_json()['error'] == 'ESPN unreachable'
+
+    # Not retried before INITIAL_LOAD_RETRY_SECONDS have passed
+    initial_load.supervise()
+    assert Job.query.count() == 1
+    finish(job, 'failed', initial_load.INITIAL_LOAD_RETRY_SECONDS)
+    empty_database.session.commit()
+    initial_load.supervise()
+    retry = Job.query.filter_by(status='queued').one()
+
+    finish(retry, 'succeeded')
+    empty_database.session.commit()
+    initial_load.supervise()
+    response = client.get('/readyz')
+    assert response.status_code == 200
+    assert response.get_json()['ready']
@@ -0,0 +1,40 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+
+import metrics
+
+def write_worker_file(directory, pid, requests):
+    path = os.path.join(directory, f'{socket.gethostname()}-{pid}-0123abcd.json')
+    with open(path, 'w') as f:
+        json.dump({'requests': [['GET', '/players', 200, requests]],
+                   'histograms': [['http_request_sql_statements', 'GET', '/players', [requests] + [0] * 10, 0]]}, f)
+    return path
+
+def exited_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+def test_exited_workers_are_folded_without_changing_the_totals(tmp_path):
+    directory = str(tmp_path)
+    running = write_worker_file(directory, os.getpid(), 5)
+    for requests in (1, 2):
+        write_worker_file(directory, exited_pid(), requests)
+    requests_total, _ = metrics._merge(directory)
+    assert requests_total == {('GET', '/players', 200): 8}
+
+    assert metrics.fold_exited(directory) == 2
+    assert sorted(name for name in os.listdir(directory) if name.endswith('.json')) == sorted(
+        [os.path.basename(running), metrics.EXITED_FILE])
+    requests_total, histograms = metrics._merge(directory)
+    assert requests_total == {('GET', '/players', 200): 8}
+    assert histograms[('http_request_sql_statements', 'GET', '/players')][0][0] == 8
+
+    # Another worker exits later; its totals join the earlier ones
+    write_worker_file(directory, exited_pid(), 4)
+    assert metrics.fold_exited(directory) == 1
+    assert metrics._merge(directory)[0] == {('GET', '/players', 200): 12}
+    assert metrics.fold_exited(directory) == 0
@@ -0,0 +1,142 @@
+import threading
+
+from models import DraftPick, Participant, Player
+from picks import make_pick
+from query_guard import watch
+
+def pick(client, participant_id, player_id, draft_position=None, draft_order=None):
+    payload = {'participant_id': participant_id, 'player_id': player_id}
+    if draft_position is not None:
+        payload['draft_position'] = draft_position
+    if draft_order is not None:
+        payload['draft_order'] = draft_order
+    return client.post('/api/draft_pick', json=payload)
+
+def test_pick_takes_the_next_slot(client, draft):
+    response = pick(client, draft['participants'][0], draft['players'][0])
+    assert response.status_code == 200
+    assert response.get_json()['pick']['draft_position'] == 1
+
+    response = pick(client, draft['participants'][1], draft['players'][1], draft_position=2)
+    assert response.status_code == 200
+    assert response.get_json()['pick']['draft_position'] == 2
+
+def test_duplicate_player_is_a_conflict(client, draft):
+    first, second = draft['participants']
+    assert pick(client, first, draft['players'][0]).status_code == 200
+
+    response = pick(client, second, draft['players'][0])
+    assert response.status_code == 409
+    body = response.get_json()
+    assert body['conflict'] == 'player_taken'
+    assert body['drafted_by'] == {'participant_id': first, 'participant_name': 'Participant 0', 'draft_position': 1}
+    assert DraftPick.query.count() == 1
+
+def test_taken_slot_is_a_conflict(client, draft):
+    first, second = draft['participants']
+    assert pick(client, first, draft['players'][0], draft_position=1).status_code == 200
+
+    response = pick(client, second, draft['players'][1], draft_position=1)
+    assert response.status_code == 409
+    body = response.get_json()
+    assert body['conflict'] == 'out_of_turn'
+    assert body['expected_draft_position'] == 2
+    assert DraftPick.query.count() == 1
+
+def test_slot_ahead_of_the_clock_is_a_conflict(client, draft):
+    response = pick(client, draft['participants'][0], draft['players'][0], draft_position=3)
+    assert response.status_code == 409
+    assert response.get_json()['conflict'] == 'out_of_turn'
+    assert response.get_json()['expected_draft_position'] == 1
+    assert DraftPick.query.count() == 0
+
+def test_unknown_player_is_not_found(client, draft):
+    response = pick(client, draft['participants'][0], 999999)
+    assert response.status_code == 404
+    assert response.get_json()['conflict'] == 'not_found'
+
+def test_draft_order_is_enforced_in_snake_order(client, draft):
+    first, second = draft['participants']
+    order = {'participant_ids': [first, second], 'type': 'snake', 'first_position': 1}
+
+    response = pick(client, second, draft['players'][0], draft_order=order)
+    assert response.status_code == 409
+    body = response.get_json()
+    assert body['conflict'] == 'wrong_participant'
+    assert body['on_the_clock'] == {'participant_id': first, 'participant_name': 'Participant 0'}
+    assert body['expected_draft_position'] == 1
+    assert DraftPick.query.count() == 0
+
+    # 1, 2 forwards, then 3, 4 backwards
+    for player_id, participant_id in zip(draft['players'], (first, second, second, first)):
+        assert pick(client, participant_id, player_id, draft_order=order).status_code == 200
+    assert [(p.draft_position, p.participant_id) for p in DraftPick.query.order_by(DraftPick.draft_position)] == [
+        (1, first), (2, second), (3, second), (4, first)]
+
+def test_standard_draft_order_from_a_later_start(client, draft):
+    first, second = draft['participants']
+    assert pick(client, second, draft['players'][0]).status_code == 200
+    order = {'participant_ids': [first, second], 'type': 'standard', 'first_position': 2}
+    assert pick(client, first, draft['players'][1], draft_order=order).status_code == 200
+    assert pick(client, first, draft['players'][2], draft_order=order).get_json()['conflict'] == 'wrong_participant'
+    assert pick(client, second, draft['players'][2], draft_order=order).status_code == 200
+    assert pick(client, first, draft['players'][3], 4, draft_order=order).status_code == 200
+
+def test_bad_draft_order_is_rejected(client, draft):
+    response = pick(client, draft['participants'][0], draft['players'][0], draft_order={'type': 'snake'})
+    assert response.status_code == 400
+
+def race(app, payloads):
+    """POST every payload at once from its own thread; returns the status codes"""
+    barrier = threading.Barrier(len(payloads))
+    statuses = [None] * len(payloads)
+
+    def submit(index, payload):
+        client = app.test_client()
+        barrier.wait()
+        statuses[index] = client.post('/api/draft_pick', json=payload).status_code
+
+    threads = [threading.Thread(target=submit, args=(index, payload)) for index, payload in enumerate(payloads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return statuses
+
+def test_concurrent_picks_of_one_player_store_one(app, draft):
+    payloads = [{'participant_id': draft['participants'][i % 2], 'player_id': draft['players'][0]}
+                for i in range(6)]
+    statuses = race(app, payloads)
+    assert sorted(statuses) == [200] + [409] * 5
+    assert DraftPick.query.count() == 1
+
+def test_concurrent_picks_of_one_slot_store_one(app, draft):
+    payloads = [{'participant_id': draft['participants'][i % 2], 'player_id': player_id, 'draft_position': 1}
+                for i, player_id in enumerate(draft['players'])]
+    statuses = race(app, payloads)
+    assert sorted(statuses) == [200] + [409] * 3
+    assert [pick.draft_position for pick in DraftPick.query.all()] == [1]
+
+def test_concurrent_picks_of_one_slot_go_to_the_participant_on_the_clock(app, draft):
+    order = {'participant_ids': draft['participants'], 'type': 'snake', 'first_position': 1}
+    payloads = [{'participant_id': draft['participants'][i % 2], 'player_id': player_id, 'draft_position': 1,
+                 'draft_order': order} for i, player_id in enumerate(draft['players'])]
+    statuses = race(app, payloads)
+    assert sorted(statuses) == [200] + [409] * 3
+    assert [(p.draft_position, p.participant_id) for p in DraftPick.query.all()] == [(1, draft['participants'][0])]
+
+def test_deleting_a_participant_loads_its_picks_in_one_query(client, db, draft):
+    first, second = draft['participants']
+    players = [Player(name=f'Bench {i}', school='Team 9', position='F') for i in range(6)]
+    db.session.add_all(players)
+    db.session.commit()
+    for player in players:
+        make_pick(first, player.id)
+    make_pick(second, draft['players'][0])
+
+    # One pick event query however many picks, not one per pick
+    with watch('delete participant', budget=15):
+        response = client.delete(f'/api/participant/{first}')
+    assert response.status_code == 200, response.get_json()
+    assert db.session.get(Participant, first) is None
+    assert [pick.participant_id for pick in DraftPick.query.all()] == [second]
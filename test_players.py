@@ -0,0 +1,20 @@
+from sqlalchemy import insert
+
+from app import MAX_PLAYERS_PAGE_SIZE, PLAYERS_PAGE_SIZE
+from models import Player
+
+def page_size(client, limit):
+    response = client.get(f'/players?limit={limit}')
+    assert response.status_code == 200
+    body = response.get_data(as_text=True)
+    return body.count('player-card '), 'after=' in body
+
+def test_page_size_is_clamped(client, db):
+    db.session.execute(insert(Player), [{'name': f'Player {i:03}', 'school': 'Team 0', 'position': 'G'}
+                                        for i in range(MAX_PLAYERS_PAGE_SIZE + 5)])
+    db.session.commit()
+
+    assert page_size(client, -1) == (1, True)
+    assert page_size(client, -5) == (1, True)
+    assert page_size(client, 0) == (PLAYERS_PAGE_SIZE, True)
+    assert page_size(client, 100000) == (MAX_PLAYERS_PAGE_SIZE, True)
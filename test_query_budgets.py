@@ -0,0 +1,60 @@
+"""Every budgeted page and API, run under QUERY_GUARD=raise against a drafted tournament.
+
+An N+1 or a view running past its ``@query_budget`` raises from the offending
+statement, so the request fails instead of answering 200.
+"""
+import pytest
+
+from benchmarks.dataset import as_of_round, generate_draft, generate_tournament, load_draft
+from config import QUERY_GUARD
+from ingest import IngestWriter
+from models import DraftPick, Player, TournamentGame
+from scoring import rebuild_scores
+
+PARTICIPANTS = 6
+
+@pytest.fixture
+def tournament(db):
+    """A tournament played through round 2, with a five-round snake draft of six participants"""
+    data = as_of_round(generate_tournament(roster_size=5), 2)
+    writer = IngestWriter()
+    writer.upsert_players(data['players'])
+    writer.upsert_games(data['games'])
+    writer.upsert_player_game_stats(data['stat_lines'], data['games'])
+    load_draft(PARTICIPANTS, generate_draft(data['players'], PARTICIPANTS, rounds=5))
+    rebuild_scores()
+    db.session.commit()
+    return db
+
+def test_the_guard_raises():
+    assert QUERY_GUARD == 'raise'
+
+@pytest.mark.parametrize('url', [
+    '/',
+    '/players',
+    '/players?sort=ppg&order=desc',
+    '/players?position=G&region=East',
+    '/draft',
+    '/participants',
+    '/leaderboard',
+    '/games',
+    '/api/players',
+    '/api/draft_picks',
+    '/api/available_players',
+    '/api/draft_board',
+])
+def test_page_stays_within_its_query_budget(client, tournament, url):
+    response = client.get(url)
+    assert response.status_code == 200, response.get_data(as_text=True)[:500]
+
+def test_box_score_stays_within_its_query_budget(client, tournament):
+    game = TournamentGame.query.filter_by(status='completed').first()
+    response = client.get(f'/api/game_stats/{game.id}')
+    assert response.status_code == 200, response.get_json()
+
+def test_pick_stays_within_its_query_budget(client, tournament):
+    drafted = DraftPick.query.with_entities(DraftPick.player_id)
+    player = Player.query.filter(Player.id.notin_(drafted)).first()
+    participant_id = DraftPick.query.first().participant_id
+    response = client.post('/api/draft_pick', json={'participant_id': participant_id, 'player_id': player.id})
+    assert response.status_code == 200, response.get_json()
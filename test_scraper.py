@@ -0,0 +1,59 @@
+import os
+import time
+
+import pytest
+
+from cache_store import SqliteStore
+from scraper import MarchMadnessScraper, NOT_MODIFIED
+
+ROSTER = [{'name': 'Player 1', 'position': 'G', 'jersey_number': '1', 'year_in_school': 'Senior'}]
+
+def backdate(store, key, seconds):
+    """Make a cache entry look ``seconds`` old"""
+    updated_at = time.time() - seconds
+    if isinstance(store, SqliteStore):
+        with store._connection() as conn:
+            conn.execute('UPDATE cache_entries SET updated_at = ? WHERE key = ?', (updated_at, key))
+    else:
+        os.utime(store._path(key), (updated_at, updated_at))
+
+@pytest.fixture(params=['sqlite', 'json'])
+def scraper(request, tmp_path):
+    scraper = MarchMadnessScraper(data_dir=str(tmp_path), cache_backend=request.param, requests_per_second=0)
+    yield scraper
+    scraper.cache.close(all_threads=True)
+
+def test_not_modified_makes_a_stale_entry_fresh_again(scraper, monkeypatch):
+    filename = scraper.team_players_filename('Gonzaga', 2025)
+    scraper.save_data(ROSTER, filename)
+    backdate(scraper.cache, scraper.cache_key(filename), 10 * 24 * 3600)
+    assert scraper.is_stale(filename, scraper.load_entry(filename)[1])
+
+    fetched = []
+    def get_page(url, page_type=None, skip_if_unchanged=False):
+        fetched.append(url)
+        return NOT_MODIFIED if skip_if_unchanged else None
+    monkeypatch.setattr(scraper, 'get_page', get_page)
+
+    # The stale copy is served while a conditional GET revalidates it in the background
+    assert scraper.scrape_team_players('Gonzaga', 2025) == ROSTER
+    deadline = time.time() + 5
+    while scraper.is_stale(filename, scraper.load_entry(filename)[1]):
+        assert time.time() < deadline, 'the 304 never refreshed the entry'
+        time.sleep(0.01)
+
+    assert scraper.load_data(filename) == ROSTER
+    assert len(fetched) == 1
+    # Fresh again: served from the cache with no further request
+    assert scraper.scrape_team_players('Gonzaga', 2025) == ROSTER
+    assert len(fetched) == 1
+
+def test_not_modified_for_a_forced_refresh_keeps_the_data(scraper, monkeypatch):
+    filename = scraper.team_players_filename('Duke', 2025)
+    scraper.save_data(ROSTER, filename)
+    backdate(scraper.cache, scraper.cache_key(filename), 3600)
+    _, updated_at = scraper.load_entry(filename)
+    monkeypatch.setattr(scraper, 'get_page', lambda url, page_type=None, skip_if_unchanged=False: NOT_MODIFIED)
+
+    assert scraper.scrape_team_players('Duke', 2025, force_refresh=True) == ROSTER
+    assert scraper.load_entry(filename)[1] > updated_at
@@ -0,0 +1,25 @@
+from config import STREAM_POLL_RETRY_MS, STREAM_SLOTS
+from events import bus
+from picks import make_pick
+
+def test_stream_beyond_the_slots_is_a_short_poll(client, draft):
+    last_id, _ = bus.replay()
+    make_pick(draft['participants'][0], draft['players'][0])
+
+    held = [bus.subscribe() for _ in range(STREAM_SLOTS)]
+    try:
+        assert bus.subscribe() is None
+        # Answered at once with the missed pick instead of holding a thread open
+        response = client.get('/api/stream', headers={'Last-Event-ID': str(last_id)})
+        body = response.get_data(as_text=True)
+    finally:
+        for subscription in held:
+            bus.unsubscribe(subscription)
+
+    assert response.status_code == 200
+    assert body.startswith(f'retry: {STREAM_POLL_RETRY_MS}\n')
+    assert 'event: pick_added' in body
+    # The slots are free again once the streams close
+    subscription = bus.subscribe()
+    assert subscription is not None
+    bus.unsubscribe(subscription)
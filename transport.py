@@ -0,0 +1,275 @@
+"""HTTP transports for the scraper: live, recording and replaying.
+
+``MarchMadnessScraper`` mounts one of these on its session (``SCRAPER_TRANSPORT``):
+
+    live:   Requests go to the network (the default).
+    record: Requests go to the network, and every response is also written to
+            the archive: status, headers, body and how long it took.
+    replay: Requests are answered from the archive without touching the
+            network, after the recorded latency times ``latency_scale`` (0
+            answers at once). A URL missing from the archive fails like a
+            connection error.
+
+The archive is one SQLite file holding the last response per URL. Responses
+are matched on the URL's path and query only, so an archive recorded from ESPN
+also answers requests sent to another host with the same paths. Replay honours
+``If-None-Match`` and ``If-Modified-Since``, so the scraper's HTTP cache
+behaves as it would live. A 304 received while recording keeps the archived
+full response.
+
+``serve`` runs the archive as a local stand-in server, for a scraper pointed at
+it with ``ESPN_BASE_URL`` or for any other HTTP client:
+
+    python transport.py serve --archive data/http_archive.db --port 8700
+    ESPN_BASE_URL=http://127.0.0.1:8700/mens-college-basketball/ python worker.py
+"""
+import argparse
+import json
+import logging
+import sqlite3
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger(__name__)
+
+# Headers that describe the original transfer rather than the body as archived
+# (requests has already decoded any Content-Encoding)
+TRANSFER_HEADERS = {'connection', 'content-encoding', 'content-length', 'keep-alive', 'transfer-encoding'}
+
+def archive_target(url):
+    """Archive key of ``url``: its path and query"""
+    parts = urlsplit(url)
+    return parts.path + ('?' + parts.query if parts.query else '')
+
+class HttpArchive:
+    """Recorded responses in one SQLite table keyed by path and query.
+
+    Each thread gets its own connection and every write is its own
+    transaction, so concurrent fetch workers can record at once.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                ' target TEXT PRIMARY KEY,'
+                ' url TEXT NOT NULL,'
+                ' status INTEGER NOT NULL,'
+                ' headers TEXT NOT NULL,'
+                ' body BLOB NOT NULL,'
+                ' latency REAL NOT NULL,'
+                ' recorded_at REAL NOT NULL'
+                ') WITHOUT ROWID'
+            )
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def record(self, url, status, headers, body, latency):
+        """Store the response to ``url``, replacing any earlier one for the same target"""
+        headers = json.dumps({name: value for name, value in headers.items()
+                              if name.lower() not in TRANSFER_HEADERS})
+        with self._connection() as conn:
+            conn.execute(
+                'INSERT INTO responses (target, url, status, headers, body, latency, recorded_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT(target) DO UPDATE SET url = excluded.url, status = excluded.status, '
+                'headers = excluded.headers, body = excluded.body, latency = excluded.latency, '
+                'recorded_at = excluded.recorded_at',
+                (archive_target(url), url, status, headers, body, latency, time.time())
+            )
+
+    def get(self, url):
+        """Return ``(status, headers, body, latency)`` recorded for ``url``'s target, or None"""
+        row = self._connection().execute(
+            'SELECT status, headers, body, latency FROM responses WHERE target = ?', (archive_target(url),)
+        ).fetchone()
+        if row is None:
+            return None
+        status, headers, body, latency = row
+        return status, CaseInsensitiveDict(json.loads(headers)), bytes(body), latency
+
+    def summary(self):
+        """Number of responses, body bytes and total recorded latency in seconds"""
+        count, size, latency = self._connection().execute(
+            'SELECT COUNT(*), COALESCE(SUM(LENGTH(body)), 0), COALESCE(SUM(latency), 0) FROM responses'
+        ).fetchone()
+        return {'responses': count, 'bytes': size, 'latency_seconds': round(latency, 3)}
+
+    def __len__(self):
+        return self._connection().execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+def _not_modified(headers, request_headers):
+    """Whether a conditional request with ``request_headers`` is satisfied by a response with ``headers``"""
+    etag = headers.get('ETag')
+    if_none_match = request_headers.get('If-None-Match')
+    if etag and if_none_match:
+        return etag in (tag.strip() for tag in if_none_match.split(','))
+    last_modified = headers.get('Last-Modified')
+    if_modified_since = request_headers.get('If-Modified-Since')
+    if last_modified and if_modified_since:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+def answer(archive, url, request_headers):
+    """The archived answer to a GET of ``url``: ``(status, headers, body, latency)``, or None if missing.
+
+    A conditional request whose validators still match gets a bodiless 304.
+    """
+    entry = archive.get(url)
+    if entry is None:
+        return None
+    status, headers, body, latency = entry
+    if status == 200 and _not_modified(headers, request_headers):
+        kept = {name: value for name, value in headers.items() if name.lower() in ('etag', 'last-modified')}
+        return 304, CaseInsensitiveDict(kept), b'', latency
+    return entry
+
+class RecordingAdapter(HTTPAdapter):
+    """Pooled live adapter that also writes every full response to ``archive``"""
+    def __init__(self, archive, **kwargs):
+        self.archive = archive
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        start = time.perf_counter()
+        response = super().send(request, **kwargs)
+        # Read the body here so the recorded latency covers the whole response
+        body = response.content
+        if response.status_code != 304:
+            self.archive.record(request.url, response.status_code, response.headers, body,
+                                time.perf_counter() - start)
+        return response
+
+class ReplayAdapter(BaseAdapter):
+    """Adapter that answers every request from ``archive`` instead of the network"""
+    COUNTERS = ('replayed', 'not_modified', 'missing')
+
+    def __init__(self, archive, latency_scale=1.0):
+        super().__init__()
+        self.archive = archive
+        self.latency_scale = latency_scale
+        self._lock = threading.Lock()
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def send(self, request, **kwargs):
+        entry = answer(self.archive, request.url, request.headers)
+        if entry is None:
+            self._count('missing')
+            raise requests.ConnectionError(f"{request.url} is not in the HTTP archive {self.archive.path}",
+                                           request=request)
+        status, headers, body, latency = entry
+        self._count('not_modified' if status == 304 else 'replayed')
+        if latency and self.latency_scale:
+            time.sleep(latency * self.latency_scale)
+
+        response = requests.Response()
+        response.status_code = status
+        try:
+            response.reason = HTTPStatus(status).phrase
+        except ValueError:
+            response.reason = ''
+        response.headers = headers
+        response.encoding = get_encoding_from_headers(headers)
+        response._content = body
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters)
+
+def create_transport(transport, archive_path, pool_size, latency_scale=1.0):
+    """Build the adapter to mount on the scraper's session for ``transport``"""
+    if transport == 'live':
+        return HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    if transport == 'record':
+        logger.info(f"Recording scraper responses to {archive_path}")
+        return RecordingAdapter(HttpArchive(archive_path), pool_connections=pool_size, pool_maxsize=pool_size)
+    if transport == 'replay':
+        logger.info(f"Replaying scraper responses from {archive_path} (latency x{latency_scale})")
+        return ReplayAdapter(HttpArchive(archive_path), latency_scale)
+    raise ValueError(f"Unknown scraper transport: {transport}")
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        entry = answer(self.server.archive, self.path, self.headers)
+        if entry is None:
+            self.send_error(404, 'Not in the HTTP archive')
+            return
+        status, headers, body, latency = entry
+        if latency and self.server.latency_scale:
+            time.sleep(latency * self.server.latency_scale)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+def serve(archive_path, host='127.0.0.1', port=8700, latency_scale=1.0):
+    """Stand-in server answering GETs from the archive; call ``serve_forever`` on the result"""
+    server = ThreadingHTTPServer((host, port), _StandInHandler)
+    server.daemon_threads = True
+    server.archive = HttpArchive(archive_path)
+    server.latency_scale = latency_scale
+    return server
+
+def main():
+    from config import SCRAPER_ARCHIVE, SCRAPER_REPLAY_LATENCY_SCALE
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('command', choices=('serve', 'summary'))
+    parser.add_argument('--archive', default=SCRAPER_ARCHIVE)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8700)
+    parser.add_argument('--latency-scale', type=float, default=SCRAPER_REPLAY_LATENCY_SCALE,
+                        help='Multiplier of the recorded latencies (0 answers at once)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == 'summary':
+        print(HttpArchive(args.archive).summary())
+        return
+    server = serve(args.archive, args.host, args.port, args.latency_scale)
+    print(f"Serving {len(server.archive)} archived responses from {args.archive} "
+          f"on http://{args.host}:{server.server_port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Data version counters.
+
+A counter such as ``players`` is bumped in the same transaction as the writes it
+tracks. Any worker process can then check whether something it cached is still
+current with a single primary-key read, instead of re-running the query behind it.
+
+ORM writes to the models in ``TRACKED_MODELS`` bump their counter automatically
+from an ``after_flush`` hook. Statements that bypass the ORM (bulk ingest, the
+pick ``INSERT ... SELECT``, query-level deletes) call ``bump_version`` themselves.
+
+A counter starts from the current Unix time rather than 1, so a recreated
+database does not reuse version numbers (and ETags) handed out by the old one.
+"""
+import sqlite3
+import time
+
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from models import db, Player, Participant, DraftPick, TournamentGame, PlayerTournamentStat, DataVersion
+
+# Counter bumped by ORM changes to each model
+TRACKED_MODELS = {
+    Player: 'players',
+    Participant: 'participants',
+    DraftPick: 'draft_picks',
+    TournamentGame: 'games',
+    PlayerTournamentStat: 'game_stats'
+}
+
+def bump_version(name, connection=None):
+    """Increment the ``name`` counter as part of the current transaction.
+
+    On SQLite this is a single upsert, so two workers creating the same counter
+    at once cannot both insert it (which would roll back the second one's write).
+    """
+    connection = connection or db.session.connection()
+    if connection.dialect.name == 'sqlite' and sqlite3.sqlite_version_info >= (3, 24, 0):
+        stmt = sqlite_insert(DataVersion).values(name=name, version=int(time.time()))
+        connection.execute(stmt.on_conflict_do_update(
+            index_elements=['name'], set_={'version': DataVersion.version + 1}
+        ))
+        return
+    result = connection.execute(
+        update(DataVersion).where(DataVersion.name == name).values(version=DataVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(DataVersion).values(name=name, version=int(time.time())))
+
+def current_version(name):
+    """Current value of the ``name`` counter (0 if it has never been bumped)"""
+    return db.session.execute(
+        select(DataVersion.version).where(DataVersion.name == name)
+    ).scalar() or 0
+
+def current_versions(*names):
+    """Current values of several counters in one query, as a dict"""
+    rows = dict(db.session.execute(
+        select(DataVersion.name, DataVersion.version).where(DataVersion.name.in_(names))
+    ).all())
+    return {name: rows.get(name, 0) for name in names}
+
+@event.listens_for(Session, 'after_flush')
+def _bump_tracked_versions(session, flush_context):
+    """Bump the counter of every tracked model written in this flush"""
+    names = set()
+    for obj in list(session.new) + list(session.deleted):
+        names.add(TRACKED_MODELS.get(type(obj)))
+    for obj in session.dirty:
+        if session.is_modified(obj):
+            names.add(TRACKED_MODELS.get(type(obj)))
+    names.discard(None)
+    
+    connection = session.connection()
+    for name in sorted(names):
+        bump_version(name, connection)
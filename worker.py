@@ -0,0 +1,94 @@
+"""Scraper worker process: runs the job queue and the scrape schedule outside the web workers.
+
+    worker: python worker.py    (Procfile)
+
+The web processes never import the scraper or a scheduler. This process owns
+both. It runs the jobs queued by the web app (see jobs.py) and queues the
+periodic scrapes on a schedule. More than one worker may be started; they
+share the ``scheduler`` ``WorkerLease`` row in the database. Only the holder
+runs jobs, renewing the lease while it does. The others stand by and take over
+once the holder stops renewing it, e.g. because it crashed. A worker that exits
+releases its lease straight away. The initial load of an empty database is one
+of these jobs too (see initial_load.py).
+"""
+import logging
+import signal
+import sys
+import time
+
+from apscheduler.schedulers.background import BackgroundScheduler
+
+from app import app
+from config import (SCRAPING_INTERVAL_HOURS, GAME_SCORES_INTERVAL_HOURS, WORKER_LEASE_RENEW_SECONDS,
+                    JOB_POLL_SECONDS)
+from initial_load import supervise as supervise_initial_load
+from jobs import enqueue, fail_interrupted, run_queued_jobs
+from leases import SCHEDULER_LEASE as LEASE_NAME, acquire_lease, release_lease, process_owner
+
+logger = logging.getLogger(__name__)
+
+def run_in_app_context(name, function, *args):
+    """Wrap a scheduled call so that it runs with database access"""
+    def run():
+        with app.app_context():
+            try:
+                function(*args)
+            except Exception as e:
+                logger.error(f"Scheduled job {name} failed: {e}")
+    return run
+
+def run_jobs(owner):
+    """Run the queued jobs, keeping the initial load of an empty database queued until one succeeds"""
+    supervise_initial_load()
+    run_queued_jobs(owner)
+    supervise_initial_load()
+
+def create_scheduler(owner):
+    """Scheduler that queues the periodic scrapes and runs the queue, paused until this worker holds the lease"""
+    scheduler = BackgroundScheduler()
+    scheduler.add_job(run_in_app_context('queue update_data', enqueue, 'update_data'), 'interval',
+                      hours=SCRAPING_INTERVAL_HOURS, id='queue_update_data', name='queue update_data')
+    scheduler.add_job(run_in_app_context('queue update_game_scores', enqueue, 'update_game_scores'), 'interval',
+                      hours=GAME_SCORES_INTERVAL_HOURS, id='queue_update_game_scores', name='queue update_game_scores')
+    scheduler.add_job(run_in_app_context('run_jobs', run_jobs, owner), 'interval',
+                      seconds=JOB_POLL_SECONDS, id='run_jobs', name='run_jobs', max_instances=1, coalesce=True)
+    return scheduler
+
+def main():
+    owner = process_owner()
+    scheduler = create_scheduler(owner)
+    scheduler.start(paused=True)
+    # The queue is polled every few seconds; only failures are worth logging
+    logging.getLogger('apscheduler.executors.default').setLevel(logging.WARNING)
+
+    # Exit through the finally block on SIGTERM (e.g. a deploy) as on Ctrl-C
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    leader = False
+    try:
+        while True:
+            with app.app_context():
+                try:
+                    holding = acquire_lease(LEASE_NAME, owner)
+                    if holding and not leader:
+                        fail_interrupted(owner)
+                except Exception as e:
+                    logger.error(f"Could not renew the {LEASE_NAME} lease: {e}")
+                    holding = False
+            if holding and not leader:
+                logger.info(f"Worker {owner} holds the {LEASE_NAME} lease; running jobs")
+                scheduler.resume()
+            elif leader and not holding:
+                logger.warning(f"Worker {owner} lost the {LEASE_NAME} lease; pausing jobs")
+                scheduler.pause()
+            leader = holding
+            time.sleep(WORKER_LEASE_RENEW_SECONDS)
+    finally:
+        scheduler.shutdown(wait=False)
+        if leader:
+            with app.app_context():
+                release_lease(LEASE_NAME, owner)
+            logger.info(f"Worker {owner} released the {LEASE_NAME} lease")
+
+if __name__ == '__main__':
+    main()